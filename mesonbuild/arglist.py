@@ -295,14 +295,21 @@ class CompilerArgs(T.MutableSequence[str]):
         tmp_pre: T.Deque[str] = collections.deque()
         if not isinstance(args, collections.abc.Iterable):
             raise TypeError(f'can only concatenate Iterable[str] (not "{args}") to CompilerArgs')
+        # Created on first use, looking up each of many libraries in the
+        # lists would take quadratic time
+        existing: T.Optional[T.Set[str]] = None
         for arg in args:
             # If the argument can be de-duped, do it either by removing the
             # previous occurrence of it and adding a new one, or not adding the
             # new occurrence.
             dedup = self._can_dedup(arg)
             if dedup is Dedup.UNIQUE:
+                if existing is None:
+                    existing = set(self._container)
+                    existing.update(self.pre)
+                    existing.update(self.post)
                 # Argument already exists and adding a new instance is useless
-                if arg in self._container or arg in self.pre or arg in self.post:
+                if arg in existing:
                     continue
             elif dedup is Dedup.OVERRIDDEN:
                 self.needs_override_check = True
@@ -310,6 +317,8 @@ class CompilerArgs(T.MutableSequence[str]):
                 tmp_pre.appendleft(arg)
             else:
                 self.post.append(arg)
+                if existing is not None:
+                    existing.add(arg)
         self.pre.extendleft(tmp_pre)
         #pre and post is going to be merged later before a iter call
         return self
@@ -174,6 +174,9 @@ class AstInterpreter(InterpreterBase):
         self.visitors = visitors if visitors is not None else []
         self.nesting: T.List[int] = []
         self.cur_assignments: T.DefaultDict[str, T.List[T.Tuple[T.List[int], T.Union[BaseNode, UnknownValue]]]] = defaultdict(list)
+        # The names assigned since the innermost if clause started, which are
+        # the only ones whose values evaluate_if has to merge.
+        self.if_assignments: T.Dict[str, None] = {}
         self.all_assignment_nodes: T.DefaultDict[str, T.List[AssignmentNode]] = defaultdict(list)
         # dataflow_dag is an acyclic directed graph that contains an edge
         # from one instance of `BaseNode` to another instance of `BaseNode` if
@@ -187,6 +190,7 @@ class AstInterpreter(InterpreterBase):
         # This graph is crucial for e.g. node_to_runtime_value because we have
         # to know that 'var' in line2 is 'foo123' and not 'bar'.
         self.dataflow_dag = DataflowDAG()
+        self.dataflow_attrs: T.Dict[T.Type[BaseNode], T.Tuple[str, ...]] = {}
         self.funcvals: T.Dict[BaseNode, T.Any] = {}
         self.tainted = False
         self.predefined_vars = {
@@ -449,7 +453,7 @@ class AstInterpreter(InterpreterBase):
     def evaluate_foreach(self, node: ForeachClauseNode) -> None:
         asses = self.find_potential_writes(node)
         for ass in asses:
-            self.cur_assignments[ass].append((self.nesting.copy(), UnknownValue()))
+            self.add_cur_value(ass, UnknownValue())
         try:
             self.evaluate_codeblock(node.block)
         except ContinueRequest:
@@ -457,9 +461,11 @@ class AstInterpreter(InterpreterBase):
         except BreakRequest:
             pass
         for ass in asses:
-            self.cur_assignments[ass].append((self.nesting.copy(), UnknownValue())) # In case the foreach loops 0 times.
+            self.add_cur_value(ass, UnknownValue()) # In case the foreach loops 0 times.
 
     def evaluate_if(self, node: IfClauseNode) -> None:
+        outer_assignments = self.if_assignments
+        self.if_assignments = {}
         self.nesting.append(0)
         for i in node.ifs:
             self.evaluate_codeblock(i.block)
@@ -467,7 +473,10 @@ class AstInterpreter(InterpreterBase):
         if not isinstance(node.elseblock, EmptyNode):
             self.evaluate_codeblock(node.elseblock.block)
         self.nesting.pop()
-        for var_name in self.cur_assignments:
+        assigned = self.if_assignments
+        outer_assignments.update(assigned)
+        self.if_assignments = outer_assignments
+        for var_name in assigned:
             potential_values = []
             oldval = self.get_cur_value_if_defined(var_name)
             if not isinstance(oldval, UndefinedVariable):
@@ -480,7 +489,11 @@ class AstInterpreter(InterpreterBase):
                 uv = UnknownValue()
                 for pv in potential_values:
                     self.dataflow_dag.add_edge(pv, uv)
-                self.cur_assignments[var_name].append((self.nesting.copy(), uv))
+                self.add_cur_value(var_name, uv)
+
+    def add_cur_value(self, var_name: str, value: T.Union[BaseNode, UnknownValue]) -> None:
+        self.cur_assignments[var_name].append((self.nesting.copy(), value))
+        self.if_assignments[var_name] = None
 
     def func_files(self, node: BaseNode, args: T.List[TYPE_var], kwargs: T.Dict[str, TYPE_var]) -> T.Any:
         ret: T.List[T.Union[IntrospectionFile, UnknownValue]] = []
@@ -660,7 +673,7 @@ class AstInterpreter(InterpreterBase):
     def assignment(self, node: AssignmentNode) -> None:
         assert isinstance(node, AssignmentNode)
         self.evaluate_statement(node.value)
-        self.cur_assignments[node.var_name.value].append((self.nesting.copy(), node.value))
+        self.add_cur_value(node.var_name.value, node.value)
         self.all_assignment_nodes[node.var_name.value].append(node)
 
     def evaluate_plusassign(self, node: PlusAssignmentNode) -> None:
@@ -672,7 +685,7 @@ class AstInterpreter(InterpreterBase):
             newval = UnknownValue()
         else:
             newval = mparser.ArithmeticNode(operation='+', left=lhs, operator=_symbol('+'), right=node.value)
-        self.cur_assignments[node.var_name.value].append((self.nesting.copy(), newval))
+        self.add_cur_value(node.var_name.value, newval)
         self.all_assignment_nodes[node.var_name.value].append(node)
 
         self.dataflow_dag.add_edge(lhs, newval)
@@ -714,7 +727,7 @@ class AstInterpreter(InterpreterBase):
             raise InvalidArguments('unset_variable requires exactly one positional arguments')
         var_name = args[0]
         assert isinstance(var_name, str)
-        self.cur_assignments[var_name].append((self.nesting.copy(), node))
+        self.add_cur_value(var_name, node)
 
     def nodes_to_pretty_filelist(self, root_path: Path, subdir: str, nodes: T.List[BaseNode]) -> T.List[T.Union[str, UnknownValue]]:
         def src_to_abs(src: T.Union[str, IntrospectionFile, UnknownValue]) -> T.Union[str, UnknownValue]:
@@ -758,20 +771,25 @@ class AstInterpreter(InterpreterBase):
         return Disabler(subproject=self.subproject)
 
     def evaluate_statement(self, cur: mparser.BaseNode) -> T.Optional[InterpreterObject]:
-        if hasattr(cur, 'args'):
+        try:
+            attrs = self.dataflow_attrs[type(cur)]
+        except KeyError:
+            # All nodes of a type have the same attributes
+            attrs = tuple(attr for attr in ['source_object', 'left', 'right', 'items', 'iobject', 'index', 'condition']
+                          if hasattr(cur, attr))
+            self.dataflow_attrs[type(cur)] = attrs
+        if isinstance(cur, (mparser.ArrayNode, mparser.DictNode, mparser.FunctionNode, mparser.MethodNode)):
             for arg in cur.args.arguments:
                 self.dataflow_dag.add_edge(arg, cur)
             for k, v in cur.args.kwargs.items():
                 self.dataflow_dag.add_edge(v, cur)
-        for attr in ['source_object', 'left', 'right', 'items', 'iobject', 'index', 'condition']:
-            if hasattr(cur, attr):
-                assert isinstance(getattr(cur, attr), mparser.BaseNode)
-                self.dataflow_dag.add_edge(getattr(cur, attr), cur)
-        if isinstance(cur, mparser.IdNode):
-            self.dataflow_dag.add_edge(self.get_cur_value(cur.value), cur)
-            return None
-        else:
-            return super().evaluate_statement(cur)
+        for attr in attrs:
+            assert isinstance(getattr(cur, attr), mparser.BaseNode)
+            self.dataflow_dag.add_edge(getattr(cur, attr), cur)
+        return super().evaluate_statement(cur)
+
+    def evaluate_id(self, cur: mparser.IdNode) -> None:
+        self.dataflow_dag.add_edge(self.get_cur_value(cur.value), cur)
 
     def function_call(self, node: mparser.FunctionNode) -> T.Any:
         ret = super().function_call(node)
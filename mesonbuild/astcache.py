@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+"""A cache of parsed build files in the private build directory.
+
+Every reconfiguration parses all build files again, although most of them
+have usually not changed. The syntax trees are therefore pickled into the
+private build directory, one entry per build file, and are loaded instead
+of parsing the file again as long as its contents are the same.
+
+Files whose parsing printed warnings are not cached, so that the warnings
+are shown every time, as before.
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+import typing as T
+
+from . import mlog, mparser
+from .coredata import version
+
+# Bump this if the layout of the stored entries or of the nodes changes.
+CACHE_FORMAT_VERSION = 2
+
+CACHE_DIR = 'ast-cache'
+
+
+EntryKey = T.Tuple[int, str, bool, bool, str]
+
+
+def _entry_key(code: str, compact: bool) -> EntryKey:
+    # The lexer recognizes additional keywords when running the project tests
+    in_unit_test = 'MESON_RUNNING_IN_PROJECT_TESTS' in os.environ
+    return (CACHE_FORMAT_VERSION, version, in_unit_test, compact, hashlib.sha256(code.encode('utf-8')).hexdigest())
+
+
+def _entry_path(cache_dir: str, filename: str) -> str:
+    return os.path.join(cache_dir, hashlib.sha256(filename.encode('utf-8')).hexdigest()[:32] + '.dat')
+
+
+def _load(path: str, key: EntryKey) -> T.Optional[mparser.CodeBlockNode]:
+    gc_enabled = gc.isenabled()
+    try:
+        with open(path, 'rb') as f:
+            # The key is stored separately, so that the tree of a file which
+            # has changed is not loaded at all.
+            if pickle.load(f) != key:
+                return None
+            # Creating the many small objects of a tree triggers the garbage
+            # collector over and over, although none of them can be garbage.
+            gc.disable()
+            tree = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A truncated or otherwise broken entry is replaced when storing
+        mlog.debug(f'Could not load cached syntax tree {path}: {e!s}')
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return tree if isinstance(tree, mparser.CodeBlockNode) else None
+
+
+def _store(path: str, key: EntryKey, tree: mparser.CodeBlockNode) -> None:
+    try:
+        data = pickle.dumps(key) + pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RecursionError):
+        # Very deeply nested expressions can't be pickled
+        return
+    cache_dir = os.path.dirname(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        mlog.debug(f'Could not cache syntax tree in {path}: {e!s}')
+
+
+def parse(code: str, filename: str, cache_dir: T.Optional[str], *, compact: bool = False) -> mparser.CodeBlockNode:
+    """Parse the contents of a build file, using the cache in cache_dir.
+
+    Without a cache_dir this is the same as parsing the file. Errors are
+    raised as by :class:`mparser.Parser`, and are never cached.
+    """
+    if not cache_dir:
+        return mparser.Parser(code, filename, compact=compact).parse()
+    key = _entry_key(code, compact)
+    path = _entry_path(cache_dir, filename)
+    tree = _load(path, key)
+    if tree is not None:
+        return tree
+    warnings = mlog.get_warning_count()
+    tree = mparser.Parser(code, filename, compact=compact).parse()
+    if mlog.get_warning_count() == warnings:
+        _store(path, key, tree)
+    return tree
+
+
+def get_cache_dir(scratch_dir: str) -> T.Optional[str]:
+    """Return the cache directory for a private build directory, if any."""
+    return os.path.join(scratch_dir, CACHE_DIR) if scratch_dir else None
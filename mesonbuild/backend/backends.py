@@ -24,6 +24,7 @@ from .. import programs
 from .. import mesonlib
 from .. import mlog
 from .. import compilers
+from .. import coredata
 from ..compilers import detect, lang_suffixes
 from ..mesonlib import (
     File, MachineChoice, MesonException, MesonBugException, OrderedSet,
@@ -70,11 +71,34 @@ if T.TYPE_CHECKING:
 # Assembly files cannot be unitified and neither can LLVM IR files
 LANGS_CANT_UNITY: T.FrozenSet[Language] = frozenset({'d', 'fortran', 'vala', 'rust'})
 
+def file_digest(path: str) -> T.Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
 @dataclass(eq=False)
 class RegenInfo:
     source_dir: str
     build_dir: str
     depfiles: T.List[str]
+    # The contents of depfiles when the build files were generated, so that
+    # files which were only touched do not cause a regeneration.
+    digests: T.Dict[str, T.Optional[str]]
+    meson_version: str
+
+    def changed_depfiles(self) -> T.List[str]:
+        '''The depfiles whose contents changed, or all of them if the build
+        files were generated by another version of Meson.'''
+        if self.meson_version != coredata.version:
+            return list(self.depfiles)
+        changed: T.List[str] = []
+        for i in self.depfiles:
+            digest = self.digests.get(i)
+            if digest is None or digest != file_digest(os.path.join(self.build_dir, i)):
+                changed.append(i)
+        return changed
 
 class TestProtocol(enum.Enum):
 
@@ -214,6 +238,9 @@ class TestSerialisation:
     extra_paths: T.List[str]
     protocol: TestProtocol
     priority: int
+    # Amounts of the resources shared by tests that the test needs while
+    # running, which are handed out by mtest
+    resources: T.Dict[str, int]
     cmd_is_built: bool
     cmd_is_exe: bool
     depends: T.List[str]
@@ -371,6 +398,7 @@ class Backend:
                 curdir = '.'
         return compiler.get_include_args(curdir, False)
 
+    @lru_cache(maxsize=None)
     def get_target_filename_for_linking(self, target: build.AnyTargetType) -> T.Optional[str]:
         # On some platforms (msvc for instance), the file that is used for
         # dynamic linking is not the same as the dynamic library itself. This
@@ -562,8 +590,12 @@ class Backend:
 
         if not targets or not recursive:
             return all_deps
-        result = self.get_target_deps(all_deps, recursive)
-        result.update(all_deps)
+        # Only look at the dependencies of targets that were not seen yet,
+        # so that shared parts of the graph are walked once.
+        result = dict(all_deps)
+        while all_deps:
+            all_deps = {k: v for k, v in self.get_target_deps(all_deps).items() if k not in result}
+            result.update(all_deps)
         return result
 
     def _flatten_object_list(self, target: build.BuildTarget,
@@ -1135,15 +1167,17 @@ class Backend:
 
     def build_target_link_arguments(self, compiler: Compiler, deps: T.Iterable[build.BuildTargetTypes]) -> T.List[str]:
         args: T.List[str] = []
+        is_d = compiler.get_language() == 'd'
+        is_nvlink = compiler.get_linker_id() == 'nvlink'
         for d in deps:
             if not d.is_linkable_target():
                 raise RuntimeError(f'Tried to link with a non-library target "{d.get_basename()}".')
             arg = self.get_target_filename_for_linking(d)
             if not arg:
                 continue
-            if compiler.get_language() == 'd':
+            if is_d:
                 arg = '-Wl,' + arg
-            elif compiler.get_linker_id() == 'nvlink' and arg.endswith('.a'):
+            elif is_nvlink and arg.endswith('.a'):
                 # We need to pass static archives without -Xlinker= to nvcc,
                 # since they may contain relocatable device code. When passing
                 # the static archive to nvcc with -Xlinker=, we bypass the
@@ -1361,7 +1395,7 @@ class Backend:
                                    exe_wrapper, self.environment.need_exe_wrapper(),
                                    t.is_parallel, cmd_args, t_env,
                                    t.expected_fail, t.expected_exitcode, t.timeout, t.workdir,
-                                   extra_paths, t.protocol, t.priority,
+                                   extra_paths, t.protocol, t.priority, t.resources,
                                    isinstance(exe, (build.Target, build.CustomTargetIndex)),
                                    isinstance(exe, build.Executable),
                                    [x.get_id() for x in depends],
@@ -1432,11 +1466,15 @@ class Backend:
         self.check_clock_skew(deps)
         return list(deps)
 
-    def generate_regen_info(self) -> None:
-        deps = self.get_regen_filelist()
+    def generate_regen_info(self, deps: T.Optional[T.List[str]] = None) -> None:
+        if deps is None:
+            deps = self.get_regen_filelist()
+        build_dir = self.environment.get_build_dir()
         regeninfo = RegenInfo(self.environment.get_source_dir(),
-                              self.environment.get_build_dir(),
-                              deps)
+                              build_dir,
+                              deps,
+                              {i: file_digest(os.path.join(build_dir, i)) for i in deps},
+                              coredata.version)
         filename = os.path.join(self.environment.get_scratch_dir(),
                                 'regeninfo.dump')
         with open(filename, 'wb') as f:
@@ -216,6 +216,8 @@ class NinjaRule:
         self.rspable = rspable  # if a rspfile can be used
         self.refcount = 0
         self.rsprefcount = 0
+        # The comment added before the rule, written along with it
+        self.comment: T.Optional[NinjaComment] = None
         self.rspfile_quote_style = rspfile_quote_style
         self.command_str = ' '.join([self._quoter(x) for x in self.command + self.args])
         self.var_refs = [m for m in re.finditer(r'(\${\w+}|\$\w+)?[^$]*', self.command_str)
@@ -234,45 +236,39 @@ class NinjaRule:
             return ninja_quote(x.s)
         return ninja_quote(qf(str(x)))
 
-    def write(self, outfile: T.TextIO) -> None:
-        rspfile_args = self.args
-        rspfile_quote_func: T.Callable[[str], str]
-        if self.rspfile_quote_style in {RSPFileSyntax.MSVC, RSPFileSyntax.TASKING}:
-            rspfile_quote_func = cmd_quote
-            rspfile_args = [NinjaCommandArg('$in_newline', arg.quoting) if arg.s == '$in' else arg for arg in rspfile_args]
-        else:
-            rspfile_quote_func = gcc_rsp_quote
-
-        def rule_iter() -> T.Iterable[str]:
-            if self.refcount:
-                yield ''
-            if self.rsprefcount:
-                yield '_RSP'
-
-        for rsp in rule_iter():
-            outfile.write(f'rule {self.name}{rsp}\n')
-            if rsp == '_RSP':
-                if self.rspfile_quote_style is RSPFileSyntax.TASKING:
-                    outfile.write(' command = {} --option-file=$out.rsp\n'.format(' '.join([self._quoter(x) for x in self.command])))
-                else:
-                    outfile.write(' command = {} @$out.rsp\n'.format(' '.join([self._quoter(x) for x in self.command])))
-                outfile.write(' rspfile = $out.rsp\n')
-                outfile.write(' rspfile_content = {}\n'.format(' '.join([self._quoter(x, rspfile_quote_func) for x in rspfile_args])))
+    def write(self, outfile: T.TextIO, rsp: bool) -> None:
+        if rsp:
+            rspfile_args = self.args
+            rspfile_quote_func: T.Callable[[str], str]
+            if self.rspfile_quote_style in {RSPFileSyntax.MSVC, RSPFileSyntax.TASKING}:
+                rspfile_quote_func = cmd_quote
+                rspfile_args = [NinjaCommandArg('$in_newline', arg.quoting) if arg.s == '$in' else arg for arg in rspfile_args]
             else:
-                outfile.write(' command = {}\n'.format(self.command_str))
-            if self.deps:
-                outfile.write(f' deps = {self.deps}\n')
-            if self.depfile:
-                outfile.write(f' depfile = {self.depfile}\n')
-            outfile.write(f' description = {self.description}\n')
-            if self.restat:
-                outfile.write(' restat = 1\n')
-            if self.extra:
-                for l in self.extra.split('\n'):
-                    outfile.write(' ')
-                    outfile.write(l)
-                    outfile.write('\n')
-            outfile.write('\n')
+                rspfile_quote_func = gcc_rsp_quote
+
+            outfile.write(f'rule {self.name}_RSP\n')
+            if self.rspfile_quote_style is RSPFileSyntax.TASKING:
+                outfile.write(' command = {} --option-file=$out.rsp\n'.format(' '.join([self._quoter(x) for x in self.command])))
+            else:
+                outfile.write(' command = {} @$out.rsp\n'.format(' '.join([self._quoter(x) for x in self.command])))
+            outfile.write(' rspfile = $out.rsp\n')
+            outfile.write(' rspfile_content = {}\n'.format(' '.join([self._quoter(x, rspfile_quote_func) for x in rspfile_args])))
+        else:
+            outfile.write(f'rule {self.name}\n')
+            outfile.write(' command = {}\n'.format(self.command_str))
+        if self.deps:
+            outfile.write(f' deps = {self.deps}\n')
+        if self.depfile:
+            outfile.write(f' depfile = {self.depfile}\n')
+        outfile.write(f' description = {self.description}\n')
+        if self.restat:
+            outfile.write(' restat = 1\n')
+        if self.extra:
+            for l in self.extra.split('\n'):
+                outfile.write(' ')
+                outfile.write(l)
+                outfile.write('\n')
+        outfile.write('\n')
 
     def _length_estimate(self, infiles: str, outfiles: str,
                          elems: T.List[T.Tuple[str, T.List[str]]]) -> int:
@@ -370,12 +366,15 @@ class NinjaBuildElement:
 
         return self.rule.should_use_rspfile(self)
 
-    def count_rule_references(self) -> None:
-        if self.rulename != 'phony':
-            if self._should_use_rspfile:
-                self.rule.rsprefcount += 1
-            else:
-                self.rule.refcount += 1
+    def count_rule_references(self) -> bool:
+        '''Count the use of the rule, returns whether it is the first one.'''
+        if self.rulename == 'phony':
+            return False
+        if self._should_use_rspfile:
+            self.rule.rsprefcount += 1
+            return self.rule.rsprefcount == 1
+        self.rule.refcount += 1
+        return self.rule.refcount == 1
 
     def write(self, outfile: T.TextIO) -> None:
         if self.output_errors:
@@ -450,12 +449,22 @@ class NinjaBuildElement:
 
 @dataclass
 class NinjaBuild:
-    rules: list[NinjaRule | NinjaComment] = dataclasses.field(default_factory=list, init=False)
+    '''The contents of build.ninja, written out as they are generated.
+
+    Build statements are kept until flush() is called, which the backend does
+    after generating each target, and are dropped once written. A rule is
+    written just before the first statement using it, so only the rules and
+    the set of outputs stay in memory, not the whole file.
+    '''
+
+    outfile: T.Optional[T.TextIO] = dataclasses.field(default=None, init=False)
     ruledict: dict[str, NinjaRule] = dataclasses.field(default_factory=dict, init=False)
     build_elements: list[NinjaBuildElement | NinjaComment] = dataclasses.field(default_factory=list, init=False)
+    rule_comment: T.Optional[NinjaComment] = dataclasses.field(default=None, init=False)
+    written_comments: set[int] = dataclasses.field(default_factory=set, init=False)
 
     def add_rule_comment(self, comment: NinjaComment) -> None:
-        self.rules.append(comment)
+        self.rule_comment = comment
 
     def add_build_comment(self, comment: NinjaComment) -> None:
         self.build_elements.append(comment)
@@ -463,7 +472,7 @@ class NinjaBuild:
     def add_rule(self, rule: NinjaRule) -> None:
         if rule.name in self.ruledict:
             raise MesonException(f'Tried to add rule {rule.name} twice.')
-        self.rules.append(rule)
+        rule.comment = self.rule_comment
         self.ruledict[rule.name] = rule
 
     def has_rule(self, name: str) -> bool:
@@ -490,16 +499,23 @@ class NinjaBuild:
             else:
                 mlog.warning(f"build statement for {build.outfilenames} references nonexistent rule {build.rulename}")
 
-    def write(self, outfile: T.TextIO) -> None:
+    def write_rule(self, rule: NinjaRule, rsp: bool) -> None:
+        assert self.outfile is not None
+        # Comments head a group of rules, write them once with the first
+        # rule of the group that is used
+        if rule.comment is not None and id(rule.comment) not in self.written_comments:
+            self.written_comments.add(id(rule.comment))
+            rule.comment.write(self.outfile)
+        rule.write(self.outfile, rsp)
+
+    def flush(self) -> None:
+        if self.outfile is None:
+            return
         for b in self.build_elements:
-            if isinstance(b, NinjaBuildElement):
-                b.count_rule_references()
-
-        for r in self.rules:
-            r.write(outfile)
-
-        for b in ProgressBar(self.build_elements, desc='Writing build.ninja'):
-            b.write(outfile)
+            if isinstance(b, NinjaBuildElement) and b.count_rule_references():
+                self.write_rule(b.rule, b._should_use_rspfile)
+            b.write(self.outfile)
+        self.build_elements.clear()
 
 @dataclass
 class RustDep:
@@ -727,6 +743,7 @@ class NinjaBackend(backends.Backend):
 ''')
 
         with self.detect_vs_dep_prefix(tempfilename) as outfile:
+            self.ninja.outfile = outfile
             self.generate_rules()
             self.generate_phony()
             self.add_build_comment(NinjaComment('Build rules for targets'))
@@ -739,6 +756,7 @@ class NinjaBackend(backends.Backend):
 
             for t in ProgressBar(self.build.get_targets().values(), desc='Generating targets'):
                 self.generate_target(t)
+                self.ninja.flush()
             mlog.log_timestamp("Targets generated")
             self.add_build_comment(NinjaComment('Test rules'))
             self.generate_tests()
@@ -766,7 +784,8 @@ class NinjaBackend(backends.Backend):
             mlog.log_timestamp("Utils generated")
             self.generate_ending()
 
-            self.ninja.write(outfile)
+            self.ninja.flush()
+            self.ninja.outfile = None
             mlog.log_timestamp("build.ninja generated")
 
             default = 'default all\n\n'
@@ -1495,7 +1514,8 @@ class NinjaBackend(backends.Backend):
              self.environment.get_source_dir(),
              # Ninja always runs from the build_dir. This includes cases where the user moved the
              # build directory and invalidated most references. Make sure it still regenerates.
-             '.']
+             '.',
+             '$REGEN_ARGS']
         self.add_rule(NinjaRule('REGENERATE_BUILD',
                                 c, [],
                                 'Regenerating build files',
@@ -3737,12 +3757,13 @@ https://gcc.gnu.org/bugzilla/show_bug.cgi?id=47485'''))
         search_dirs: OrderedSet[str] = OrderedSet()
         libs: OrderedSet[str] = OrderedSet()
         absolute_libs = []
+        internal_set = set(internal)
 
         build_dir = self.environment.get_build_dir()
         # the following loop sometimes consumes two items from command in one pass
         it = iter(linker.native_args_to_unix(list(commands)))
         for item in it:
-            if item in internal and not item.startswith('-'):
+            if item in internal_set and not item.startswith('-'):
                 continue
 
             if item.startswith('-L'):
@@ -3997,6 +4018,7 @@ https://gcc.gnu.org/bugzilla/show_bug.cgi?id=47485'''))
             return []
         return self.import_std.gen_objects
 
+    @lru_cache(maxsize=None)
     def get_dependency_filename(self, t: T.Union[File, build.BuildTargetTypes]) -> str:
         if isinstance(t, build.SharedLibrary):
             if t.uses_rust() and t.rust_crate_type == 'proc-macro':
@@ -4258,8 +4280,11 @@ https://gcc.gnu.org/bugzilla/show_bug.cgi?id=47485'''))
         self.add_build(elem)
 
         deps = self.get_regen_filelist()
+        # Unlike "ninja reconfigure", do nothing if the files were only touched
+        self.generate_regen_info(deps)
         elem = NinjaBuildElement(self.all_outputs, 'build.ninja', 'REGENERATE_BUILD', deps)
         elem.add_item('pool', 'console')
+        elem.add_item('REGEN_ARGS', '--only-if-changed')
         self.add_build(elem)
 
         # If these files used to be explicitly created, they need to appear on the build graph somehow,
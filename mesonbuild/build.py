@@ -66,6 +66,7 @@ if T.TYPE_CHECKING:
     AnyTargetType: TypeAlias = T.Union['Target', 'CustomTargetIndex']
     RustCrateType: TypeAlias = Literal['bin', 'lib', 'rlib', 'dylib', 'cdylib', 'staticlib', 'proc-macro']
     _LibraryType: TypeAlias = Literal['auto', 'shared', 'static']
+    _BD = T.TypeVar('_BD', 'Build', 'BuildIndex')
 
     class DFeatures(TypedDict):
 
@@ -1483,26 +1484,26 @@ class BuildTarget(Target):
         # get_internal_static_libraries(): Installed static libraries include
         # objects from all their dependencies already.
         result: OrderedSet[BuildTargetTypes] = OrderedSet()
-        visited: T.Set[T.Tuple[BuildTargetTypes, bool, bool]] = set()
         for t in itertools.chain(self.link_targets, self.link_whole_targets):
             if t not in result:
                 result.add(t)
                 if isinstance(t, (StaticLibrary, CustomTarget, CustomTargetIndex)):
-                    t.get_dependencies_recurse(result, visited, handled_by_rustc=self.uses_rust())
+                    result.update(t.get_dependencies_closure(True, self.uses_rust()))
         return result
 
-    def get_dependencies_recurse(self, result: OrderedSet[BuildTargetTypes],
-                                 visited: T.Set[T.Tuple[BuildTargetTypes, bool, bool]],
-                                 include_internals: bool = True, handled_by_rustc: bool = False) -> None:
+    @lru_cache(maxsize=None)
+    def get_dependencies_closure(self, include_internals: bool,
+                                 handled_by_rustc: bool) -> ImmutableListProtocol[BuildTargetTypes]:
         # self is always a static library because we don't need to pull dependencies
         # of shared libraries. If self is installed (not internal) it already
         # include objects extracted from all its internal dependencies so we can
         # skip them.
+        #
+        # The closure of each library is built from the closures of the
+        # libraries it links with, so that every library of a deep chain is
+        # only visited once, however many targets link with the chain.
         include_internals = include_internals and self.is_internal()
-        key = (self, include_internals, handled_by_rustc)
-        if key in visited:
-            return
-        visited.add(key)
+        result: OrderedSet[BuildTargetTypes] = OrderedSet()
 
         for t in self.link_targets:
             uses_rust_abi = isinstance(t, BuildTarget) and t.uses_rust_abi()
@@ -1528,10 +1529,11 @@ class BuildTarget(Target):
             else:
                 result.add(t)
             if isinstance(t, StaticLibrary):
-                t.get_dependencies_recurse(result, visited, include_internals, handled_by_rustc and uses_rust_abi)
+                result.update(t.get_dependencies_closure(include_internals, handled_by_rustc and uses_rust_abi))
         for t in self.link_whole_targets:
             uses_rust_abi = isinstance(t, BuildTarget) and t.uses_rust_abi()
-            t.get_dependencies_recurse(result, visited, include_internals, handled_by_rustc and uses_rust_abi)
+            result.update(t.get_dependencies_closure(include_internals, handled_by_rustc and uses_rust_abi))
+        return list(result)
 
     def get_sources(self) -> T.List[File]:
         return self.sources
@@ -2973,11 +2975,9 @@ class CustomTargetBase(LinkableTarget, metaclass=SimpleABC):
 
     rust_crate_type = ''
 
-    def get_dependencies_recurse(self, result: OrderedSet[BuildTargetTypes],
-                                 visited: T.Set[tuple[BuildTargetTypes, bool, bool]],
-                                 include_internals: bool = True,
-                                 handled_by_rustc: bool = False) -> None:
-        pass
+    def get_dependencies_closure(self, include_internals: bool,
+                                 handled_by_rustc: bool) -> ImmutableListProtocol[BuildTargetTypes]:
+        return []
 
     def get_internal_static_libraries(self) -> OrderedSet[StaticTargetTypes]:
         return OrderedSet()
@@ -3657,10 +3657,28 @@ def get_sources_string_names(sources: T.Sequence[CustomTargetSources], backend:
             raise MesonBugException(f'Unknown source type: {s!r}')
     return names
 
-def load(build_dir: str) -> Build:
+@dataclass(eq=False)
+class BuildIndex:
+    '''The parts of the build data that most commands need.
+
+    It is stored in front of the :class:`Build` object in build.dat, so that
+    for example "meson test" and "meson compile" can read it without
+    unpickling every target of the project.
+    '''
+
+    version: str
+    project_name: str
+    project_version: T.Optional[str]
+    environment: Environment
+    test_setups: T.Dict[str, TestSetup]
+    test_setup_default_name: T.Optional[str]
+    modules: T.Set[str]
+
+
+def _load(build_dir: str, object_name: str, object_type: T.Type[_BD], skip: int) -> _BD:
     filename = os.path.join(build_dir, 'meson-private', 'build.dat')
     try:
-        b = pickle_load(filename, 'Build data', Build)
+        b = pickle_load(filename, object_name, object_type, skip=skip)
         # We excluded coredata when saving Build object, load it separately
         b.environment.coredata = coredata.load(build_dir)
         return b
@@ -3668,12 +3686,28 @@ def load(build_dir: str) -> Build:
         raise MesonException(f'No such build data file as {filename!r}.')
 
 
+def load(build_dir: str) -> Build:
+    return _load(build_dir, 'Build data', Build, skip=1)
+
+
+def load_index(build_dir: str) -> BuildIndex:
+    '''Load the build data without the targets, see :class:`BuildIndex`.'''
+    return _load(build_dir, 'Build index', BuildIndex, skip=0)
+
+
 def save(obj: Build, filename: str) -> None:
     # Exclude coredata because we pickle it separately already
     cdata = obj.environment.coredata
     obj.environment.coredata = None
+    index = BuildIndex(obj.version, obj.project_name, obj.project_version, obj.environment,
+                       obj.test_setups, obj.test_setup_default_name, obj.modules)
     try:
         with open(filename, 'wb') as f:
-            pickle.dump(obj, f)
+            # Both objects are written by one pickler, so the Build refers
+            # back to the environment and test setups stored in the index
+            # rather than storing them again
+            pickler = pickle.Pickler(f)
+            pickler.dump(index)
+            pickler.dump(obj)
     finally:
         obj.environment.coredata = cdata
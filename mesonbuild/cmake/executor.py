@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import subprocess as S
-from threading import Thread
+from threading import Lock, Thread
 import typing as T
 import re
 import os
@@ -30,6 +30,8 @@ class CMakeExecutor:
     class_cmakebin: PerMachine[T.Optional[ExternalProgram]] = PerMachine(None, None)
     class_cmakevers: PerMachine[T.Optional[str]] = PerMachine(None, None)
     class_cmake_cache: T.Dict[T.Any, TYPE_result] = {}
+    # Dependencies may be looked up on several threads
+    class_cmakebin_lock = Lock()
 
     def __init__(self, environment: 'Environment', version: str, for_machine: MachineChoice, silent: bool = False):
         self.min_version = version
@@ -60,6 +62,10 @@ class CMakeExecutor:
             self.extra_cmake_args += ['-DCMAKE_PREFIX_PATH={}'.format(';'.join(self.prefix_paths))]
 
     def find_cmake_binary(self, environment: 'Environment', silent: bool = False) -> T.Tuple[T.Optional['ExternalProgram'], T.Optional[str]]:
+        with CMakeExecutor.class_cmakebin_lock:
+            return self._find_cmake_binary(environment, silent)
+
+    def _find_cmake_binary(self, environment: 'Environment', silent: bool) -> T.Tuple[T.Optional['ExternalProgram'], T.Optional[str]]:
         # Only search for CMake the first time and store the result in the class
         # definition
         if isinstance(CMakeExecutor.class_cmakebin[self.for_machine], NonExistingExternalProgram):
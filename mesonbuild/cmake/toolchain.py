@@ -10,6 +10,7 @@ from .common import language_map, cmake_get_generator_args
 from .. import mlog
 
 import os.path
+import threading
 import shutil
 import typing as T
 from enum import Enum
@@ -224,7 +225,14 @@ class CMakeToolchain:
                 return True
             return arg.startswith('-')
 
+    # All toolchains share the directory used to get the compiler state
+    _compiler_state_lock = threading.Lock()
+
     def update_cmake_compiler_state(self) -> None:
+        with CMakeToolchain._compiler_state_lock:
+            self._update_cmake_compiler_state()
+
+    def _update_cmake_compiler_state(self) -> None:
         # Check if all variables are already cached
         if self.cmakestate.languages.issuperset(self.compilers.keys()):
             return
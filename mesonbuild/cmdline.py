@@ -207,7 +207,7 @@ class KeyValueAction(argparse.Action):
 
 
 def register_builtin_arguments(parser: argparse.ArgumentParser) -> None:
-    for n, b in options.BUILTIN_OPTIONS.items():
+    for n, b in options.get_builtin_options().items():
         cmdline_name = options.argparse_name_to_arg(str(n))
         parser.add_argument(cmdline_name, action=BuiltinAction,
                             option_key=n, option=b)
@@ -42,7 +42,6 @@ if T.TYPE_CHECKING:
     from ..environment import Environment
     from ..linkers.linkers import DynamicLinker
     from ..mesonlib import MachineChoice
-    from .compilers import CompileCheckMode
     from ..build import BuildTarget
 
     CompilerMixinBase = Compiler
@@ -78,22 +77,6 @@ class CCompiler(CLikeCompiler, Compiler):
     def _sanity_check_source_code(self) -> str:
         return '#include <stddef.h>\nint main(void) { int class=0; return class; }\n'
 
-    def has_header_symbol(self, hname: str, symbol: str, prefix: str, *,
-                          extra_args: T.Union[None, T.List[str], T.Callable[['CompileCheckMode'], T.List[str]]] = None,
-                          dependencies: T.Optional[T.List['Dependency']] = None) -> T.Tuple[bool, bool]:
-        fargs = {'prefix': prefix, 'header': hname, 'symbol': symbol}
-        t = '''{prefix}
-        #include <{header}>
-        int main(void) {{
-            /* If it's not defined as a macro, try to use as a symbol */
-            #ifndef {symbol}
-                {symbol};
-            #endif
-            return 0;
-        }}'''
-        return self.compiles(t.format(**fargs), extra_args=extra_args,
-                             dependencies=dependencies)
-
     def get_options(self) -> 'MutableKeyedOptionDictType':
         opts = super().get_options()
         key = self.form_compileropt_key('std')
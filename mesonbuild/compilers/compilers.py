@@ -15,6 +15,8 @@ from functools import lru_cache
 from .. import mlog
 from .. import mesonlib
 from .. import options
+from .. import profiling
+from .. import toolchaincache
 from ..mesonlib import (
     HoldableObject, SimpleABC,
     EnvironmentException, MesonBugException, MesonException,
@@ -556,6 +558,11 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
     # steps are one and the same (such as for Rust).
     USED_FOR_SEPARATE_LINKING_STEP = True
 
+    # Whether a successful sanity check may be recorded in the persistent
+    # toolchain cache and skipped in later setups. Compilers whose
+    # sanity_check() also gathers information must set this to False.
+    CACHEABLE_SANITY_CHECK = True
+
     language: Language
     id: str
     warn_args: T.Dict[str, T.List[str]]
@@ -762,6 +769,21 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
         """
         raise EnvironmentException('Language %s does not support header checks.' % self.get_display_language())
 
+    def has_headers(self, hnames: T.List[str], prefix: str, *,
+                    extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]] = None,
+                    dependencies: T.Optional[T.List['Dependency']] = None) -> T.Dict[str, T.Tuple[bool, bool]]:
+        """Check that several headers exist.
+
+        The result is the same as calling has_header with each header in
+        turn, but compilers may check many headers with a single invocation.
+
+        :returns:
+            A dict mapping each header to a tuple of (bool, bool), as
+            returned by has_header
+        """
+        return {h: self.has_header(h, prefix, extra_args=extra_args, dependencies=dependencies)
+                for h in hnames}
+
     def has_header_symbol(self, hname: str, symbol: str, prefix: str, *,
                           extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]] = None,
                           dependencies: T.Optional[T.List['Dependency']] = None) -> T.Tuple[bool, bool]:
@@ -807,6 +829,10 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
         run_check_cache = self.environment.coredata.run_check_cache
         args = self.build_wrapper_args(extra_args, dependencies, CompileCheckMode('link'))
         key = (code, tuple(args))
+        if key not in run_check_cache:
+            persistent = self._load_persistent_check('run', [code, args])
+            if persistent is not None:
+                run_check_cache[key] = RunResult(**persistent)
         if key in run_check_cache:
             p = run_check_cache[key]
             p.cached = True
@@ -819,8 +845,46 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
         else:
             p = self.run(code, extra_args=extra_args, dependencies=dependencies)
             run_check_cache[key] = p
+            self._store_persistent_check('run', [code, args], {
+                'compiled': p.compiled, 'returncode': p.returncode,
+                'stdout': p.stdout, 'stderr': p.stderr})
         return p
 
+    def _persistent_check_key(self, kind: str, key: T.List[T.Any]) -> T.Optional[T.List[T.Any]]:
+        """Extend a check cache key so that it identifies the toolchain.
+
+        Returns None if the toolchain can't be fingerprinted, in which case the
+        persistent cache must not be used.
+        """
+        digest = toolchaincache.program_digest(self.exelist_no_ccache)
+        if digest is None:
+            return None
+        toolchain: T.List[T.Any] = [digest, self.id, self.version, self.exelist_no_ccache, self.for_machine.name]
+        if self.linker is not None:
+            toolchain += [self.linker.id, self.linker.version, self.linker.get_exelist()]
+        if kind == 'run' and self.environment.need_exe_wrapper(self.for_machine):
+            if not self.environment.has_exe_wrapper():
+                return None
+            toolchain.append(self.environment.exe_wrapper.get_command())
+        return [kind, toolchain, toolchaincache.toolchain_environment()] + key
+
+    def _load_persistent_check(self, kind: str, key: T.List[T.Any]) -> T.Optional[T.Dict[str, T.Any]]:
+        cache = toolchaincache.ToolchainCache.from_environ()
+        if cache is None:
+            return None
+        full_key = self._persistent_check_key(kind, key)
+        if full_key is None:
+            return None
+        return T.cast('T.Optional[T.Dict[str, T.Any]]', cache.lookup('checks', full_key))
+
+    def _store_persistent_check(self, kind: str, key: T.List[T.Any], value: T.Dict[str, T.Any]) -> None:
+        cache = toolchaincache.ToolchainCache.from_environ()
+        if cache is None:
+            return
+        full_key = self._persistent_check_key(kind, key)
+        if full_key is not None:
+            cache.store('checks', full_key, value)
+
     def sizeof(self, typename: str, prefix: str, *,
                extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]] = None,
                dependencies: T.Optional[T.List['Dependency']] = None) -> T.Tuple[int, bool]:
@@ -890,6 +954,22 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
         """
         return self.linker.has_multi_arguments(args)
 
+    def get_supported_arguments_batched(self, args: T.List[str], link: bool = False) -> T.Dict[str, T.Tuple[bool, bool]]:
+        """Checks which of the arguments are supported, each on its own.
+
+        The result is the same as calling has_multi_arguments (or
+        has_multi_link_arguments) with each argument in turn, but compilers
+        with well-known diagnostics may check many arguments with a single
+        invocation.
+
+        :returns:
+            A dict mapping each argument to a tuple of (bool, bool), as
+            returned by has_multi_arguments
+        """
+        if link:
+            return {a: self.has_multi_link_arguments([a]) for a in args}
+        return {a: self.has_multi_arguments([a]) for a in args}
+
     def _get_compile_output(self, dirname: str, mode: CompileCheckMode) -> str:
         assert mode != CompileCheckMode.PREPROCESS, 'In pre-processor mode, the output is sent to stdout and discarded'
         # Extension only matters if running results; '.exe' is
@@ -979,13 +1059,47 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
             os_env['LC_ALL'] = 'C'
             if no_ccache:
                 os_env['CCACHE_DISABLE'] = '1'
-            p, stdo, stde = Popen_safe_logged(command_list, msg='Command line', cwd=tmpdirname, env=os_env)
+            with profiling.span(f'{self.language} {CompileCheckMode(mode).value}', 'compiler', command=command_list):
+                p, stdo, stde = Popen_safe_logged(command_list, msg='Command line', cwd=tmpdirname, env=os_env)
 
             result = CompileResult(stdo, stde, command_list, p.returncode, input_name=srcname)
             if want_output:
                 result.output_name = output
             yield result
 
+    def _compile_check_keys(self, code: 'mesonlib.FileOrString',
+                            extra_args: T.Union[None, T.List[str], CompilerArgs],
+                            mode: CompileCheckMode) -> T.Tuple[coredata.CompilerCheckCacheKey, T.Optional[T.List[T.Any]]]:
+        textra_args: T.Tuple[str, ...] = tuple(extra_args) if extra_args is not None else tuple()
+        key: coredata.CompilerCheckCacheKey = (tuple(self.exelist), self.version, code, textra_args, mode)
+        # Files may change between invocations, only literal code can be
+        # looked up in the persistent cache
+        persistent_key = [code, list(textra_args), mode.value] if isinstance(code, str) else None
+        return key, persistent_key
+
+    def lookup_compile_check(self, code: 'mesonlib.FileOrString',
+                             extra_args: T.Union[None, T.List[str], CompilerArgs],
+                             mode: CompileCheckMode) -> T.Optional[CompileResult]:
+        """Get the cached result of a compile check, without running it."""
+        key, persistent_key = self._compile_check_keys(code, extra_args, mode)
+        cache = self.environment.coredata.compiler_check_cache
+        if key not in cache and persistent_key is not None:
+            persistent = self._load_persistent_check('compile', persistent_key)
+            if persistent is not None:
+                cache[key] = CompileResult(**persistent)
+        return cache.get(key)
+
+    def store_compile_check(self, code: 'mesonlib.FileOrString',
+                            extra_args: T.Union[None, T.List[str], CompilerArgs],
+                            mode: CompileCheckMode, result: CompileResult) -> None:
+        """Record the result of a compile check in the check caches."""
+        key, persistent_key = self._compile_check_keys(code, extra_args, mode)
+        self.environment.coredata.compiler_check_cache[key] = result
+        if persistent_key is not None:
+            self._store_persistent_check('compile', persistent_key, {
+                'stdout': result.stdout, 'stderr': result.stderr, 'command': result.command,
+                'returncode': result.returncode, 'input_name': result.input_name})
+
     @contextlib.contextmanager
     def cached_compile(self, code: 'mesonlib.FileOrString', *,
                        extra_args: T.Union[None, T.List[str], CompilerArgs] = None,
@@ -993,14 +1107,9 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
                        temp_dir: T.Optional[str] = None) -> T.Iterator[CompileResult]:
         # TODO: There's isn't really any reason for this to be a context manager
 
-        # Calculate the key
-        textra_args: T.Tuple[str, ...] = tuple(extra_args) if extra_args is not None else tuple()
-        key: coredata.CompilerCheckCacheKey = (tuple(self.exelist), self.version, code, textra_args, mode)
-
         # Check if not cached, and generate, otherwise get from the cache
-        cache = self.environment.coredata.compiler_check_cache
-        if key in cache:
-            p = cache[key]
+        p = self.lookup_compile_check(code, extra_args, mode)
+        if p is not None:
             p.cached = True
             mlog.debug('Using cached compile:')
             mlog.debug('Cached command line: ', ' '.join(p.command), '\n')
@@ -1010,7 +1119,7 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
             yield p
         else:
             with self.compile(code, extra_args=extra_args, mode=mode, want_output=False, temp_dir=temp_dir) as p:
-                cache[key] = p
+                self.store_compile_check(code, extra_args, mode, p)
                 yield p
 
     def get_colorout_args(self, colortype: str) -> T.List[str]:
@@ -1338,6 +1447,37 @@ class Compiler(HoldableObject, metaclass=SimpleABC):
     def name_string(self) -> str:
         return ' '.join(self.exelist)
 
+    def run_sanity_check(self, work_dir: str, revalidate: bool = False) -> None:
+        """Run sanity_check(), unless this toolchain is known to pass it.
+
+        When the persistent toolchain cache is enabled, a successful sanity
+        check is recorded there, and later setups using the same toolchain and
+        arguments skip it unless revalidate is set.
+
+        :param work_dir: A directory to put temporary artifacts
+        :param revalidate: Always run the sanity check
+        """
+        key = self._sanity_check_cache_key()
+        if key is not None and not revalidate and self._load_persistent_check('sanity', key) is not None:
+            mlog.debug(f'Skipping sanity check of {self.name_string()}, it passed before with this toolchain')
+            return
+        self.sanity_check(work_dir)
+        if key is not None:
+            self._store_persistent_check('sanity', key, {'passed': True})
+
+    def _sanity_check_cache_key(self) -> T.Optional[T.List[T.Any]]:
+        if not self.CACHEABLE_SANITY_CHECK:
+            return None
+        sourcename, transpiled, binname = self._sanity_check_filenames()
+        if transpiled:
+            # The result also depends on the compiler of the transpiled code
+            return None
+        cmdlist, linker_args = self._sanity_check_compile_args(sourcename, binname)
+        run_args: T.Optional[T.List[str]] = None
+        if not self.is_cross or self.environment.has_exe_wrapper():
+            run_args = self._sanity_check_run_with_exe_wrapper([binname])
+        return [self._sanity_check_source_code(), cmdlist, linker_args, run_args]
+
     def sanity_check(self, work_dir: str) -> None:
         """Check that this compiler actually works.
 
@@ -10,11 +10,11 @@ from ..mesonlib import (
 )
 from ..programs import ExternalProgram
 from ..envconfig import BinaryTable, detect_cpu_family
-from .. import mlog
+from ..toolchaincache import run_probe
+from .. import mlog, profiling
 
 from ..linkers import guess_win_linker, guess_nix_linker
 
-import subprocess
 import platform
 import re
 import shutil
@@ -107,13 +107,15 @@ def compiler_from_language(env: 'Environment', lang: str, for_machine: MachineCh
     return lang_map[lang](env, for_machine) if lang in lang_map else None
 
 def detect_compiler_for(env: 'Environment', lang: Language, for_machine: MachineChoice, skip_sanity_check: bool, subproject: str) -> T.Optional[Compiler]:
-    comp = compiler_from_language(env, lang, for_machine)
+    with profiling.span(f'detect {lang} compiler', 'toolchain', machine=for_machine.get_lower_case_name()):
+        comp = compiler_from_language(env, lang, for_machine)
     if comp is None:
         return comp
     assert comp.for_machine == for_machine
     env.coredata.process_compiler_options(lang, comp, subproject)
     if not skip_sanity_check:
-        comp.sanity_check(env.get_scratch_dir())
+        with profiling.span(f'{lang} sanity check', 'toolchain', machine=for_machine.get_lower_case_name()):
+            comp.run_sanity_check(env.get_scratch_dir(), env.revalidate_toolchains)
     env.coredata.compilers[comp.for_machine][lang] = comp
     return comp
 
@@ -226,7 +228,7 @@ def detect_static_linker(env: 'Environment', compiler: Compiler) -> StaticLinker
         else:
             arg = '--version'
         try:
-            p, out, err = Popen_safe_logged(linker + [arg], msg='Detecting archiver via')
+            rc, out, err = run_probe(linker + [arg], msg='Detecting archiver via')
         except OSError as e:
             popen_exceptions[join_args(linker + [arg])] = e
             continue
@@ -236,7 +238,7 @@ def detect_static_linker(env: 'Environment', compiler: Compiler) -> StaticLinker
             return linkers.VisualStudioLinker(linker, env, getattr(compiler, 'machine', None))
         if 'ar-Error-Unknown switch: --version' in err:
             return linkers.PGIStaticLinker(linker, env)
-        if p.returncode == 0 and 'armar' in linker_name:
+        if rc == 0 and 'armar' in linker_name:
             return linkers.ArmarLinker(linker, env)
         if 'DMD32 D Compiler' in out or 'DMD64 D Compiler' in out:
             assert isinstance(compiler, d.DCompiler)
@@ -270,15 +272,15 @@ def detect_static_linker(env: 'Environment', compiler: Compiler) -> StaticLinker
                 return linkers.MetrowerksStaticLinkerEmbeddedPowerPC(linker, env)
         if 'TASKING VX-toolset' in err:
             return linkers.TaskingStaticLinker(linker, env)
-        if p.returncode == 0:
+        if rc == 0:
             return linkers.ArLinker(compiler.for_machine, linker, env)
-        if p.returncode == 1 and err.startswith('usage'): # OSX
+        if rc == 1 and err.startswith('usage'): # OSX
             return linkers.AppleArLinker(compiler.for_machine, linker, env)
-        if p.returncode == 1 and err.startswith('Usage'): # AIX
+        if rc == 1 and err.startswith('Usage'): # AIX
             return linkers.AIXArLinker(linker, env)
-        if p.returncode == 1 and err.startswith('ar: bad option: --'): # Solaris
+        if rc == 1 and err.startswith('ar: bad option: --'): # Solaris
             return linkers.ArLinker(compiler.for_machine, linker, env)
-        if p.returncode == 1 and err.startswith('emxomfar'):
+        if rc == 1 and err.startswith('emxomfar'):
             return linkers.EmxomfArLinker(compiler.for_machine, linker, env)
     _handle_exceptions(popen_exceptions, trials, 'linker')
     raise EnvironmentException('Unreachable code (exception to make mypy happy)')
@@ -350,7 +352,7 @@ def _detect_c_or_cpp_compiler(env: 'Environment', lang: str, for_machine: Machin
 
         cmd = compiler + [arg]
         try:
-            p, out, err = Popen_safe_logged(cmd, msg='Detecting compiler via')
+            _, out, err = run_probe(cmd, msg='Detecting compiler via')
         except OSError as e:
             popen_exceptions[join_args(cmd)] = e
             continue
@@ -742,14 +744,14 @@ def detect_fortran_compiler(env: 'Environment', for_machine: MachineChoice) -> C
     for compiler in compilers:
         # capture help text for possible fallback
         try:
-            _, help_out, _ = Popen_safe_logged(compiler + ['--help'], msg='Detecting compiler via')
+            _, help_out, _ = run_probe(compiler + ['--help'], msg='Detecting compiler via')
         except OSError as e:
             popen_exceptions[join_args(compiler + ['--help'])] = e
             help_out = ''
 
         for arg in ['--version', '-V']:
             try:
-                p, out, err = Popen_safe_logged(compiler + [arg], msg='Detecting compiler via')
+                _, out, err = run_probe(compiler + [arg], msg='Detecting compiler via')
             except OSError as e:
                 popen_exceptions[join_args(compiler + [arg])] = e
                 continue
@@ -936,7 +938,7 @@ def _detect_objc_or_objcpp_compiler(env: 'Environment', lang: str, for_machine:
     for compiler in compilers:
         arg = ['--version']
         try:
-            p, out, err = Popen_safe_logged(compiler + arg, msg='Detecting compiler via')
+            _, out, err = run_probe(compiler + arg, msg='Detecting compiler via')
         except OSError as e:
             popen_exceptions[join_args(compiler + arg)] = e
             continue
@@ -1461,9 +1463,8 @@ def _get_gnu_compiler_defines(compiler: T.List[str], lang: str) -> T.Dict[str, s
     from .mixins.gnu import gnu_lang_map
 
     def _try_obtain_compiler_defines(args: T.List[str]) -> str:
-        mlog.debug(f'Running command: {join_args(args)}')
-        p, output, error = Popen_safe(compiler + args, write='', stdin=subprocess.PIPE)
-        if p.returncode != 0:
+        rc, output, error = run_probe(compiler + args, msg='Running command', write='', log_output=False)
+        if rc != 0:
             raise EnvironmentException('Unable to get gcc pre-processor defines:\n'
                                        f'Compiler stdout:\n{output}\n-----\n'
                                        f'Compiler stderr:\n{error}\n-----\n')
@@ -1514,9 +1515,8 @@ def _get_clang_compiler_defines(compiler: T.List[str], lang: str) -> T.Dict[str,
     from .mixins.clang import clang_lang_map
 
     def _try_obtain_compiler_defines(args: T.List[str]) -> str:
-        mlog.debug(f'Running command: {join_args(args)}')
-        p, output, error = Popen_safe(compiler + args, write='', stdin=subprocess.PIPE)
-        if p.returncode != 0:
+        rc, output, error = run_probe(compiler + args, msg='Running command', write='', log_output=False)
+        if rc != 0:
             raise EnvironmentException('Unable to get clang pre-processor defines:\n'
                                        f'Compiler stdout:\n{output}\n-----\n'
                                        f'Compiler stderr:\n{error}\n-----\n')
@@ -120,6 +120,11 @@ class FortranCompiler(CLikeCompiler, Compiler):
     def has_multi_link_arguments(self, args: T.List[str], to_host_args: bool = True) -> T.Tuple[bool, bool]:
         return self._has_multi_link_arguments(args, 'stop; end program')
 
+    def get_supported_arguments_batched(self, args: T.List[str], link: bool = False) -> T.Dict[str, T.Tuple[bool, bool]]:
+        if not self.BATCHED_ARGUMENT_CHECKS:
+            return super().get_supported_arguments_batched(args, link)
+        return self._get_supported_arguments_batched(args, link, 'stop; end program')
+
     def get_options(self) -> 'MutableKeyedOptionDictType':
         opts = super().get_options()
 
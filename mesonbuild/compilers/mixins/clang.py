@@ -54,6 +54,8 @@ class ClangCompiler(GnuLikeCompiler):
 
     id = 'clang'
 
+    BATCHED_ARGUMENT_CHECKS = True
+
     # -fms-runtime-lib is a compilation option which sets up an automatic dependency
     # from the .o files to the final link product
     CRT_D_ARGS: T.Dict[str, T.List[str]] = {
@@ -17,7 +17,9 @@ import glob
 import itertools
 import os
 import re
+import shutil
 import subprocess
+import threading
 import copy
 import typing as T
 from pathlib import Path
@@ -25,6 +27,7 @@ from pathlib import Path
 from ... import arglist
 from ... import mesonlib
 from ... import mlog
+from ... import toolchaincache
 from ...options import OptionKey
 from ...linkers.linkers import GnuLikeDynamicLinkerMixin, SolarisDynamicLinker, CompCertDynamicLinker
 from ...mesonlib import LibType
@@ -48,6 +51,17 @@ GROUP_FLAGS = re.compile(r'''^(?!-Wl,) .*\.so (?:\.[0-9]+)? (?:\.[0-9]+)? (?:\.[
                              ^(?:-Wl,)?-l |
                              \.a$''', re.X)
 
+# Diagnostics which say that a single command line argument is not supported,
+# as printed by GCC, Clang and the linkers they drive. The "valid for" kind is
+# a warning, whether it makes the check fail is up to has_arguments_result().
+UNSUPPORTED_ARGUMENT_DIAGNOSTIC = re.compile(r'''
+    (?:(?P<unknown>unrecognized\ command[- ]line\ option    # GCC
+                  |unrecognized\ option                      # GNU ld, gold
+                  |unknown\ argument:?                       # Clang, lld
+                  |unknown\ warning\ option)                 # Clang
+      |(?P<language>command[- ]line\ option))               # GCC, for another language
+    \ ['"](?P<arg>[^'"]+)['"]''', re.X)
+
 class CLikeCompilerArgs(arglist.CompilerArgs):
     # Note: ``-isystem`` is deliberately absent from prepend_prefixes.
     # Because ``-isystem`` is appended by __iadd__ rather than
@@ -141,8 +155,23 @@ class CLikeCompiler(Compiler):
     # TODO: Replace this manual cache with functools.lru_cache
     find_library_cache: T.Dict[T.Tuple[T.Tuple[str, ...], str, T.Tuple[str, ...], str, LibType, bool, bool], T.Optional[T.List[str]]] = {}
     find_framework_cache: T.Dict[T.Tuple[T.Tuple[str, ...], str, T.Tuple[str, ...], bool], T.Optional[T.List[str]]] = {}
+    # Dependencies looked up ahead of time find libraries on worker threads.
+    # The caches above are read and written with this lock held, but the
+    # search is done without it, so two threads may search for the same
+    # library at once.
+    find_cache_lock = threading.Lock()
+    # The libraries a link check uses and the stub functions of the C library,
+    # and the symbols of these libraries with the identities of the library
+    # files they were read from. Both are keyed on the exelist and arguments,
+    # see _linked_symbols().
+    linked_libraries_cache: T.Dict[T.Tuple[T.Tuple[str, ...], T.Tuple[str, ...]], T.Optional[T.Tuple[T.Tuple[str, ...], T.FrozenSet[str]]]] = {}
+    linked_symbols_cache: T.Dict[T.Tuple[T.Tuple[str, ...], T.Tuple[str, ...]], T.Tuple[T.Tuple[T.Any, ...], T.FrozenSet[str]]] = {}
     internal_libs = arglist.UNIXY_COMPILER_INTERNAL_LIBS
 
+    # Whether the diagnostics of this compiler for unsupported arguments are
+    # understood well enough to check many arguments with a single invocation
+    BATCHED_ARGUMENT_CHECKS = False
+
     def __init__(self) -> None:
         # If a child ObjC or CPP class has already set it, don't set it ourselves
         self.can_compile_suffixes.add('h')
@@ -297,7 +326,12 @@ class CLikeCompiler(Compiler):
                    extra_args: T.Union[None, T.List[str], T.Callable[['CompileCheckMode'], T.List[str]]] = None,
                    dependencies: T.Optional[T.List['Dependency']] = None,
                    disable_cache: bool = False) -> T.Tuple[bool, bool]:
-        code = f'''{prefix}
+        return self.compiles(self._has_header_code(hname, prefix), extra_args=extra_args,
+                             dependencies=dependencies, mode=CompileCheckMode.PREPROCESS, disable_cache=disable_cache)
+
+    @staticmethod
+    def _has_header_code(hname: str, prefix: str) -> str:
+        return f'''{prefix}
         #ifdef __has_include
          #if !__has_include("{hname}")
           #error "Header '{hname}' could not be found"
@@ -305,8 +339,54 @@ class CLikeCompiler(Compiler):
         #else
          #include <{hname}>
         #endif'''
-        return self.compiles(code, extra_args=extra_args,
-                             dependencies=dependencies, mode=CompileCheckMode.PREPROCESS, disable_cache=disable_cache)
+
+    def has_headers(self, hnames: T.List[str], prefix: str, *,
+                    extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]] = None,
+                    dependencies: T.Optional[T.List['Dependency']] = None) -> T.Dict[str, T.Tuple[bool, bool]]:
+        """Check for many headers with a single preprocessor invocation.
+
+        If the compiler supports __has_include, all headers that are not in
+        the check cache are tested with one preprocessor run, and the outcome
+        for each header is stored in the check cache under the key has_header()
+        would use. Otherwise each header is checked on its own.
+        """
+        mode = CompileCheckMode.PREPROCESS
+        args = self.build_wrapper_args(extra_args, dependencies, mode)
+        results: T.Dict[str, T.Tuple[bool, bool]] = {}
+        missing: T.List[str] = []
+        for hname in dict.fromkeys(hnames):
+            if self.lookup_compile_check(self._has_header_code(hname, prefix), args, mode) is None:
+                missing.append(hname)
+            else:
+                results[hname] = self.has_header(hname, prefix, extra_args=extra_args, dependencies=dependencies)
+
+        if len(missing) > 1:
+            supported = '"MESON_HAS_INCLUDE_SUPPORTED"'
+            checks = '\n'.join(f'''
+            #if __has_include("{hname}")
+            "MESON_HAS_HEADER_{i}"
+            #endif''' for i, hname in enumerate(missing))
+            code = f'''{prefix}
+            #ifdef __has_include
+            {supported}
+            {checks}
+            #endif'''
+            with self._build_wrapper(code, extra_args, dependencies, mode, disable_cache=True) as p:
+                pass
+            if p.returncode == 0 and supported in p.stdout:
+                found = set(re.findall(r'"MESON_HAS_HEADER_(\d+)"', p.stdout))
+                for i, hname in enumerate(missing):
+                    if str(i) in found:
+                        r = compilers.CompileResult('', '', p.command, 0, p.input_name)
+                    else:
+                        r = compilers.CompileResult('', f"error: Header '{hname}' could not be found", p.command, 1, p.input_name)
+                    self.store_compile_check(self._has_header_code(hname, prefix), args, mode, r)
+                    results[hname] = (r.returncode == 0, False)
+                missing = []
+
+        for hname in missing:
+            results[hname] = self.has_header(hname, prefix, extra_args=extra_args, dependencies=dependencies)
+        return {h: results[h] for h in hnames}
 
     def has_header_symbol(self, hname: str, symbol: str, prefix: str, *,
                           extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]] = None,
@@ -320,9 +400,42 @@ class CLikeCompiler(Compiler):
             #endif
             return 0;
         }}'''
+        if (self._symbol_index_enabled() and self.get_argument_syntax() == 'gcc'
+                and not self._has_cached_check(t, extra_args, dependencies, CompileCheckMode.COMPILE)
+                and symbol in self._header_macros(hname, prefix, extra_args, dependencies)):
+            # The check below does not reference macros, so it only needs the
+            # header itself to compile
+            h = f'''{prefix}
+            #include <{hname}>
+            int main(void) {{
+                return 0;
+            }}'''
+            if self.compiles(h, extra_args=extra_args, dependencies=dependencies)[0]:
+                mlog.debug(f'Found {symbol} in the macros defined by {hname}')
+                return True, self._index_hit(t, extra_args, dependencies, CompileCheckMode.COMPILE)
         return self.compiles(t, extra_args=extra_args,
                              dependencies=dependencies)
 
+    def _has_cached_check(self, code: str, extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]],
+                          dependencies: T.Optional[T.List['Dependency']], mode: CompileCheckMode) -> bool:
+        args = self.build_wrapper_args(extra_args, dependencies, mode)
+        return self.lookup_compile_check(code, args, mode) is not None
+
+    def _index_hit(self, code: str, extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]],
+                   dependencies: T.Optional[T.List['Dependency']], mode: CompileCheckMode) -> bool:
+        """Record a check answered from the symbol index.
+
+        The answer itself is not stored, as the check never ran. Returns
+        whether the same check was answered before, so that a repeated
+        check is reported as cached just like one that ran.
+        """
+        args = self.build_wrapper_args(extra_args, dependencies, mode)
+        key, _ = self._compile_check_keys(code, args, mode)
+        hits = self.environment.coredata.symbol_index_hits
+        cached = key in hits
+        hits.add(key)
+        return cached
+
     def _get_basic_compiler_args(self, mode: CompileCheckMode) -> T.Tuple[T.List[str], T.List[str]]:
         cargs: T.List[str] = []
         largs: T.List[str] = []
@@ -800,7 +913,17 @@ class CLikeCompiler(Compiler):
             head, main = self._no_prototype_templ()
         templ = head + stubs_fail + main
 
-        res, cached = self.links(templ.format(**fargs), extra_args=extra_args,
+        # Without includes in the prefix the check passes exactly when a
+        # library linked by default defines the symbol
+        code = templ.format(**fargs)
+        if ('#include' not in prefix and funcname not in prefix and self._symbol_index_enabled()
+                and not self._has_cached_check(code, extra_args, dependencies, CompileCheckMode.LINK)):
+            symbols = self._linked_symbols(extra_args, dependencies)
+            if symbols is not None and funcname in symbols:
+                mlog.debug(f'Found {funcname} in the symbols of the default libraries')
+                return True, self._index_hit(code, extra_args, dependencies, CompileCheckMode.LINK)
+
+        res, cached = self.links(code, extra_args=extra_args,
                                  dependencies=dependencies)
         if res:
             return True, cached
@@ -845,6 +968,110 @@ class CLikeCompiler(Compiler):
         return self.links(t.format(**fargs), extra_args=extra_args,
                           dependencies=dependencies)
 
+    def _symbol_index_enabled(self) -> bool:
+        return os.environ.get('MESON_SYMBOL_INDEX', '') not in {'', '0'}
+
+    def _linked_symbols(self, extra_args: T.List[str],
+                        dependencies: T.Optional[T.List['Dependency']]) -> T.Optional[T.FrozenSet[str]]:
+        """Get the symbols defined by the libraries a link check uses.
+
+        The libraries are found by tracing the link of an empty program, and
+        the symbols they define are read with nm. Object files in the trace
+        are the program itself and the startup files, and are skipped. The
+        symbols are read again when the identity of a library file changed.
+        The symbols of each library are also stored in the toolchain cache,
+        keyed on the identity of the file. Functions which glibc only provides
+        as stubs are left out.
+
+        Returns None if the linker can't trace its inputs or there is no nm.
+        """
+        if self.linker is None or self.linker.id not in {'ld.bfd', 'ld.gold', 'ld.lld', 'ld.mold'}:
+            return None
+        nm = self.environment.lookup_binary_entry(self.for_machine, 'nm')
+        if nm is None:
+            if self.is_cross or shutil.which('nm') is None:
+                return None
+            nm = ['nm']
+        args = self.build_wrapper_args(extra_args, dependencies, CompileCheckMode.LINK)
+        key = (tuple(self.exelist), tuple(args))
+        if key not in self.linked_libraries_cache:
+            self.linked_libraries_cache[key] = self._linked_libraries(extra_args, dependencies)
+        libraries = self.linked_libraries_cache[key]
+        if libraries is None:
+            return None
+
+        paths, stubs = libraries
+        identities = tuple(tuple(i) if i is not None else None
+                           for i in (toolchaincache.file_identity(p) for p in paths))
+        cached = self.linked_symbols_cache.get(key)
+        if cached is not None and cached[0] == identities:
+            return cached[1]
+        symbols: T.Set[str] = set()
+        for path in paths:
+            symbols.update(self._file_symbols(nm, path))
+        result = frozenset(symbols - stubs)
+        self.linked_symbols_cache[key] = (identities, result)
+        return result
+
+    def _linked_libraries(self, extra_args: T.List[str], dependencies: T.Optional[T.List['Dependency']]
+                          ) -> T.Optional[T.Tuple[T.Tuple[str, ...], T.FrozenSet[str]]]:
+        """Get the libraries a link check uses and the stub functions of the C library."""
+        with self._build_wrapper('int main(void) { return 0; }\n', extra_args + ['-Wl,--trace'],
+                                 dependencies, CompileCheckMode.LINK, disable_cache=True) as p:
+            if p.returncode != 0:
+                return None
+            # Object files are the probe itself and the startup files, which
+            # are linked into every program but define symbols such as main or
+            # _start rather than library functions
+            paths = tuple(path for path in dict.fromkeys(p.stdout.splitlines())
+                          if os.path.isfile(path) and not path.endswith(('.o', '.obj')))
+        stubs: T.Set[str] = set()
+        with self._build_wrapper('#include <limits.h>\n', extra_args + ['-dM'],
+                                 dependencies, CompileCheckMode.PREPROCESS) as p:
+            for stub in re.findall(r'^#define __stub_(\w+)', p.stdout, re.MULTILINE):
+                stubs.add(stub)
+                stubs.add(stub[2:] if stub.startswith('__') else stub)
+        return paths, frozenset(stubs)
+
+    @staticmethod
+    def _file_symbols(nm: T.List[str], path: str) -> T.List[str]:
+        cache = toolchaincache.ToolchainCache.from_environ()
+        identity = toolchaincache.program_identity(path)
+        key = [nm, identity]
+        if cache is not None and identity is not None:
+            cached = cache.lookup('symbols', key)
+            if isinstance(cached, list):
+                return cached
+        shared = '.so' in os.path.basename(path)
+        p, out, _ = mesonlib.Popen_safe(nm + ['-D' if shared else '-g', '--defined-only', path])
+        symbols: T.List[str] = []
+        # Linker scripts such as glibc's libc.so are not understood by nm
+        if p.returncode == 0:
+            for line in out.splitlines():
+                fields = line.split()
+                if len(fields) < 2 or line.endswith(':'):
+                    continue
+                name, default, _ = fields[-1].partition('@@')
+                if not default and '@' in name:
+                    # Only the default version of a symbol can be linked to
+                    continue
+                symbols.append(name)
+        if cache is not None and identity is not None:
+            cache.store('symbols', key, symbols)
+        return symbols
+
+    def _header_macros(self, hname: str, prefix: str,
+                       extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]],
+                       dependencies: T.Optional[T.List['Dependency']]) -> T.Set[str]:
+        """Get the names of all macros defined after including a header."""
+        args = self.build_wrapper_args(extra_args, dependencies, CompileCheckMode.PREPROCESS)
+        args += ['-dM']
+        with self.cached_compile(f'{prefix}\n#include <{hname}>\n', extra_args=args,
+                                 mode=CompileCheckMode.PREPROCESS, temp_dir=self.environment.scratch_dir) as p:
+            if p.returncode != 0:
+                return set()
+            return set(re.findall(r'^#define (\w+)', p.stdout, re.MULTILINE))
+
     def has_members(self, typename: str, membernames: T.List[str], prefix: str, *,
                     extra_args: T.Union[None, T.List[str], T.Callable[[CompileCheckMode], T.List[str]]] = None,
                     dependencies: T.Optional[T.List['Dependency']] = None) -> T.Tuple[bool, bool]:
@@ -1209,11 +1436,13 @@ class CLikeCompiler(Compiler):
         if isinstance(extra_dirs, str):
             extra_dirs = [extra_dirs]
         key = (tuple(self.exelist), libname, tuple(extra_dirs), code, libtype, ignore_system_dirs, skip_link_check)
-        if key not in self.find_library_cache:
+        with self.find_cache_lock:
+            cached = key in self.find_library_cache
+            value = self.find_library_cache.get(key)
+        if not cached:
             value = self._find_library_real(libname, extra_dirs, code, libtype, lib_prefix_warning, ignore_system_dirs, skip_link_check)
-            self.find_library_cache[key] = value
-        else:
-            value = self.find_library_cache[key]
+            with self.find_cache_lock:
+                self.find_library_cache[key] = value
         if value is None:
             return None
         return value.copy()
@@ -1270,11 +1499,13 @@ class CLikeCompiler(Compiler):
         if isinstance(extra_dirs, str):
             extra_dirs = [extra_dirs]
         key = (tuple(self.exelist), name, tuple(extra_dirs), allow_system)
-        if key in self.find_framework_cache:
-            value = self.find_framework_cache[key]
-        else:
+        with self.find_cache_lock:
+            cached = key in self.find_framework_cache
+            value = self.find_framework_cache.get(key)
+        if not cached:
             value = self._find_framework_real(name, extra_dirs, allow_system)
-            self.find_framework_cache[key] = value
+            with self.find_cache_lock:
+                self.find_framework_cache[key] = value
         if value is None:
             return None
         return value.copy()
@@ -1309,40 +1540,49 @@ class CLikeCompiler(Compiler):
 
     def has_arguments(self, args: T.List[str], code: str,
                       mode: CompileCheckMode) -> T.Tuple[bool, bool]:
-        return self.compiles(code, extra_args=args, mode=mode)
+        with self._build_wrapper(code, args, None, mode) as p:
+            return self.has_arguments_result(p), p.cached
 
-    def _has_multi_arguments(self, args: T.List[str], code: str) -> T.Tuple[bool, bool]:
+    def has_arguments_result(self, p: compilers.CompileResult) -> bool:
+        """Whether the compile done by has_arguments() accepted the arguments."""
+        return p.returncode == 0
+
+    def _argument_check_args(self, arg: str) -> T.List[str]:
+        """The arguments used by has_multi_arguments() to check arg."""
         new_args: T.List[str] = []
-        for arg in args:
-            # some compilers, e.g. GCC, don't warn for unsupported warning-disable
-            # flags, so when we are testing a flag like "-Wno-forgotten-towel", also
-            # check the equivalent enable flag too "-Wforgotten-towel".
-            if arg.startswith('-Wno-'):
-                # Make an exception for -Wno-attributes=x as -Wattributes=x is invalid
-                # for GCC at least.  Also, the positive form of some flags require a
-                # value to be specified, i.e. we need to pass -Wfoo=N rather than just
-                # -Wfoo.
-                if arg.startswith('-Wno-attributes='):
-                    pass
-                elif arg in {'-Wno-alloc-size-larger-than',
-                             '-Wno-alloca-larger-than',
-                             '-Wno-frame-larger-than',
-                             '-Wno-stack-usage',
-                             '-Wno-vla-larger-than'}:
-                    # Pass an arbitrary value to the enabling flag; since the test program
-                    # is trivial, it is unlikely to provoke any of these warnings.
-                    new_args.append('-W' + arg[5:] + '=1000')
-                else:
-                    new_args.append('-W' + arg[5:])
-            if arg.startswith('-Wl,'):
-                mlog.warning(f'{arg} looks like a linker argument, '
-                             'but has_argument and other similar methods only '
-                             'support checking compiler arguments. Using them '
-                             'to check linker arguments are never supported, '
-                             'and results are likely to be wrong regardless of '
-                             'the compiler you are using. has_link_argument or '
-                             'other similar method can be used instead.')
-            new_args.append(arg)
+        # some compilers, e.g. GCC, don't warn for unsupported warning-disable
+        # flags, so when we are testing a flag like "-Wno-forgotten-towel", also
+        # check the equivalent enable flag too "-Wforgotten-towel".
+        if arg.startswith('-Wno-'):
+            # Make an exception for -Wno-attributes=x as -Wattributes=x is invalid
+            # for GCC at least.  Also, the positive form of some flags require a
+            # value to be specified, i.e. we need to pass -Wfoo=N rather than just
+            # -Wfoo.
+            if arg.startswith('-Wno-attributes='):
+                pass
+            elif arg in {'-Wno-alloc-size-larger-than',
+                         '-Wno-alloca-larger-than',
+                         '-Wno-frame-larger-than',
+                         '-Wno-stack-usage',
+                         '-Wno-vla-larger-than'}:
+                # Pass an arbitrary value to the enabling flag; since the test program
+                # is trivial, it is unlikely to provoke any of these warnings.
+                new_args.append('-W' + arg[5:] + '=1000')
+            else:
+                new_args.append('-W' + arg[5:])
+        if arg.startswith('-Wl,'):
+            mlog.warning(f'{arg} looks like a linker argument, '
+                         'but has_argument and other similar methods only '
+                         'support checking compiler arguments. Using them '
+                         'to check linker arguments are never supported, '
+                         'and results are likely to be wrong regardless of '
+                         'the compiler you are using. has_link_argument or '
+                         'other similar method can be used instead.')
+        new_args.append(arg)
+        return new_args
+
+    def _has_multi_arguments(self, args: T.List[str], code: str) -> T.Tuple[bool, bool]:
+        new_args = list(itertools.chain.from_iterable(self._argument_check_args(a) for a in args))
         return self.has_arguments(new_args, code, mode=CompileCheckMode.COMPILE)
 
     def has_multi_arguments(self, args: T.List[str]) -> T.Tuple[bool, bool]:
@@ -1356,6 +1596,95 @@ class CLikeCompiler(Compiler):
     def has_multi_link_arguments(self, args: T.List[str], to_host_args: bool = True) -> T.Tuple[bool, bool]:
         return self._has_multi_link_arguments(args, 'int main(void) { return 0; }\n')
 
+    def _get_supported_arguments_batched(self, args: T.List[str], link: bool, code: str) -> T.Dict[str, T.Tuple[bool, bool]]:
+        """Check many arguments with as few compiler invocations as possible.
+
+        All arguments are first passed together. Arguments which the
+        diagnostics name as unsupported are rejected and the others are tried
+        again, if the failure can't be attributed to any argument the set is
+        split in two. The outcome for each argument is stored in the check
+        cache under the same key a check of that argument alone would use.
+        """
+        mode = CompileCheckMode.LINK if link else CompileCheckMode.COMPILE
+        # Expand each argument once up front, so that the warnings of
+        # _argument_check_args() are not repeated when falling back to
+        # checking arguments one by one.
+        expanded = {a: [a] if link else self._argument_check_args(a) for a in dict.fromkeys(args)}
+
+        def check_args(group: T.List[str]) -> T.List[str]:
+            if link:
+                return self.linker_to_compiler_args(self.linker.fatal_warnings() + group)
+            return list(itertools.chain.from_iterable(expanded[a] for a in group))
+
+        def single(group: T.List[str]) -> T.Tuple[bool, bool]:
+            return self.has_arguments(check_args(group), code, mode=mode)
+
+        results: T.Dict[str, T.Tuple[bool, bool]] = {}
+        pending: T.List[str] = []
+        for arg in expanded:
+            if self.lookup_compile_check(code, self.build_wrapper_args(check_args([arg]), None, mode), mode) is not None:
+                results[arg] = single([arg])
+            else:
+                pending.append(arg)
+
+        def probe(group: T.List[str]) -> None:
+            if len(group) == 1:
+                results[group[0]] = single(group)
+                return
+            # The argument, or the linker argument it wraps, which may be
+            # named in a diagnostic. Names shared by several arguments are
+            # ambiguous and never attributed.
+            owners: T.Dict[str, T.Set[str]] = collections.defaultdict(set)
+            for a in group:
+                for e in expanded[a]:
+                    owners[e].add(a)
+                    if e.startswith('-Wl,'):
+                        for part in e[4:].split(','):
+                            owners[part].add(a)
+            with self._build_wrapper(code, check_args(group), None, mode, disable_cache=True) as p:
+                pass
+            diagnostics: T.Dict[str, T.List[str]] = collections.defaultdict(list)
+            rejected: T.Set[str] = set()
+            for line in p.stderr.splitlines():
+                m = UNSUPPORTED_ARGUMENT_DIAGNOSTIC.search(line)
+                if m is None or len(owners.get(m.group('arg'), ())) != 1:
+                    continue
+                owner = next(iter(owners[m.group('arg')]))
+                diagnostics[owner].append(line)
+                if m.group('unknown'):
+                    rejected.add(owner)
+
+            def record(arg: str, returncode: int) -> None:
+                r = compilers.CompileResult(p.stdout, '\n'.join(diagnostics[arg]), p.command, returncode, p.input_name)
+                results[arg] = (self.has_arguments_result(r), False)
+                self.store_compile_check(code, self.build_wrapper_args(check_args([arg]), None, mode), mode, r)
+
+            if p.returncode == 0:
+                for a in group:
+                    record(a, 0)
+            elif rejected:
+                for a in group:
+                    if a in rejected:
+                        record(a, p.returncode)
+                remaining = [a for a in group if a not in rejected]
+                if remaining:
+                    probe(remaining)
+            else:
+                half = len(group) // 2
+                probe(group[:half])
+                probe(group[half:])
+
+        if pending:
+            probe(pending)
+        return {a: results[a] for a in args}
+
+    def get_supported_arguments_batched(self, args: T.List[str], link: bool = False) -> T.Dict[str, T.Tuple[bool, bool]]:
+        if not self.BATCHED_ARGUMENT_CHECKS:
+            return super().get_supported_arguments_batched(args, link)
+        if link:
+            return self._get_supported_arguments_batched(args, link, 'int main(void) { return 0; }\n')
+        return self._get_supported_arguments_batched(args, link, 'extern int i;\nint i;\n')
+
     @staticmethod
     def _concatenate_string_literals(s: str) -> str:
         pattern = re.compile(r'(?P<pre>.*([^\\]")|^")(?P<str1>([^\\"]|\\.)*)"\s+"(?P<str2>([^\\"]|\\.)*)(?P<post>".*)')
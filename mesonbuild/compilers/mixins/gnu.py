@@ -23,7 +23,7 @@ if T.TYPE_CHECKING:
     from ..._typing import ImmutableListProtocol
     from ...build import BuildTarget
     from ...options import MutableKeyedOptionDictType
-    from ..compilers import Compiler
+    from ..compilers import Compiler, CompileResult
 else:
     # This is a bit clever, for mypy we pretend that these mixins descend from
     # Compiler, so we get all of the methods and attributes defined for us, but
@@ -594,18 +594,17 @@ class GnuCompiler(GnuLikeCompiler):
     def openmp_flags(self) -> T.List[str]:
         return ['-fopenmp']
 
-    def has_arguments(self, args: T.List[str], code: str,
-                      mode: CompileCheckMode) -> T.Tuple[bool, bool]:
+    BATCHED_ARGUMENT_CHECKS = True
+
+    def has_arguments_result(self, p: CompileResult) -> bool:
         # For some compiler command line arguments, the GNU compilers will
         # emit a warning on stderr indicating that an option is valid for a
         # another language, but still complete with exit_success
-        with self._build_wrapper(code, args, None, mode) as p:
-            result = p.returncode == 0
-            if self.language in {'cpp', 'objcpp'} and 'is valid for C/ObjC' in p.stderr:
-                result = False
-            if self.language in {'c', 'objc'} and 'is valid for C++/ObjC++' in p.stderr:
-                result = False
-        return result, p.cached
+        if self.language in {'cpp', 'objcpp'} and 'is valid for C/ObjC' in p.stderr:
+            return False
+        if self.language in {'c', 'objc'} and 'is valid for C++/ObjC++' in p.stderr:
+            return False
+        return p.returncode == 0
 
     def get_has_func_attribute_extra_args(self, name: str) -> T.List[str]:
         # GCC only warns about unknown or ignored attributes, so force an
@@ -119,6 +119,8 @@ class RustCompiler(Compiler):
     id = 'rustc'
 
     USED_FOR_SEPARATE_LINKING_STEP = False
+    # The sanity check also finds the native static libraries
+    CACHEABLE_SANITY_CHECK = False
 
     _WARNING_LEVELS: T.Dict[str, T.List[str]] = {
         '0': ['--cap-lints', 'allow'],
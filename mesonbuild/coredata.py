@@ -250,6 +250,9 @@ class CoreData:
 
         self.compiler_check_cache: T.Dict['CompilerCheckCacheKey', 'CompileResult'] = OrderedDict()
         self.run_check_cache: T.Dict['RunCheckCacheKey', 'RunResult'] = OrderedDict()
+        # Compile checks answered from the symbol index rather than run, which
+        # are only used to report repeated checks as cached
+        self.symbol_index_hits: T.Set['CompilerCheckCacheKey'] = set()
 
         # CMake cache
         self.cmake_cache: PerMachine[CMakeStateCache] = PerMachine(CMakeStateCache(), CMakeStateCache())
@@ -322,7 +325,7 @@ class CoreData:
         # getting the "system default" is always wrong on multiarch
         # platforms as it gets a value like lib/x86_64-linux-gnu.
         if self.cross_files:
-            options.BUILTIN_OPTIONS[OptionKey('libdir')].default = 'lib'
+            options.get_builtin_options()[OptionKey('libdir')].default = 'lib'
 
     def init_backend_options(self, backend_name: str) -> None:
         if backend_name == 'ninja':
@@ -368,6 +371,7 @@ class CoreData:
         self.deps.build.clear()
         self.compiler_check_cache.clear()
         self.run_check_cache.clear()
+        self.symbol_index_hits.clear()
 
     def get_nondefault_buildtype_args(self) -> T.List[T.Union[T.Tuple[str, str, str], T.Tuple[str, bool, bool]]]:
         result: T.List[T.Union[T.Tuple[str, str, str], T.Tuple[str, bool, bool]]] = []
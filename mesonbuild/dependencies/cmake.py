@@ -14,6 +14,7 @@ import re
 import os
 import shutil
 import textwrap
+import threading
 import typing as T
 
 if T.TYPE_CHECKING:
@@ -34,6 +35,7 @@ class CMakeDependency(ExternalDependency):
     # The class's copy of the CMake path. Avoids having to search for it
     # multiple times in the same Meson invocation.
     class_cmakeinfo: PerMachine[T.Optional[CMakeInfo]] = PerMachine(None, None)
+    class_cmakeinfo_lock = threading.Lock()
     # Version string for the minimum CMake version
     class_cmake_version = '>=3.4'
     # CMake generators to try (empty for no generator)
@@ -117,8 +119,9 @@ class CMakeDependency(ExternalDependency):
 
         cm_args = kwargs.get('cmake_args', [])
         cm_args = check_cmake_args(cm_args)
-        if CMakeDependency.class_cmakeinfo[self.for_machine] is None:
-            CMakeDependency.class_cmakeinfo[self.for_machine] = self._get_cmake_info(cm_args)
+        with CMakeDependency.class_cmakeinfo_lock:
+            if CMakeDependency.class_cmakeinfo[self.for_machine] is None:
+                CMakeDependency.class_cmakeinfo[self.for_machine] = self._get_cmake_info(cm_args)
         cmakeinfo = CMakeDependency.class_cmakeinfo[self.for_machine]
         if cmakeinfo is None:
             raise self._gen_exception('Unable to obtain CMake system information')
@@ -11,6 +11,7 @@ from .base import DependencyCandidate, ExternalDependency, DependencyException,
 
 from ..mesonlib import listify, PerMachine, MesonBugException, MesonException
 from .. import mlog
+from .. import profiling
 
 if T.TYPE_CHECKING:
     from ..environment import Environment
@@ -117,8 +118,9 @@ def find_external_dependency(name: str, env: 'Environment', kwargs: DependencyOb
     for c in candidates:
         # try this dependency method
         try:
-            d = c()
-            d._check_version()
+            with profiling.span(f'dependency {name} ({c.method})', 'dependency'):
+                d = c()
+                d._check_version()
             pkgdep.append(d)
         except DependencyException as e:
             bettermsg = f'Dependency lookup for {name} with method {c.method!r} failed: {e}'
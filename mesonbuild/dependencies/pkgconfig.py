@@ -7,15 +7,17 @@ from pathlib import Path
 
 from .base import ExternalDependency, DependencyException, sort_libpaths, DependencyTypeName
 from ..mesonlib import (EnvironmentVariables, OrderedSet, PerMachine, Popen_safe, Popen_safe_logged, MachineChoice,
-                        join_args, MesonException, path_has_root)
+                        join_args, MesonException, path_has_root, version_compare)
 from ..options import OptionKey
 from ..programs import find_external_program, ExternalProgram
 from .. import mlog
 from pathlib import PurePath
 from functools import lru_cache
+import dataclasses
 import re
 import os
 import shlex
+import threading
 import typing as T
 
 if T.TYPE_CHECKING:
@@ -34,6 +36,8 @@ class PkgConfigInterface:
     class_impl: PerMachine[T.Dict[T.Optional[T.Tuple[str, ...]], T.Union[Literal[False], T.Optional[PkgConfigInterface]]]] = PerMachine({}, {})
     class_cli_impl: PerMachine[T.Dict[T.Optional[T.Tuple[str, ...]], T.Union[Literal[False], T.Optional[PkgConfigCLI]]]] = PerMachine({}, {})
     pkg_bin_per_machine: PerMachine[T.Optional[ExternalProgram]] = PerMachine(None, None)
+    # dependencies may be looked up on worker threads ahead of time
+    class_impl_lock = threading.RLock()
 
     @staticmethod
     def set_program_override(pkg_bin: ExternalProgram, for_machine: MachineChoice) -> None:
@@ -47,14 +51,16 @@ class PkgConfigInterface:
                  extra_paths: T.Optional[T.List[str]] = None) -> T.Optional[PkgConfigInterface]:
         '''Return a pkg-config implementation singleton'''
         extra_paths_key = tuple(extra_paths) if extra_paths is not None else None
-        impl = PkgConfigInterface.class_impl[for_machine].get(extra_paths_key, False)
-        if impl is False:
-            impl = PkgConfigCLI(env, for_machine, silent, PkgConfigInterface.pkg_bin_per_machine[for_machine], extra_paths)
-            if not impl.found():
-                impl = None
-            if not impl and not silent:
-                mlog.log('Found pkg-config:', mlog.red('NO'))
-            PkgConfigInterface.class_impl[for_machine][extra_paths_key] = impl
+        with PkgConfigInterface.class_impl_lock:
+            impl = PkgConfigInterface.class_impl[for_machine].get(extra_paths_key, False)
+            if impl is False:
+                impl_class = PkgConfigNative if PkgConfigNative.enabled(env) else PkgConfigCLI
+                impl = impl_class(env, for_machine, silent, PkgConfigInterface.pkg_bin_per_machine[for_machine], extra_paths)
+                if not impl.found():
+                    impl = None
+                if not impl and not silent:
+                    mlog.log('Found pkg-config:', mlog.red('NO'))
+                PkgConfigInterface.class_impl[for_machine][extra_paths_key] = impl
         return impl
 
     @staticmethod
@@ -69,12 +75,13 @@ class PkgConfigInterface:
         impl = PkgConfigInterface.instance(env, for_machine, silent)
         if impl and not isinstance(impl, PkgConfigCLI):
             extra_paths_key = tuple(extra_paths) if extra_paths is not None else None
-            impl = PkgConfigInterface.class_cli_impl[for_machine].get(extra_paths_key, False)
-            if impl is False:
-                impl = PkgConfigCLI(env, for_machine, silent, PkgConfigInterface.pkg_bin_per_machine[for_machine], extra_paths)
-                if not impl.found():
-                    impl = None
-                PkgConfigInterface.class_cli_impl[for_machine][extra_paths_key] = impl
+            with PkgConfigInterface.class_impl_lock:
+                impl = PkgConfigInterface.class_cli_impl[for_machine].get(extra_paths_key, False)
+                if impl is False:
+                    impl = PkgConfigCLI(env, for_machine, silent, PkgConfigInterface.pkg_bin_per_machine[for_machine], extra_paths)
+                    if not impl.found():
+                        impl = None
+                    PkgConfigInterface.class_cli_impl[for_machine][extra_paths_key] = impl
         return T.cast('T.Optional[PkgConfigCLI]', impl) # Trust me, mypy
 
     @staticmethod
@@ -303,6 +310,328 @@ class PkgConfigCLI(PkgConfigInterface):
         p, out, err = Popen_safe_logged(cmd, env=env)
         return p.returncode, out.strip(), err.strip()
 
+class _PkgConfigFallback(Exception):
+    '''Raised when a query is left to the pkg-config executable'''
+
+
+# Flags which take their value as a separate argument
+_PAIRED_FLAGS = {'-framework', '-isystem', '-idirafter', '-include', '-Xlinker'}
+_VARIABLE_RE = re.compile(r'\$\$|\$\{([^}]*)\}')
+_REQUIRES_RE = re.compile(r'([^\s,<>=!]+)(?:\s*(<=|>=|!=|==|=|<|>)\s*([^\s,]+))?')
+_LINE_RE = re.compile(r'([A-Za-z0-9_.]+)\s*([:=])\s*(.*)')
+
+
+@dataclasses.dataclass(eq=False)
+class _PkgConfigFile:
+    '''A parsed .pc file, with variables and fields left unexpanded'''
+
+    path: str
+    variables: T.Dict[str, str]
+    fields: T.Dict[str, str]
+
+    @classmethod
+    def parse(cls, path: str) -> _PkgConfigFile:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        variables: T.Dict[str, str] = {}
+        fields: T.Dict[str, str] = {}
+        text = text.replace('\\\r\n', '').replace('\\\n', '')
+        for line in text.splitlines():
+            line = re.sub(r'(?<!\\)#.*', '', line).replace('\\#', '#').strip()
+            m = _LINE_RE.match(line)
+            if not m:
+                continue
+            key, sep, value = m.groups()
+            if sep == '=':
+                if key in variables:
+                    raise _PkgConfigFallback(f'duplicate definition of variable {key!r} in {path}')
+                variables[key] = value.strip()
+            else:
+                key = key.lower()
+                if key in fields:
+                    raise _PkgConfigFallback(f'duplicate {key!r} field in {path}')
+                fields[key] = value.strip()
+        for key in ('name', 'description', 'version'):
+            if key not in fields:
+                raise _PkgConfigFallback(f'{path} has no {key!r} field')
+        if fields.get('conflicts'):
+            raise _PkgConfigFallback(f'{path} has conflicts')
+        return cls(path, variables, fields)
+
+    def has_variable(self, name: str, overrides: T.Mapping[str, str]) -> bool:
+        return name in overrides or name in self.variables or name == 'pcfiledir'
+
+    def variable(self, name: str, overrides: T.Mapping[str, str],
+                 seen: T.FrozenSet[str] = frozenset()) -> str:
+        if name in overrides:
+            return overrides[name]
+        if name in seen:
+            raise _PkgConfigFallback(f'variable {name!r} refers to itself in {self.path}')
+        if name in self.variables:
+            return self.expand(self.variables[name], overrides, seen | {name})
+        if name == 'pcfiledir':
+            return os.path.dirname(self.path)
+        raise _PkgConfigFallback(f'variable {name!r} is not defined in {self.path}')
+
+    def expand(self, value: str, overrides: T.Mapping[str, str],
+               seen: T.FrozenSet[str] = frozenset()) -> str:
+        def repl(m: T.Match[str]) -> str:
+            if m.group(1) is None:
+                return '$'
+            return self.variable(m.group(1), overrides, seen)
+        return _VARIABLE_RE.sub(repl, value)
+
+    def field(self, name: str, overrides: T.Mapping[str, str]) -> str:
+        return self.expand(self.fields.get(name, ''), overrides)
+
+
+class PkgConfigNative(PkgConfigCLI):
+    '''pkg-config implementation reading .pc files in-process
+
+    Dependency graphs are resolved the way pkgconf does, though duplicate
+    flags pkgconf sometimes keeps are always merged. The executable is
+    still detected, both for the tools that need it at build time and for
+    the cases this does not handle: -uninstalled packages, sysroots, files
+    pkg-config would reject and unsatisfied requirements, for which its
+    error message is shown.
+    '''
+
+    # keyed on path, holding the mtime and size of the file when parsed
+    pc_file_cache: T.Dict[str, T.Tuple[int, int, T.Union[_PkgConfigFile, _PkgConfigFallback]]] = {}
+    pc_file_cache_lock = threading.Lock()
+
+    @staticmethod
+    def enabled(env: Environment) -> bool:
+        # pkg-config relocates packages by default on Windows
+        return (os.environ.get('MESON_PKGCONFIG_NATIVE', '') not in {'', '0'}
+                and not env.machines.build.is_windows())
+
+    def _query_env(self) -> T.Dict[str, str]:
+        env = self._get_env().get_env(os.environ)
+        if env.get('PKG_CONFIG_SYSROOT_DIR'):
+            raise _PkgConfigFallback('a sysroot is used')
+        return env
+
+    @lru_cache(maxsize=None)
+    def _pkgbin_variable(self, variable_name: str) -> T.List[str]:
+        ret, out, _ = self._call_pkgbin([f'--variable={variable_name}', 'pkg-config'])
+        return [p for p in out.split(os.pathsep) if p] if ret == 0 else []
+
+    def _search_path(self, env: T.Mapping[str, str]) -> T.Tuple[str, ...]:
+        paths = [p for p in env.get('PKG_CONFIG_PATH', '').split(os.pathsep) if p]
+        if 'PKG_CONFIG_LIBDIR' in env:
+            paths += [p for p in env['PKG_CONFIG_LIBDIR'].split(os.pathsep) if p]
+        else:
+            default = self._pkgbin_variable('pc_path')
+            if not default:
+                raise _PkgConfigFallback('the default search path is unknown')
+            paths += default
+        return tuple(paths)
+
+    def _system_dirs(self, env: T.Mapping[str, str], flag: str) -> T.Set[str]:
+        if flag == '-I':
+            var, pc_var, default = 'PKG_CONFIG_SYSTEM_INCLUDE_PATH', 'pc_system_includedirs', '/usr/include'
+        else:
+            var, pc_var, default = 'PKG_CONFIG_SYSTEM_LIBRARY_PATH', 'pc_system_libdirs', '/usr/lib'
+        if var in env:
+            dirs = env[var].split(os.pathsep)
+        else:
+            dirs = self._pkgbin_variable(pc_var) or [default]
+        if flag == '-I':
+            for var in ('CPATH', 'C_INCLUDE_PATH', 'CPLUS_INCLUDE_PATH'):
+                dirs += env.get(var, '').split(os.pathsep)
+        return {os.path.normpath(d) for d in dirs if d}
+
+    @classmethod
+    def _load(cls, path: str) -> T.Optional[_PkgConfigFile]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with cls.pc_file_cache_lock:
+            cached = cls.pc_file_cache.get(path)
+        if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+            result: T.Union[_PkgConfigFile, _PkgConfigFallback]
+            try:
+                result = _PkgConfigFile.parse(path)
+            except _PkgConfigFallback as e:
+                result = e
+            except OSError:
+                return None
+            cached = (st.st_mtime_ns, st.st_size, result)
+            with cls.pc_file_cache_lock:
+                cls.pc_file_cache[path] = cached
+        if isinstance(cached[2], _PkgConfigFallback):
+            raise cached[2]
+        return cached[2]
+
+    def _find(self, name: str, env: T.Mapping[str, str]) -> T.Optional[_PkgConfigFile]:
+        if name.endswith('.pc') or '/' in name or name == 'pkg-config':
+            raise _PkgConfigFallback(f'{name!r} is not looked up in the search path')
+        uninstalled = 'PKG_CONFIG_DISABLE_UNINSTALLED' not in env
+        for d in self._search_path(env):
+            if uninstalled and os.path.isfile(os.path.join(d, f'{name}-uninstalled.pc')):
+                raise _PkgConfigFallback(f'{name!r} is uninstalled')
+            pc = self._load(os.path.join(d, f'{name}.pc'))
+            if pc is not None:
+                return pc
+        return None
+
+    def _resolve(self, name: str, env: T.Mapping[str, str], overrides: T.Mapping[str, str],
+                 fields: T.Tuple[str, ...], private: bool) -> T.Optional[T.List[T.Tuple[str, ...]]]:
+        '''Return the merged flags of fields for a package and its requirements
+
+        Every package contributes its own flags followed by those of its
+        requirements. -I and -L flags keep their first position, all others
+        their last, so that libraries come before their dependencies.
+        Returns None if the package itself is not found.
+        '''
+        top = self._find(name, env)
+        if top is None:
+            return None
+        requires = ('requires', 'requires.private') if private else ('requires',)
+        memo: T.Dict[str, T.List[T.Tuple[str, ...]]] = {}
+
+        def flatten(pkgname: str, pc: _PkgConfigFile, stack: T.Tuple[str, ...]) -> T.List[T.Tuple[str, ...]]:
+            if pkgname in memo:
+                return memo[pkgname]
+            if pkgname in stack:
+                raise _PkgConfigFallback(f'{pkgname!r} requires itself')
+            args = self._split_args(' '.join(pc.field(f, overrides) for f in fields))
+            frags = self._group_args(args)
+            for req in requires:
+                for dep, op, version in _REQUIRES_RE.findall(pc.field(req, overrides)):
+                    dep_pc = self._find(dep, env)
+                    if dep_pc is None:
+                        raise _PkgConfigFallback(f'{dep!r}, required by {pkgname!r}, not found')
+                    if op and not version_compare(dep_pc.field('version', overrides), op + version):
+                        raise _PkgConfigFallback(f'{dep!r} {op} {version}, required by {pkgname!r}, not satisfied')
+                    frags += flatten(dep, dep_pc, stack + (pkgname,))
+            memo[pkgname] = self._merge_fragments(frags)
+            return memo[pkgname]
+
+        return flatten(name, top, ())
+
+    @staticmethod
+    def _group_args(args: T.List[str]) -> T.List[T.Tuple[str, ...]]:
+        frags: T.List[T.Tuple[str, ...]] = []
+        it = iter(args)
+        for arg in it:
+            if arg in _PAIRED_FLAGS:
+                frags.append((arg, next(it, '')))
+            else:
+                frags.append((arg,))
+        return frags
+
+    @staticmethod
+    def _merge_fragments(frags: T.List[T.Tuple[str, ...]]) -> T.List[T.Tuple[str, ...]]:
+        last = {f: i for i, f in enumerate(frags)}
+        seen: T.Set[T.Tuple[str, ...]] = set()
+        merged: T.List[T.Tuple[str, ...]] = []
+        for i, f in enumerate(frags):
+            if len(f) == 1 and f[0].startswith(('-I', '-L')):
+                if f in seen:
+                    continue
+                seen.add(f)
+            elif last[f] != i:
+                continue
+            merged.append(f)
+        return merged
+
+    def _flags(self, name: str, passes: T.Tuple[T.Tuple[str, ...], ...], private: bool, allow_system: bool,
+               define_variable: PkgConfigDefineType) -> T.List[str]:
+        env = self._query_env()
+        frags: T.List[T.Tuple[str, ...]] = []
+        for fields in passes:
+            pass_frags = self._resolve(name, env, dict(define_variable or ()), fields, private)
+            if pass_frags is None:
+                raise _PkgConfigFallback(f'{name!r} not found')
+            frags += pass_frags
+        frags = self._merge_fragments(frags)
+        flag = '-I' if 'cflags' in passes[0] else '-L'
+        system_dirs: T.Set[str] = set()
+        if not allow_system and not env.get(f'PKG_CONFIG_ALLOW_SYSTEM_{"CFLAGS" if flag == "-I" else "LIBS"}'):
+            system_dirs = self._system_dirs(env, flag)
+        result: T.List[str] = []
+        for f in frags:
+            if len(f) == 1 and f[0].startswith(flag) and os.path.normpath(f[0][2:]) in system_dirs:
+                continue
+            result.extend(f)
+        return result
+
+    @lru_cache(maxsize=None)
+    def version(self, name: str) -> T.Optional[str]:
+        mlog.debug(f'Determining dependency {name!r} from pkg-config files')
+        try:
+            env = self._query_env()
+            if self._resolve(name, env, {}, (), False) is None:
+                return None
+            pc = self._find(name, env)
+            assert pc is not None, 'for mypy'
+            return pc.field('version', {})
+        except _PkgConfigFallback as e:
+            mlog.debug(f'Using the pkg-config executable for {name!r}: {e}')
+            return super().version(name)
+
+    @lru_cache(maxsize=None)
+    def cflags(self, name: str, static: bool = False, allow_system: bool = False,
+               define_variable: PkgConfigDefineType = None) -> ImmutableListProtocol[str]:
+        # Like pkgconf, add the private cflags of all packages after the others
+        passes = (('cflags',), ('cflags.private',)) if static else (('cflags',),)
+        try:
+            return self._flags(name, passes, True, allow_system, define_variable)
+        except _PkgConfigFallback as e:
+            mlog.debug(f'Using the pkg-config executable for the cflags of {name!r}: {e}')
+            return super().cflags(name, static, allow_system, define_variable)
+
+    @lru_cache(maxsize=None)
+    def libs(self, name: str, static: bool = False, allow_system: bool = False,
+             define_variable: PkgConfigDefineType = None) -> ImmutableListProtocol[str]:
+        fields = ('libs', 'libs.private') if static else ('libs',)
+        try:
+            return self._flags(name, (fields,), static, allow_system, define_variable)
+        except _PkgConfigFallback as e:
+            mlog.debug(f'Using the pkg-config executable for the libs of {name!r}: {e}')
+            return super().libs(name, static, allow_system, define_variable)
+
+    @lru_cache(maxsize=None)
+    def variable(self, name: str, variable_name: str,
+                 define_variable: PkgConfigDefineType) -> T.Optional[str]:
+        overrides = dict(define_variable or ())
+        try:
+            env = self._query_env()
+            if self._resolve(name, env, overrides, (), False) is None:
+                raise _PkgConfigFallback(f'{name!r} not found')
+            pc = self._find(name, env)
+            assert pc is not None, 'for mypy'
+            if not pc.has_variable(variable_name, overrides):
+                if variable_name.startswith('pc_'):
+                    raise _PkgConfigFallback(f'{variable_name!r} may be predefined')
+                return None
+            variable = pc.variable(variable_name, overrides)
+        except _PkgConfigFallback as e:
+            mlog.debug(f'Using the pkg-config executable for variable {variable_name!r} of {name!r}: {e}')
+            return super().variable(name, variable_name, define_variable)
+        mlog.debug(f'Got pkg-config variable {variable_name} : {variable}')
+        return variable
+
+    @lru_cache(maxsize=None)
+    def list_all(self) -> ImmutableListProtocol[str]:
+        try:
+            search_path = self._search_path(self._query_env())
+        except _PkgConfigFallback:
+            return super().list_all()
+        names: OrderedSet[str] = OrderedSet()
+        for d in search_path:
+            try:
+                files = sorted(os.listdir(d))
+            except OSError:
+                continue
+            for f in files:
+                if f.endswith('.pc') and not f.endswith('-uninstalled.pc'):
+                    names.add(f[:-3])
+        return list(names)
+
 
 class PkgConfigDependency(ExternalDependency):
 
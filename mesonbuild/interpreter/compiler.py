@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import collections
+import concurrent.futures
 import enum
 import functools
 import os
@@ -37,6 +38,11 @@ if T.TYPE_CHECKING:
     class GetSupportedArgumentKw(TypedDict):
 
         checked: Literal['warn', 'require', 'off']
+        batch: bool
+
+    class GetSupportedLinkArgumentKw(TypedDict):
+
+        batch: bool
 
     class AlignmentKw(TypedDict):
 
@@ -196,6 +202,63 @@ class CompilerHolder(ObjectHolder['Compiler']):
     def compiler(self) -> 'Compiler':
         return self.held_object
 
+    def _run_checks(self, check: T.Callable[[str], T.Tuple[bool, bool]],
+                    items: T.List[str]) -> T.Iterator[T.Tuple[str, T.Callable[[], T.Tuple[bool, bool]]]]:
+        """Run independent compiler checks on a pool of worker threads.
+
+        Yields, in the order of items, the item and a callable returning the
+        result of its check. Log messages produced by a check are replayed
+        when its result is retrieved, so the log is the same as if the checks
+        had run serially. Repeated items are checked serially so that they hit
+        the check cache just like they would have.
+        """
+        Outcome = T.Tuple[T.List[T.Any], T.Optional[T.Tuple[bool, bool]], T.Optional[Exception]]
+
+        def worker(item: str) -> Outcome:
+            with mlog.deferred() as records:
+                try:
+                    return records, check(item), None
+                except Exception as e:
+                    return records, None, e
+
+        def collect(future: concurrent.futures.Future[Outcome]) -> T.Tuple[bool, bool]:
+            records, result, exc = future.result()
+            mlog.replay(records)
+            if exc is not None:
+                raise exc
+            assert result is not None, 'for mypy'
+            return result
+
+        unique = list(dict.fromkeys(items))
+        num_workers = min(mesonlib.determine_worker_count(), len(unique))
+        if num_workers <= 1:
+            for item in items:
+                yield item, functools.partial(check, item)
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(num_workers)
+        try:
+            futures = {item: executor.submit(worker, item) for item in unique}
+            for item in items:
+                future = futures.pop(item, None)
+                if future is None:
+                    yield item, functools.partial(check, item)
+                else:
+                    yield item, functools.partial(collect, future)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_batched_argument_checks(self, items: T.List[str], mode: _TestMode
+                                     ) -> T.Iterator[T.Tuple[str, T.Callable[[], T.Tuple[bool, bool]]]]:
+        """Like _run_checks(), but letting the compiler check the arguments all at once."""
+        results = self.compiler.get_supported_arguments_batched(list(dict.fromkeys(items)),
+                                                                link=mode is _TestMode.LINKER)
+        for item in items:
+            if item in results:
+                yield item, functools.partial(results.pop, item)
+            else:
+                yield item, functools.partial(self._check_arguments, [item], mode)
+
     def _dep_msg(self, deps: T.List['dependencies.Dependency'], compile_only: bool, endl: str) -> str:
         msg_single = 'with dependency {}'
         msg_many = 'with dependencies {}'
@@ -629,6 +692,30 @@ class CompilerHolder(ObjectHolder['Compiler']):
     def has_header_method(self, args: T.Tuple[str], kwargs: 'HeaderKW') -> bool:
         return self._has_header_impl(args[0], kwargs)
 
+    @FeatureNew('compiler.has_headers', '1.13.0')
+    @typed_pos_args('compiler.has_headers', varargs=str, min_varargs=1)
+    @typed_kwargs('compiler.has_headers', *_HEADER_KWS)
+    @InterpreterObject.method('has_headers')
+    def has_headers_method(self, args: T.Tuple[T.List[str]], kwargs: 'HeaderKW') -> T.Dict[str, bool]:
+        hnames = args[0]
+        disabled, required, feature = extract_required_kwarg(kwargs, self.subproject, default=False)
+        if disabled:
+            for hname in hnames:
+                mlog.log('Has header', mlog.bold(hname, True), 'skipped: feature', mlog.bold(feature), 'disabled')
+            return {h: False for h in hnames}
+        extra_args = functools.partial(self._determine_args, kwargs)
+        deps, msg = self._determine_dependencies(kwargs['dependencies'])
+        results = self.compiler.has_headers(hnames, kwargs['prefix'],
+                                            extra_args=extra_args, dependencies=deps)
+        for hname, (haz, cached) in results.items():
+            cached_msg = mlog.blue('(cached)') if cached else ''
+            h = mlog.green('YES') if haz else mlog.red('NO')
+            mlog.log('Has header', mlog.bold(hname, True), msg, h, cached_msg)
+        missing = [h for h, (haz, _) in results.items() if not haz]
+        if required and missing:
+            raise InterpreterException(f'{self.compiler.get_display_language()} header {missing[0]!r} not found')
+        return {h: haz for h, (haz, _) in results.items()}
+
     @typed_pos_args('compiler.has_header_symbol', str, str)
     @typed_kwargs('compiler.has_header_symbol', *_HEADER_KWS)
     @InterpreterObject.method('has_header_symbol')
@@ -720,9 +807,15 @@ class CompilerHolder(ObjectHolder['Compiler']):
                                            self.compiler.language, self.held_object.for_machine)
         return lib
 
+    def _check_arguments(self, arguments: T.List[str], mode: _TestMode = _TestMode.COMPILER) -> T.Tuple[bool, bool]:
+        if mode is _TestMode.LINKER:
+            return self.compiler.has_multi_link_arguments(arguments)
+        return self.compiler.has_multi_arguments(arguments)
+
     def _has_argument_impl(self, arguments: T.Union[str, T.List[str]],
                            mode: _TestMode = _TestMode.COMPILER,
-                           kwargs: T.Optional['ExtractRequired'] = None) -> bool:
+                           kwargs: T.Optional['ExtractRequired'] = None,
+                           check: T.Optional[T.Callable[[], T.Tuple[bool, bool]]] = None) -> bool:
         """Shared implementation for methods checking compiler and linker arguments."""
         # This simplifies the callers
         if isinstance(arguments, str):
@@ -739,10 +832,10 @@ class CompilerHolder(ObjectHolder['Compiler']):
             logargs += ['skipped: feature', mlog.bold(feature), 'disabled']
             mlog.log(*logargs)
             return False
-        if mode is _TestMode.LINKER:
-            result, cached = self.compiler.has_multi_link_arguments(arguments)
+        if check is not None:
+            result, cached = check()
         else:
-            result, cached = self.compiler.has_multi_arguments(arguments)
+            result, cached = self._check_arguments(arguments, mode)
         if required and not result:
             logargs += ['not usable']
             raise InterpreterException(*logargs)
@@ -772,14 +865,19 @@ class CompilerHolder(ObjectHolder['Compiler']):
         'compiler.get_supported_arguments',
         KwargInfo('checked', str, default='off', since='0.59.0',
                   validator=in_set_validator({'warn', 'require', 'off'})),
+        KwargInfo('batch', bool, default=False, since='1.13.0'),
     )
     @InterpreterObject.method('get_supported_arguments')
     def get_supported_arguments_method(self, args: T.Tuple[T.List[str]], kwargs: 'GetSupportedArgumentKw') -> T.List[str]:
         supported_args: T.List[str] = []
         checked = kwargs['checked']
 
-        for arg in args[0]:
-            if not self._has_argument_impl([arg]):
+        if kwargs['batch']:
+            checks = self._run_batched_argument_checks(args[0], _TestMode.COMPILER)
+        else:
+            checks = self._run_checks(lambda a: self._check_arguments([a]), args[0])
+        for arg, check in checks:
+            if not self._has_argument_impl([arg], check=check):
                 msg = f'Compiler for {self.compiler.get_display_language()} does not support "{arg}"'
                 if checked == 'warn':
                     mlog.warning(msg)
@@ -793,8 +891,8 @@ class CompilerHolder(ObjectHolder['Compiler']):
     @typed_pos_args('compiler.first_supported_argument', varargs=str)
     @InterpreterObject.method('first_supported_argument')
     def first_supported_argument_method(self, args: T.Tuple[T.List[str]], kwargs: 'TYPE_kwargs') -> T.List[str]:
-        for arg in args[0]:
-            if self._has_argument_impl([arg]):
+        for arg, check in self._run_checks(lambda a: self._check_arguments([a]), args[0]):
+            if self._has_argument_impl([arg], check=check):
                 mlog.log('First supported argument:', mlog.bold(arg))
                 return [arg]
         mlog.log('First supported argument:', mlog.red('None'))
@@ -815,13 +913,20 @@ class CompilerHolder(ObjectHolder['Compiler']):
         return self._has_argument_impl(args[0], mode=_TestMode.LINKER, kwargs=kwargs)
 
     @FeatureNew('compiler.get_supported_link_arguments', '0.46.0')
-    @noKwargs
     @typed_pos_args('compiler.get_supported_link_arguments', varargs=str)
+    @typed_kwargs(
+        'compiler.get_supported_link_arguments',
+        KwargInfo('batch', bool, default=False, since='1.13.0'),
+    )
     @InterpreterObject.method('get_supported_link_arguments')
-    def get_supported_link_arguments_method(self, args: T.Tuple[T.List[str]], kwargs: 'TYPE_kwargs') -> T.List[str]:
+    def get_supported_link_arguments_method(self, args: T.Tuple[T.List[str]], kwargs: 'GetSupportedLinkArgumentKw') -> T.List[str]:
         supported_args: T.List[str] = []
-        for arg in args[0]:
-            if self._has_argument_impl([arg], mode=_TestMode.LINKER):
+        if kwargs['batch']:
+            checks = self._run_batched_argument_checks(args[0], _TestMode.LINKER)
+        else:
+            checks = self._run_checks(lambda a: self._check_arguments([a], _TestMode.LINKER), args[0])
+        for arg, check in checks:
+            if self._has_argument_impl([arg], mode=_TestMode.LINKER, check=check):
                 supported_args.append(arg)
         return supported_args
 
@@ -830,14 +935,15 @@ class CompilerHolder(ObjectHolder['Compiler']):
     @typed_pos_args('compiler.first_supported_link_argument', varargs=str)
     @InterpreterObject.method('first_supported_link_argument')
     def first_supported_link_argument_method(self, args: T.Tuple[T.List[str]], kwargs: 'TYPE_kwargs') -> T.List[str]:
-        for arg in args[0]:
-            if self._has_argument_impl([arg], mode=_TestMode.LINKER):
+        for arg, check in self._run_checks(lambda a: self._check_arguments([a], _TestMode.LINKER), args[0]):
+            if self._has_argument_impl([arg], mode=_TestMode.LINKER, check=check):
                 mlog.log('First supported link argument:', mlog.bold(arg))
                 return [arg]
         mlog.log('First supported link argument:', mlog.red('None'))
         return []
 
-    def _has_function_attribute_impl(self, attr: str, kwargs: T.Optional['ExtractRequired'] = None) -> bool:
+    def _has_function_attribute_impl(self, attr: str, kwargs: T.Optional['ExtractRequired'] = None,
+                                     check: T.Optional[T.Callable[[], T.Tuple[bool, bool]]] = None) -> bool:
         """Common helper for function attribute testing."""
         logargs: TV_LoggableList = [
             f'Compiler for {self.compiler.get_display_language()} supports function attribute {attr}:',
@@ -848,7 +954,7 @@ class CompilerHolder(ObjectHolder['Compiler']):
             logargs += ['skipped: feature', mlog.bold(feature), 'disabled']
             mlog.log(*logargs)
             return False
-        had, cached = self.compiler.has_func_attribute(attr)
+        had, cached = check() if check is not None else self.compiler.has_func_attribute(attr)
         if required and not had:
             logargs += ['not usable']
             raise InterpreterException(*logargs)
@@ -871,7 +977,8 @@ class CompilerHolder(ObjectHolder['Compiler']):
     @typed_pos_args('compiler.get_supported_function_attributes', varargs=str)
     @InterpreterObject.method('get_supported_function_attributes')
     def get_supported_function_attributes_method(self, args: T.Tuple[T.List[str]], kwargs: 'TYPE_kwargs') -> T.List[str]:
-        return [a for a in args[0] if self._has_function_attribute_impl(a)]
+        return [a for a, check in self._run_checks(self.compiler.has_func_attribute, args[0])
+                if self._has_function_attribute_impl(a, check=check)]
 
     @FeatureNew('compiler.get_argument_syntax', '0.49.0')
     @noPosargs
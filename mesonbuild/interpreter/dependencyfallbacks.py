@@ -96,7 +96,9 @@ class DependencyFallbacksHolder(MesonInterpreterObject):
         # We use kwargs from the dependency() function, for things like version,
         # module, etc.
         self._handle_featurenew_dependencies(name)
-        dep = dependencies.find_external_dependency(name, self.environment, kwargs)
+        dep = self.interpreter.dependency_prefetcher.take(name, kwargs)
+        if dep is None:
+            dep = dependencies.find_external_dependency(name, self.environment, kwargs)
         if dep.found():
             identifier = dependencies.get_dep_identifier(name, kwargs)
             self.coredata.deps[self.for_machine].put(identifier, dep)
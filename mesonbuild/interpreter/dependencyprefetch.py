@@ -0,0 +1,285 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+"""Speculative, concurrent lookup of external dependencies.
+
+Looking up an external dependency runs pkg-config, CMake or config tools,
+and the interpreter does that one dependency at a time. Most ``dependency()``
+calls can be found in the AST before they are evaluated however, so once
+``project()`` has been evaluated they are looked up on a pool of worker
+threads while the interpreter carries on. When the interpreter reaches the
+call it takes the result, and the log messages of the lookup, from here.
+
+Only calls that are certain to be evaluated are looked up: those at the top
+level of ``meson.build`` files reached through ``subdir()`` calls that are
+themselves at the top level, and whose arguments are all literals.
+Results are only used if the lookup the interpreter needs is identical, so
+speculation never changes which dependencies are found.
+
+A lookup shares state with the interpreter, which carries on evaluating the
+project meanwhile:
+
+- Options are only read. The interpreter adds options of subprojects, but
+  doesn't change the values of those the lookups read.
+- The pkg-config and CMake programs, the pkg-config files and the libraries
+  found by compilers are cached in class attributes, which are only accessed
+  with a lock of their class held.
+- Compiler check results are cached in dicts, which are only accessed one
+  key at a time.
+- ``add_languages()`` may add compilers while a lookup runs. The result of
+  the lookup, and any error it raised, are then thrown away.
+- Log messages are held back and written when the interpreter takes the
+  result.
+
+The results, including errors, are applied by the interpreter thread when it
+reaches the ``dependency()`` call.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import typing as T
+
+from .. import astcache, dependencies, environment, mesonlib, mlog, mparser
+from ..dependencies import DependencyMethods
+from ..dependencies.detect import packages
+from ..options import OptionKey
+from ..wrap import WrapMode
+from .type_checking import DEPENDENCY_KWS
+
+if T.TYPE_CHECKING:
+    from .interpreter import Interpreter
+    from ..dependencies import Dependency
+    from ..dependencies.base import DependencyObjectKWs
+    from ..mesonlib import MachineChoice
+
+    LookupKey = T.Tuple[MachineChoice, T.Tuple[str, ...], T.Tuple[T.Tuple[str, T.Any], ...]]
+    Outcome = T.Tuple[T.List[T.Tuple[str, T.Tuple[T.Any, ...], T.Dict[str, T.Any]]], T.Optional[Dependency], T.Optional[Exception]]
+
+
+# The dependency() keyword arguments which may be given for a call to be
+# looked up ahead of time. Other arguments, like cmake_args, are rare enough
+# not to be worth handling.
+_PREFETCH_KWARGS = {
+    'allow_fallback', 'fallback', 'include_type', 'method', 'modules', 'native',
+    'not_found_message', 'optional_modules', 'required', 'static', 'version',
+}
+
+
+def _literal(node: mparser.BaseNode) -> T.Tuple[bool, T.Any]:
+    """Return whether node is a literal, and its value if so."""
+    if isinstance(node, mparser.StringNode) and not node.is_fstring:
+        return True, node.value
+    if isinstance(node, (mparser.BooleanNode, mparser.NumberNode)):
+        return True, node.value
+    if isinstance(node, mparser.ArrayNode) and not node.args.kwargs:
+        values = [_literal(a) for a in node.args.arguments]
+        if all(ok for ok, _ in values):
+            return True, [v for _, v in values]
+    return False, None
+
+
+def _top_level_calls(node: mparser.BaseNode) -> T.Iterator[mparser.FunctionNode]:
+    """Yield the function calls that evaluating node always makes."""
+    if isinstance(node, mparser.AssignmentNode):
+        yield from _top_level_calls(node.value)
+    elif isinstance(node, mparser.ArrayNode):
+        yield from _top_level_calls(node.args)
+    elif isinstance(node, mparser.ArgumentNode):
+        for a in node.arguments:
+            yield from _top_level_calls(a)
+        for a in node.kwargs.values():
+            yield from _top_level_calls(a)
+    elif isinstance(node, mparser.FunctionNode):
+        yield from _top_level_calls(node.args)
+        yield node
+    elif isinstance(node, mparser.MethodNode):
+        yield from _top_level_calls(node.source_object)
+        yield from _top_level_calls(node.args)
+
+
+class DependencyPrefetcher:
+
+    def __init__(self, interpreter: Interpreter) -> None:
+        self.interpreter = interpreter
+        self.environment = interpreter.environment
+        self.executor: T.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.pending: T.Dict[LookupKey, T.Tuple[str, T.Tuple[str, ...], concurrent.futures.Future[Outcome]]] = {}
+
+    def start(self, ast: mparser.CodeBlockNode) -> None:
+        """Start looking up the dependencies used by the project."""
+        num_workers = mesonlib.determine_worker_count()
+        if num_workers <= 1:
+            return
+        _wm = self.environment.coredata.optstore.get_value_for(OptionKey('wrap_mode'))
+        assert isinstance(_wm, str), 'for mypy'
+        if WrapMode.from_string(_wm) == WrapMode.forcefallback:
+            return
+
+        calls: T.List[mparser.FunctionNode] = []
+        if not self._collect(ast, '', calls):
+            return
+        lookups: T.Dict[str, T.Tuple[LookupKey, DependencyObjectKWs]] = {}
+        for node in calls:
+            lookup = self._prepare(node)
+            if lookup is not None:
+                # The CMake method uses a build directory per dependency name,
+                # so only one lookup per name may run at a time.
+                lookups.setdefault(lookup[0], lookup[1:])
+        if not lookups:
+            return
+
+        mlog.debug('Looking up dependencies ahead of time:', ', '.join(lookups))
+        for name, (key, kwargs) in lookups.items():
+            lname = name.lower()
+            generic = lname not in packages and lname not in packages.defaults
+            if generic and kwargs['method'] in {DependencyMethods.AUTO, DependencyMethods.PKGCONFIG}:
+                # Find pkg-config now, so that it is logged before the first
+                # dependency just like it would without looking ahead.
+                from ..dependencies.pkgconfig import PkgConfigInterface
+                PkgConfigInterface.instance(self.environment, key[0], silent=False, extra_paths=[])
+                break
+        self.executor = concurrent.futures.ThreadPoolExecutor(min(num_workers, len(lookups)))
+        for name, (key, kwargs) in lookups.items():
+            self.pending[key] = (name, self._compilers(key[0]),
+                                 self.executor.submit(self._worker, name, kwargs))
+
+    def _collect(self, ast: mparser.CodeBlockNode, subdir: str, calls: T.List[mparser.FunctionNode]) -> bool:
+        """Collect the dependency() calls of a build file and its subdirs.
+
+        Returns False if the project overrides pkg-config, which can only be
+        done before pkg-config is first used.
+        """
+        from ..ast import AstVisitor
+
+        class OverrideFinder(AstVisitor):
+            found = False
+
+            def visit_MethodNode(self, node: mparser.MethodNode) -> None:
+                super().visit_MethodNode(node)
+                if node.name.value == 'override_find_program':
+                    ok, value = _literal(node.args.arguments[0]) if node.args.arguments else (False, None)
+                    self.found |= not ok or value == 'pkg-config'
+
+        finder = OverrideFinder()
+        ast.accept(finder)
+        if finder.found:
+            return False
+
+        for statement in ast.lines:
+            for node in _top_level_calls(statement):
+                name = node.func_name.value
+                if name == 'dependency':
+                    calls.append(node)
+                elif name == 'subdir' and not node.args.kwargs and len(node.args.arguments) == 1:
+                    ok, value = _literal(node.args.arguments[0])
+                    if ok and isinstance(value, str):
+                        sub_ast = self._parse(os.path.join(subdir, value))
+                        if sub_ast is not None and not self._collect(sub_ast, os.path.join(subdir, value), calls):
+                            return False
+        return True
+
+    def _parse(self, subdir: str) -> T.Optional[mparser.CodeBlockNode]:
+        fname = os.path.join(self.environment.get_source_dir(), subdir, environment.build_filename)
+        try:
+            with open(fname, encoding='utf-8') as f:
+                code = f.read()
+            return astcache.parse(code, fname, self.interpreter.ast_cache_dir, compact=self.interpreter.compact_ast)
+        except (OSError, UnicodeDecodeError, mesonlib.MesonException):
+            # The interpreter reports these errors when it gets there
+            return None
+
+    def _prepare(self, node: mparser.FunctionNode) -> T.Optional[T.Tuple[str, LookupKey, DependencyObjectKWs]]:
+        """Build the keyword arguments that func_dependency() would pass on."""
+        if not node.args.arguments:
+            return None
+        ok, name = _literal(node.args.arguments[0])
+        if not ok or not isinstance(name, str) or not name:
+            return None
+        given: T.Dict[str, T.Any] = {}
+        for k, v in node.args.kwargs.items():
+            ok, value = _literal(v)
+            if not ok or not isinstance(k, mparser.IdNode) or k.value not in _PREFETCH_KWARGS:
+                return None
+            given[k.value] = value
+        if not isinstance(given.get('required', True), bool):
+            return None
+
+        kwargs: T.Dict[str, T.Any] = {}
+        for info in DEPENDENCY_KWS:
+            value = given.get(info.name, info.default)
+            if info.listify:
+                value = mesonlib.listify(value)
+            if info.validator is not None and info.validator(value) is not None:
+                return None
+            kwargs[info.name] = info.convertor(value) if info.convertor else value
+        kwargs['native'] = self.interpreter.build.machine_map[kwargs['native']]
+        kwargs['required'] = False
+        nkwargs = T.cast('DependencyObjectKWs', kwargs)
+
+        force_fallback_for = self.environment.coredata.optstore.get_value_for(OptionKey('force_fallback_for'))
+        assert isinstance(force_fallback_for, list), 'for mypy'
+        fallback = mesonlib.listify(given.get('fallback', []))
+        if name in force_fallback_for or (fallback and fallback[0] in force_fallback_for):
+            return None
+        if self.environment.wrap_resolver is not None:
+            provider, _ = self.environment.wrap_resolver.find_dep_provider(name)
+            if provider in force_fallback_for:
+                return None
+
+        key = self.lookup_key(name, nkwargs)
+        if self.environment.coredata.deps[key[0]].get(key[2]) is not None:
+            # Cached by a previous configuration
+            return None
+        return name, key, nkwargs
+
+    @staticmethod
+    def lookup_key(name: str, kwargs: DependencyObjectKWs) -> LookupKey:
+        return (kwargs['native'], tuple(kwargs.get('version', [])),
+                dependencies.get_dep_identifier(name, kwargs))
+
+    def _compilers(self, for_machine: MachineChoice) -> T.Tuple[str, ...]:
+        # Some dependencies use whichever compilers are enabled
+        return tuple(self.environment.coredata.compilers[for_machine])
+
+    def _worker(self, name: str, kwargs: DependencyObjectKWs) -> Outcome:
+        with mlog.deferred() as records:
+            try:
+                return records, dependencies.find_external_dependency(name, self.environment, kwargs), None
+            except Exception as e:
+                return records, None, e
+
+    def take(self, name: str, kwargs: DependencyObjectKWs) -> T.Optional[Dependency]:
+        """Return the result of looking up a dependency ahead of time.
+
+        Returns None if the dependency was not looked up with the same
+        arguments, in which case the caller must look it up itself. Raises
+        the error the lookup raised, if any.
+        """
+        key = self.lookup_key(name, kwargs)
+        entry = self.pending.pop(key, None)
+        if entry is None:
+            # A lookup of the same name with other arguments may still be
+            # using files the caller needs
+            concurrent.futures.wait([f for n, _, f in self.pending.values() if n == name])
+            return None
+        _, compilers, future = entry
+        records, dep, exc = future.result()
+        if compilers != self._compilers(key[0]):
+            return None
+        if exc is None:
+            assert dep is not None, 'for mypy'
+            if not dep.found() and kwargs.get('required', True):
+                # Let the caller look it up again to raise the right error
+                return None
+        mlog.replay(records)
+        if exc is not None:
+            raise exc
+        return dep
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.pending.clear()
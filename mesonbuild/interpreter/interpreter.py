@@ -13,6 +13,7 @@ from .. import environment
 from .. import coredata
 from .. import dependencies
 from .. import mlog
+from .. import profiling
 from .. import options
 from .. import build
 from .. import compilers
@@ -41,6 +42,7 @@ from . import interpreterobjects as OBJ
 from . import compiler as compilerOBJ
 from .mesonmain import MesonMain
 from .dependencyfallbacks import DependencyFallbacksHolder
+from .dependencyprefetch import DependencyPrefetcher
 from .interpreterobjects import (
     SubprojectHolder,
     Test,
@@ -289,6 +291,7 @@ class Interpreter(InterpreterBase, HoldableObject):
                 cargo: T.Optional[cargo.Interpreter] = None,
             ) -> None:
         super().__init__(_build.environment.get_source_dir(), subdir, subproject, subproject_dir, _build.environment)
+        self.compact_ast = True
         self.active_projectname = ''
         self.build = _build
         if backend is not None:
@@ -310,6 +313,8 @@ class Interpreter(InterpreterBase, HoldableObject):
             self.environment.is_cross_build(), {}, {})
         self.subproject_stack: T.List[T.Tuple[str, MachineChoice]] = []
         self.configure_file_outputs: T.Dict[str, int] = {}
+        # Shared by all interpreters, like the dependency cache
+        self.dependency_prefetcher = DependencyPrefetcher(self)
         # Passed from the outside, only used in subprojects.
         if invoker_method_default_options:
             assert isinstance(invoker_method_default_options, dict)
@@ -1078,10 +1083,11 @@ class Interpreter(InterpreterBase, HoldableObject):
             subi.holder_map = self.holder_map
             subi.bound_holder_map = self.bound_holder_map
             subi.summary = self.summary
+            subi.dependency_prefetcher = self.dependency_prefetcher
 
             subi.subproject_stack = self.subproject_stack + [(subp_name, for_machine)]
             current_active = self.active_projectname
-            with mlog.nested_warnings():
+            with mlog.nested_warnings(), profiling.span(f'subproject {subp_name}', 'subproject'):
                 subi.run()
                 subi_warnings = mlog.get_warning_count()
             mlog.log('Subproject', mlog.bold(subp_name), 'finished.')
@@ -2425,6 +2431,7 @@ class Interpreter(InterpreterBase, HoldableObject):
                      kwargs['workdir'],
                      kwargs['protocol'],
                      kwargs['priority'],
+                     kwargs['resources'],
                      kwargs['verbose'])
 
     def add_test(self, node: mparser.BaseNode,
@@ -3219,7 +3226,13 @@ class Interpreter(InterpreterBase, HoldableObject):
             return ret
 
     def run(self) -> None:
-        super().run()
+        if not self.is_subproject():
+            self.dependency_prefetcher.start(self.ast)
+        try:
+            super().run()
+        finally:
+            if not self.is_subproject():
+                self.dependency_prefetcher.shutdown()
         mlog.log('Build targets in project:', mlog.bold(str(len(self.build.targets))))
         FeatureNew.report(self.subproject)
         FeatureDeprecated.report(self.subproject)
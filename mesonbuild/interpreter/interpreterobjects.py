@@ -12,6 +12,7 @@ from pathlib import Path, PurePath
 from .. import mesonlib
 from .. import build
 from .. import mlog
+from .. import profiling
 
 from ..modules import ModuleReturnValue, ModuleObject, ModuleState, ExtensionModule, NewExtensionModule
 from ..backend.backends import TestProtocol
@@ -225,7 +226,8 @@ class RunProcess(MesonInterpreterObject):
         super().__init__()
         self.capture = capture
         self.console = console
-        self.returncode, self.stdout, self.stderr = self.run_command(cmd, args, env, source_dir, build_dir, subdir, mesonintrospect, in_builddir, check)
+        with profiling.span(f'run_command {cmd.get_name()}', 'run_command', args=args):
+            self.returncode, self.stdout, self.stderr = self.run_command(cmd, args, env, source_dir, build_dir, subdir, mesonintrospect, in_builddir, check)
 
     def run_command(self,
                     cmd: Program,
@@ -840,7 +842,7 @@ class Test(MesonInterpreterObject):
                  cmd_args: T.List[build.CommandTypes],
                  env: mesonlib.EnvironmentVariables,
                  expected_fail: bool, expected_exitcode: int, timeout: int, workdir: T.Optional[str], protocol: str,
-                 priority: int, verbose: bool):
+                 priority: int, resources: T.Dict[str, int], verbose: bool):
         super().__init__()
         self.name = name
         self.suite = listify(suite)
@@ -855,6 +857,7 @@ class Test(MesonInterpreterObject):
         self.workdir = workdir
         self.protocol = TestProtocol.from_str(protocol)
         self.priority = priority
+        self.resources = resources
         self.verbose = verbose
 
         self.depends: T.List[build.BuildTargetTypes] = []
@@ -57,6 +57,7 @@ class BaseTest(TypedDict):
     timeout: int
     workdir: T.Optional[str]
     priority: int
+    resources: T.Dict[str, int]
     env: EnvironmentVariables
     depends: T.List[TargetDepends]
     suite: T.List[str]
@@ -536,6 +536,15 @@ def _test_timeout_feature_validator(value: int) -> T.Iterable[FeatureCheckBase]:
         yield FeatureNew('test timeout <= 0', '0.57.0')
 
 
+def _test_resources_validator(value: T.Dict[str, int]) -> T.Optional[str]:
+    for name, amount in value.items():
+        if not name or '=' in name:
+            return f'invalid resource name {name!r}'
+        if amount < 0:
+            return f'amount of resource {name!r} must not be negative'
+    return None
+
+
 TEST_KWS_NO_ARGS: T.List[KwargInfo] = [
     KwargInfo('should_fail', (bool, NoneType), deprecated='1.11.0', deprecated_message='Use expected_fail instead of should_fail'),
     KwargInfo('expected_fail', (bool, NoneType), since='1.11.0'),
@@ -549,6 +558,8 @@ TEST_KWS_NO_ARGS: T.List[KwargInfo] = [
               validator=in_set_validator({'exitcode', 'tap', 'gtest', 'rust'}),
               since_values={'gtest': '0.55.0', 'rust': '0.57.0'}),
     KwargInfo('priority', int, default=0, since='0.52.0'),
+    KwargInfo('resources', ContainerTypeInfo(dict, int), default={}, since='1.13.0',
+              validator=_test_resources_validator),
     # TODO: env needs reworks of the way the environment variable holder itself works probably
     ENV_KW,
     DEPENDS_KW.evolve(since='0.46.0'),
@@ -5,7 +5,7 @@
 # or an interpreter-based tool.
 from __future__ import annotations
 
-from .. import environment, mparser, mesonlib
+from .. import astcache, environment, mparser, mesonlib, profiling
 
 from .baseobjects import (
     InterpreterObject,
@@ -98,6 +98,25 @@ class InterpreterBase:
         # If it was part of a if-clause, it is used to temporally override the
         # current meson version target within that if-block.
         self.tmp_meson_version: T.Optional[mesonlib.Range[mesonlib.Version]] = None
+        # Whether build files are parsed into compact syntax trees, which can
+        # be evaluated but not formatted or rewritten
+        self.compact_ast = False
+        self.statement_evaluators = self._statement_evaluators()
+        # Whether to record spans is decided once here rather than on every
+        # statement and call; tracing is started before interpreters are created.
+        if profiling.is_enabled():
+            self._run_statements = self._run_statements_traced
+            self._call_function = self._call_function_traced
+            self._call_method = self._call_method_traced
+        else:
+            self._run_statements = self._run_statements_plain
+            self._call_function = self._call_function_plain
+            self._call_method = self._call_method_plain
+
+    @property
+    def ast_cache_dir(self) -> T.Optional[str]:
+        # Parsed build files are cached when there is a build directory
+        return astcache.get_cache_dir(self.environment.get_scratch_dir())
 
     def handle_meson_version_from_ast(self) -> None:
         # do nothing in an AST interpreter
@@ -122,7 +141,7 @@ class InterpreterBase:
             raise InvalidCode('Builder file is empty.')
         assert isinstance(code, str)
         try:
-            self.ast = mparser.Parser(code, mesonfile).parse()
+            self.ast = astcache.parse(code, mesonfile, self.ast_cache_dir, compact=self.compact_ast)
             self.handle_meson_version_from_ast()
         except mparser.ParseException as me:
             me.file = mesonfile
@@ -191,80 +210,95 @@ class InterpreterBase:
             e.colno = node.colno
             raise e
         statements = node.lines[start:end]
-        i = 0
-        while i < len(statements):
-            cur = statements[i]
-            try:
+        try:
+            self._run_statements(statements)
+        except Exception as e:
+            if getattr(e, 'lineno', None) is None:
+                # We are doing the equivalent to setattr here and mypy does not like it
+                # NOTE: self.current_node is continually updated during processing
+                e.lineno = self.current_node.lineno                                               # type: ignore
+                e.colno = self.current_node.colno                                                 # type: ignore
+                e.file = os.path.join(self.source_root, self.subdir, environment.build_filename)  # type: ignore
+            raise e
+
+    def _run_statements_plain(self, statements: T.List[mparser.BaseNode]) -> None:
+        for cur in statements:
+            self.evaluate_statement(cur)
+
+    def _run_statements_traced(self, statements: T.List[mparser.BaseNode]) -> None:
+        for cur in statements:
+            with profiling.span(self._trace_location(cur), 'statement'):
                 self.evaluate_statement(cur)
-            except Exception as e:
-                if getattr(e, 'lineno', None) is None:
-                    # We are doing the equivalent to setattr here and mypy does not like it
-                    # NOTE: self.current_node is continually updated during processing
-                    e.lineno = self.current_node.lineno                                               # type: ignore
-                    e.colno = self.current_node.colno                                                 # type: ignore
-                    e.file = os.path.join(self.source_root, self.subdir, environment.build_filename)  # type: ignore
-                raise e
-            i += 1 # In THE FUTURE jump over blocks and stuff.
+
+    def _statement_evaluators(self) -> T.Dict[T.Type[mparser.BaseNode], T.Callable[[T.Any], T.Optional[InterpreterObject]]]:
+        # Statements are dispatched on the exact type of their node. The
+        # methods are bound here so that subclasses can override them.
+        return {
+            mparser.FunctionNode: self.function_call,
+            mparser.PlusAssignmentNode: self.evaluate_plusassign,
+            mparser.AssignmentNode: self.assignment,
+            mparser.MethodNode: self.method_call,
+            mparser.StringNode: self.evaluate_string,
+            mparser.BooleanNode: self.evaluate_literal,
+            mparser.IfClauseNode: self.evaluate_if,
+            mparser.IdNode: self.evaluate_id,
+            mparser.ComparisonNode: self.evaluate_comparison,
+            mparser.ArrayNode: self.evaluate_arraystatement,
+            mparser.DictNode: self.evaluate_dictstatement,
+            mparser.NumberNode: self.evaluate_literal,
+            mparser.AndNode: self.evaluate_andstatement,
+            mparser.OrNode: self.evaluate_orstatement,
+            mparser.NotNode: self.evaluate_notstatement,
+            mparser.UMinusNode: self.evaluate_uminusstatement,
+            mparser.ArithmeticNode: self.evaluate_arithmeticstatement,
+            mparser.ForeachClauseNode: self.evaluate_foreach,
+            mparser.IndexNode: self.evaluate_indexing,
+            mparser.TernaryNode: self.evaluate_ternary,
+            mparser.ContinueNode: self.evaluate_continue,
+            mparser.BreakNode: self.evaluate_break,
+            mparser.ParenthesizedNode: self.evaluate_parenthesized,
+            mparser.TestCaseClauseNode: self.evaluate_testcase,
+        }
 
     def evaluate_statement(self, cur: mparser.BaseNode) -> T.Optional[InterpreterObject]:
         self.current_node = cur
-        if isinstance(cur, mparser.FunctionNode):
-            return self.function_call(cur)
-        elif isinstance(cur, mparser.PlusAssignmentNode):
-            self.evaluate_plusassign(cur)
-        elif isinstance(cur, mparser.AssignmentNode):
-            self.assignment(cur)
-        elif isinstance(cur, mparser.MethodNode):
-            return self.method_call(cur)
-        elif isinstance(cur, mparser.StringNode):
-            if cur.is_fstring:
-                if cur.is_multiline:
-                    return self.evaluate_multiline_fstring(cur)
-                else:
-                    return self.evaluate_fstring(cur)
+        try:
+            evaluator = self.statement_evaluators[type(cur)]
+        except KeyError:
+            evaluator = self._find_statement_evaluator(type(cur))
+        return evaluator(cur)
+
+    def _find_statement_evaluator(self, node_type: T.Type[mparser.BaseNode]) -> T.Callable[[T.Any], T.Optional[InterpreterObject]]:
+        # Nodes of types derived from the parser's are evaluated like their base
+        for base in node_type.__mro__[1:]:
+            if base in self.statement_evaluators:
+                evaluator = self.statement_evaluators[base]
+                self.statement_evaluators[node_type] = evaluator
+                return evaluator
+        raise InvalidCode("Unknown statement.")
+
+    def evaluate_string(self, cur: mparser.StringNode) -> T.Optional[InterpreterObject]:
+        if cur.is_fstring:
+            if cur.is_multiline:
+                return self.evaluate_multiline_fstring(cur)
             else:
-                return self._holderify(cur.value)
-        elif isinstance(cur, mparser.BooleanNode):
-            return self._holderify(cur.value)
-        elif isinstance(cur, mparser.IfClauseNode):
-            return self.evaluate_if(cur)
-        elif isinstance(cur, mparser.IdNode):
-            return self.get_variable(cur.value)
-        elif isinstance(cur, mparser.ComparisonNode):
-            return self.evaluate_comparison(cur)
-        elif isinstance(cur, mparser.ArrayNode):
-            return self.evaluate_arraystatement(cur)
-        elif isinstance(cur, mparser.DictNode):
-            return self.evaluate_dictstatement(cur)
-        elif isinstance(cur, mparser.NumberNode):
-            return self._holderify(cur.value)
-        elif isinstance(cur, mparser.AndNode):
-            return self.evaluate_andstatement(cur)
-        elif isinstance(cur, mparser.OrNode):
-            return self.evaluate_orstatement(cur)
-        elif isinstance(cur, mparser.NotNode):
-            return self.evaluate_notstatement(cur)
-        elif isinstance(cur, mparser.UMinusNode):
-            return self.evaluate_uminusstatement(cur)
-        elif isinstance(cur, mparser.ArithmeticNode):
-            return self.evaluate_arithmeticstatement(cur)
-        elif isinstance(cur, mparser.ForeachClauseNode):
-            self.evaluate_foreach(cur)
-        elif isinstance(cur, mparser.IndexNode):
-            return self.evaluate_indexing(cur)
-        elif isinstance(cur, mparser.TernaryNode):
-            return self.evaluate_ternary(cur)
-        elif isinstance(cur, mparser.ContinueNode):
-            raise ContinueRequest()
-        elif isinstance(cur, mparser.BreakNode):
-            raise BreakRequest()
-        elif isinstance(cur, mparser.ParenthesizedNode):
-            return self.evaluate_statement(cur.inner)
-        elif isinstance(cur, mparser.TestCaseClauseNode):
-            return self.evaluate_testcase(cur)
-        else:
-            raise InvalidCode("Unknown statement.")
-        return None
+                return self.evaluate_fstring(cur)
+        return self._holderify(cur.value)
+
+    def evaluate_literal(self, cur: T.Union[mparser.BooleanNode, mparser.NumberNode]) -> InterpreterObject:
+        return self._holderify(cur.value)
+
+    def evaluate_id(self, cur: mparser.IdNode) -> InterpreterObject:
+        return self.get_variable(cur.value)
+
+    def evaluate_continue(self, cur: mparser.ContinueNode) -> T.NoReturn:
+        raise ContinueRequest()
+
+    def evaluate_break(self, cur: mparser.BreakNode) -> T.NoReturn:
+        raise BreakRequest()
+
+    def evaluate_parenthesized(self, cur: mparser.ParenthesizedNode) -> T.Optional[InterpreterObject]:
+        return self.evaluate_statement(cur.inner)
 
     def evaluate_arraystatement(self, cur: mparser.ArrayNode) -> InterpreterObject:
         (arguments, kwargs) = self.reduce_arguments(cur.args)
@@ -523,7 +557,7 @@ class InterpreterBase:
             if not getattr(func, 'no-second-level-holder-flattening', False):
                 func_args, kwargs = resolve_second_level_holders(func_args, kwargs)
             self.current_node = node
-            res = func(node, func_args, kwargs)
+            res = self._call_function(node, func, func_args, kwargs)
             return self._holderify(res) if res is not None else None
         else:
             from difflib import get_close_matches
@@ -550,9 +584,32 @@ class InterpreterBase:
         if not isinstance(obj, InterpreterObject):
             raise InvalidArguments(f'{object_display_name} is not callable.')
         obj.current_node = self.current_node = node
-        res = obj.method_call(method_name, args, kwargs)
+        res = self._call_method(node, obj, method_name, args, kwargs)
         return self._holderify(res) if res is not None else None
 
+    @staticmethod
+    def _call_function_plain(node: mparser.FunctionNode, func: T.Callable[[mparser.BaseNode, T.List[TYPE_var], T.Dict[str, TYPE_var]], TYPE_var],
+                             args: T.List[TYPE_var], kwargs: T.Dict[str, TYPE_var]) -> TYPE_var:
+        return func(node, args, kwargs)
+
+    def _call_function_traced(self, node: mparser.FunctionNode, func: T.Callable[[mparser.BaseNode, T.List[TYPE_var], T.Dict[str, TYPE_var]], TYPE_var],
+                              args: T.List[TYPE_var], kwargs: T.Dict[str, TYPE_var]) -> TYPE_var:
+        with profiling.span(f'{node.func_name.value}()', 'function', location=self._trace_location(node)):
+            return func(node, args, kwargs)
+
+    @staticmethod
+    def _call_method_plain(node: mparser.MethodNode, obj: InterpreterObject, method_name: str,
+                           args: T.List[TYPE_var], kwargs: TYPE_kwargs) -> TYPE_var:
+        return obj.method_call(method_name, args, kwargs)
+
+    def _call_method_traced(self, node: mparser.MethodNode, obj: InterpreterObject, method_name: str,
+                            args: T.List[TYPE_var], kwargs: TYPE_kwargs) -> TYPE_var:
+        with profiling.span(f'{type(obj).__name__}.{method_name}()', 'method', location=self._trace_location(node)):
+            return obj.method_call(method_name, args, kwargs)
+
+    def _trace_location(self, node: mparser.BaseNode) -> str:
+        return f'{os.path.join(self.subdir, environment.build_filename)}:{node.lineno}'
+
     def _holderify(self, res: T.Union[TYPE_var, InterpreterObject]) -> InterpreterObject:
         if isinstance(res, HoldableTypes):
             # Always check for an exact match first.
@@ -696,7 +753,7 @@ class InterpreterBase:
                 # see if the option file has changed
                 self.coredata.options_files[self.subproject] = (option_file, hashlib.sha1(f.read()).hexdigest())
             oi = optinterpreter.OptionInterpreter(self.environment.coredata.optstore, self.subproject)
-            oi.process(option_file)
+            oi.process(option_file, self.ast_cache_dir)
             self.coredata.optstore.update_project_options(oi.options, self.subproject)
             self.build_def_files.add(option_file)
         else:
@@ -722,7 +779,7 @@ class InterpreterBase:
 
         code = self.read_buildfile(absname, buildfilename)
         try:
-            codeblock = mparser.Parser(code, absname).parse()
+            codeblock = astcache.parse(code, absname, self.ast_cache_dir, compact=self.compact_ast)
         except mesonlib.MesonException as me:
             me.file = absname
             raise me
@@ -7,9 +7,10 @@ from .base import RSPFileSyntax
 from .. import mlog
 from ..mesonlib import (
     EnvironmentException,
-    Popen_safe, Popen_safe_logged, join_args, search_version
+    Popen_safe, join_args, search_version
 )
 from ..options import OptionKey
+from ..toolchaincache import run_probe
 
 import re
 import shlex
@@ -72,7 +73,7 @@ def guess_win_linker(env: 'Environment', compiler: T.List[str], comp_class: T.Ty
     if value is not None and invoked_directly:
         compiler = value
 
-    p, o, e = Popen_safe(compiler + check_args)
+    _, o, e = run_probe(compiler + check_args, msg='Detecting linker via')
     if 'LLD' in o.split('\n', maxsplit=1)[0]:
         if 'compatible with GNU linkers' in o:
             return linkers.LLVMDynamicLinker(
@@ -144,13 +145,13 @@ def guess_nix_linker(env: 'Environment', compiler: T.List[str], comp_class: T.Ty
         check_args += ['-Zomf']
 
     mlog.debug('-----')
-    p, o, e = Popen_safe_logged(compiler + check_args, msg='Detecting linker via')
+    _, o, e = run_probe(compiler + check_args, msg='Detecting linker via')
 
     v = search_version(o + e)
     linker: DynamicLinker
     if 'LLD' in o.split('\n', maxsplit=1)[0] or 'tiarmlnk' in e:
         cmd = compiler + override + comp_class.LINKER_OPTION_STYLE.wrap(['-v']) + extra_args
-        _, newo, newerr = Popen_safe_logged(cmd, msg='Detecting LLD linker via')
+        _, newo, newerr = run_probe(cmd, msg='Detecting LLD linker via')
 
         lld_cls: T.Type[DynamicLinker]
         if 'ld64.lld' in newerr:
@@ -236,7 +237,7 @@ def guess_nix_linker(env: 'Environment', compiler: T.List[str], comp_class: T.Ty
     # Note that "ld: unknown option: " sometimes instead is "ld: unknown options:".
     elif e.endswith('(use -v to see invocation)\n') or 'macosx_version' in e or 'ld: unknown option' in e:
         cmd = compiler + comp_class.LINKER_OPTION_STYLE.wrap(['-v']) + extra_args
-        _, newo, newerr = Popen_safe_logged(cmd, msg='Detecting Apple linker via')
+        _, newo, newerr = run_probe(cmd, msg='Detecting Apple linker via')
 
         for line in newerr.split('\n'):
             if 'PROJECT:ld' in line or 'PROJECT:dyld' in line:
@@ -353,7 +353,7 @@ def run(options: 'argparse.Namespace') -> int:
     if options.targets and options.clean:
         raise MesonException('`TARGET` and `--clean` can\'t be used simultaneously')
 
-    b = build.load(options.wd)
+    b = build.load_index(options.wd)
     cdata = b.environment.coredata
     need_vsenv = T.cast('bool', cdata.optstore.get_value_for(OptionKey('vsenv')))
     if setup_vsenv(need_vsenv):
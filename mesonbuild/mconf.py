@@ -81,7 +81,7 @@ class Conf:
         self.all_subprojects: T.Set[str] = set()
 
         if os.path.isdir(os.path.join(self.build_dir, 'meson-private')):
-            self.build = build.load(self.build_dir)
+            self.build = build.load_index(self.build_dir)
             self.source_dir = self.build.environment.get_source_dir()
             self.coredata = self.build.environment.coredata
             self.default_values_only = False
@@ -265,7 +265,7 @@ class Conf:
         if not self.default_values_only:
             mlog.log('  Build dir ', self.build_dir)
 
-        dir_option_names = set(options.BUILTIN_DIR_OPTIONS)
+        dir_option_names = set(options.get_builtin_dir_options())
         test_option_names = {OptionKey('errorlogs'),
                              OptionKey('stdsplit')}
 
@@ -0,0 +1,303 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+"""A resident process that keeps a build directory loaded.
+
+Every `meson introspect` and every regeneration started by the backend pays
+for starting Python and importing Meson before it does any work. `meson
+daemon` runs in the background instead, listens on a Unix socket in the
+private build directory and serves:
+
+- introspection queries, answered from the introspection files that it keeps
+  in memory and reloads when they change, with the same JSON as `meson
+  introspect`;
+- regenerations, which `meson --internal regenerate` forwards to it when it
+  is running, and which run in the already initialized daemon process.
+
+Requests and responses are JSON objects, one per line. A connection may be
+used for any number of requests:
+
+    {"command": "introspect", "args": ["--targets"]}
+    {"result": [...]}
+
+Errors are reported as `{"error": "message"}`.
+
+This module is imported by every regeneration to find out whether a daemon is
+running, so it must stay cheap to import.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import typing as T
+from contextlib import redirect_stdout, redirect_stderr
+
+if T.TYPE_CHECKING:
+    import socketserver
+
+    Request = T.Dict[str, T.Any]
+    Response = T.Dict[str, T.Any]
+
+SOCKET_NAME = 'meson-daemon.sock'
+
+
+def get_socket_path(builddir: str) -> str:
+    return os.path.join(builddir, 'meson-private', SOCKET_NAME)
+
+
+def is_supported() -> bool:
+    return hasattr(socket, 'AF_UNIX')
+
+
+def query(builddir: str, request: Request) -> T.Optional[Response]:
+    '''Send a request to the daemon of a build directory.
+
+    Returns None if no daemon is running for it.
+    '''
+    if not is_supported():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(get_socket_path(builddir))
+        except OSError:
+            # No socket, or a stale one left behind by a daemon that was killed
+            return None
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    finally:
+        sock.close()
+    if not line:
+        return None
+    return T.cast('Response', json.loads(line))
+
+
+def regenerate(args: T.List[str], meson_command: T.List[str]) -> T.Optional[int]:
+    '''Forward `meson --internal regenerate` to the daemon of the current
+    directory, which is the build directory when run by the backend.
+
+    Returns None if no daemon is running or if it can't do the regeneration,
+    which then has to be done by the caller.
+    '''
+    from .coredata import version
+    response = query('.', {'command': 'regenerate', 'args': args, 'meson_command': meson_command,
+                           'version': version, 'cwd': os.getcwd(), 'env': dict(os.environ)})
+    if response is None or 'error' in response:
+        return None
+    print(response['output'], end='', flush=True)
+    return T.cast('int', response['returncode'])
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--stop', action='store_true',
+                        help='Stop the daemon of the build directory')
+    parser.add_argument('builddir', nargs='?', default='.', help='The build directory')
+
+
+class Daemon:
+    def __init__(self, builddir: str, meson_command: T.List[str]) -> None:
+        self.builddir = os.path.abspath(builddir)
+        self.meson_command = meson_command
+        # Regenerations change the process wide environment and working
+        # directory, so requests are handled one at a time.
+        self.lock = threading.Lock()
+        self.info_cache: T.Dict[str, T.Tuple[T.Tuple[int, int], T.Any]] = {}
+        self.server: T.Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    def load_info_file(self, kind: T.Optional[str] = None) -> T.Any:
+        from . import mintro
+        fname = mintro.get_info_file(mintro.get_infodir(self.builddir), kind)
+        st = os.stat(fname)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self.info_cache.get(fname)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        data = mintro.load_info_file(mintro.get_infodir(self.builddir), kind)
+        self.info_cache[fname] = (stamp, data)
+        return data
+
+    def introspect(self, args: T.List[str]) -> Response:
+        from . import mesonlib, mintro
+
+        parser = argparse.ArgumentParser(prog='meson introspect', add_help=False)
+        mintro.add_arguments(parser)
+        usage = io.StringIO()
+        try:
+            with redirect_stderr(usage):
+                options = parser.parse_args(args)
+        except SystemExit:
+            return {'error': usage.getvalue().strip()}
+
+        try:
+            raw = self.load_info_file()
+        except FileNotFoundError:
+            return {'error': f'Introspection file {mintro.get_info_file(mintro.get_infodir(self.builddir))} does not exist.'}
+        intro_vers = raw.get('introspection', {}).get('version', {}).get('full', '0.0.0')
+        vers_to_check = mintro.get_meson_introspection_required_version()
+        if not all(mesonlib.version_compare(intro_vers, i) for i in vers_to_check):
+            return {'error': f'Introspection version {intro_vers} is not supported. '
+                             f'The required version is: {" and ".join(vers_to_check)}'}
+
+        results: T.List[T.Tuple[str, T.Union[dict, T.List[T.Any]]]] = []
+        for i, v in mintro.INTRO_TYPES.items():
+            if not v.func:
+                continue
+            if not options.all and not getattr(options, i, False):
+                continue
+            try:
+                results.append((i, self.load_info_file(i)))
+            except FileNotFoundError:
+                return {'error': f'Introspection file {mintro.get_info_file(mintro.get_infodir(self.builddir), i)} does not exist.'}
+        if not results and not options.force_dict:
+            return {'error': 'No command specified'}
+        return {'result': mintro.get_results_object(options, results)}
+
+    def regenerate(self, request: Request) -> Response:
+        from . import mesonmain
+        from .coredata import version
+
+        if request.get('meson_command') != self.meson_command:
+            # A different Meson started the regeneration, it can't be done here
+            return {'error': 'The daemon runs a different Meson'}
+        if request.get('version') != version:
+            # Meson was upgraded in place since the daemon started
+            return {'error': f'The daemon runs Meson {version}'}
+        cwd = os.getcwd()
+        environ = dict(os.environ)
+        output = io.StringIO()
+        output.write(f'Regenerating in meson daemon (pid {os.getpid()})\n')
+        try:
+            os.chdir(request['cwd'])
+            os.environ.clear()
+            os.environ.update(request['env'])
+            with redirect_stdout(output), redirect_stderr(output):
+                returncode = mesonmain.run_regenerate(request['args'])
+        finally:
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(environ)
+            clear_configure_caches()
+        return {'returncode': returncode, 'output': output.getvalue()}
+
+    def process(self, request: Request) -> Response:
+        command = request.get('command')
+        with self.lock:
+            if command == 'introspect':
+                return self.introspect(request.get('args', []))
+            elif command == 'regenerate':
+                return self.regenerate(request)
+            elif command == 'ping':
+                return {'result': os.getpid()}
+            elif command == 'stop':
+                assert self.server is not None
+                threading.Thread(target=self.server.shutdown).start()
+                return {'result': None}
+        return {'error': f'Unknown command {command!r}'}
+
+    def serve(self) -> None:
+        import socketserver
+
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        response = daemon.process(request)
+                    except Exception as e:
+                        response = {'error': f'{type(e).__name__}: {e!s}'}
+                    self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+
+        # Import everything that requests need up front
+        for name in ['mintro', 'msetup']:
+            importlib.import_module(f'mesonbuild.{name}')
+
+        path = get_socket_path(self.builddir)
+        if os.path.exists(path):
+            os.unlink(path)
+        self.server = socketserver.ThreadingUnixStreamServer(path, RequestHandler)
+        self.server.daemon_threads = True
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def clear_configure_caches() -> None:
+    # Results of a previous configuration must not leak into the next one,
+    # it has to see the same system as a new process would.
+    from . import mesonlib, mlog
+    from .compilers.mixins.clike import CLikeCompiler
+    from .dependencies.pkgconfig import PkgConfigInterface
+    CLikeCompiler.find_library_cache.clear()
+    CLikeCompiler.find_framework_cache.clear()
+    CLikeCompiler.linked_libraries_cache.clear()
+    CLikeCompiler.linked_symbols_cache.clear()
+    PkgConfigInterface.class_impl.assign({}, {})
+    PkgConfigInterface.class_cli_impl.assign({}, {})
+    mesonlib.project_meson_versions.clear()
+    mlog.reset()
+    clear_lru_caches()
+
+
+def clear_lru_caches() -> None:
+    """Clear the functools.lru_cache of every function and method of Meson.
+
+    Memoized methods also keep the objects they were called on, such as
+    the Build and the backend of the previous configuration, alive.
+    """
+    for name, module in list(sys.modules.items()):
+        if name.partition('.')[0] != 'mesonbuild':
+            continue
+        for obj in list(vars(module).values()):
+            if isinstance(obj, type):
+                members = list(vars(obj).values())
+            elif callable(obj):
+                members = [obj]
+            else:
+                continue
+            for member in members:
+                if isinstance(member, (staticmethod, classmethod)):
+                    member = member.__func__
+                elif isinstance(member, property):
+                    member = member.fget
+                cache_clear = getattr(member, 'cache_clear', None)
+                if callable(cache_clear):
+                    cache_clear()
+
+
+def run(options: argparse.Namespace) -> int:
+    from . import mesonlib, mlog
+    if not is_supported():
+        raise mesonlib.MesonException('meson daemon is not supported on this platform.')
+    builddir = options.builddir
+    if not os.path.isfile(os.path.join(builddir, 'meson-private', 'coredata.dat')):
+        raise mesonlib.MesonException(f'Directory {builddir!r} does not seem to be a Meson build directory.')
+    if options.stop:
+        if query(builddir, {'command': 'stop'}) is None:
+            mlog.log('No daemon is running for', mlog.bold(builddir))
+            return 1
+        return 0
+    if query(builddir, {'command': 'ping'}) is not None:
+        raise mesonlib.MesonException(f'A daemon is already running for {builddir!r}.')
+    daemon = Daemon(builddir, list(mesonlib.get_meson_command()))
+    mlog.log('Serving', mlog.bold(builddir), 'on', get_socket_path(daemon.builddir))
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    return 0
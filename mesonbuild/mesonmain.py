@@ -27,6 +27,10 @@ if T.TYPE_CHECKING:
         command: str
         run_func: T.Callable[['MesonMainCMDOptions'], int]
 
+    AddArgumentsFunc = T.Callable[[argparse.ArgumentParser], None]
+    RunFunc = T.Callable[[argparse.Namespace], int]
+    CommandLoader = T.Callable[[], T.Tuple[AddArgumentsFunc, RunFunc]]
+
 
 def errorhandler(e: Exception, command: str) -> int:
     import traceback
@@ -67,66 +71,73 @@ def errorhandler(e: Exception, command: str) -> int:
             mlog.exception(e)
         return 2
 
+def command_module(name: str) -> CommandLoader:
+    '''Return a loader for a command implemented by the add_arguments() and
+    run() functions of a module in mesonbuild.'''
+    def load() -> T.Tuple[AddArgumentsFunc, RunFunc]:
+        module = importlib.import_module('mesonbuild.' + name)
+        return module.add_arguments, module.run
+    return load
+
 # Note: when adding arguments, please also add them to the completion
 # scripts in $MESONSRC/data/shell-completions/
 class CommandLineParser:
     def __init__(self) -> None:
-        # only import these once we do full argparse processing
-        from . import mconf, mdist, minit, minstall, mintro, msetup, mtest, rewriter, msubprojects, munstable_coredata, mcompile, mdevenv, mformat
-        from .scripts import env2mfile, reprotest
-        from .wrap import wraptool
         import shutil
 
         self.term_width = shutil.get_terminal_size().columns
         self.formatter = lambda prog: argparse.HelpFormatter(prog, max_help_position=int(self.term_width / 2), width=self.term_width)
 
         self.commands: T.Dict[str, argparse.ArgumentParser] = {}
+        # Commands are only imported when they are used, see load_command()
+        self.command_loaders: T.Dict[argparse.ArgumentParser, CommandLoader] = {}
         self.hidden_commands: T.List[str] = []
         self.parser = argparse.ArgumentParser(prog='meson', formatter_class=self.formatter)
         self.subparsers = self.parser.add_subparsers(title='Commands', dest='command',
                                                      description='If no command is specified it defaults to setup command.')
-        self.add_command('setup', msetup.add_arguments, msetup.run,
+        self.add_command('setup', command_module('msetup'),
                          help_msg='Configure the project')
-        self.add_command('configure', mconf.add_arguments, mconf.run,
+        self.add_command('configure', command_module('mconf'),
                          help_msg='Change project options',)
-        self.add_command('dist', mdist.add_arguments, mdist.run,
+        self.add_command('dist', command_module('mdist'),
                          help_msg='Generate release archive',)
-        self.add_command('install', minstall.add_arguments, minstall.run,
+        self.add_command('install', command_module('minstall'),
                          help_msg='Install the project')
-        self.add_command('introspect', mintro.add_arguments, mintro.run,
+        self.add_command('introspect', command_module('mintro'),
                          help_msg='Introspect project')
-        self.add_command('init', minit.add_arguments, minit.run,
+        self.add_command('init', command_module('minit'),
                          help_msg='Create a new project')
-        self.add_command('test', mtest.add_arguments, mtest.run,
+        self.add_command('test', command_module('mtest'),
                          help_msg='Run tests')
-        self.add_command('wrap', wraptool.add_arguments, wraptool.run,
+        self.add_command('wrap', command_module('wrap.wraptool'),
                          help_msg='Wrap tools')
-        self.add_command('subprojects', msubprojects.add_arguments, msubprojects.run,
+        self.add_command('subprojects', command_module('msubprojects'),
                          help_msg='Manage subprojects')
-        self.add_command('rewrite', lambda parser: rewriter.add_arguments(parser, self.formatter), rewriter.run,
+        self.add_command('rewrite', self.load_rewrite_command,
                          help_msg='Modify the project definition')
-        self.add_command('compile', mcompile.add_arguments, mcompile.run,
+        self.add_command('compile', command_module('mcompile'),
                          help_msg='Build the project')
-        self.add_command('devenv', mdevenv.add_arguments, mdevenv.run,
+        self.add_command('devenv', command_module('mdevenv'),
                          help_msg='Run commands in developer environment')
-        self.add_command('env2mfile', env2mfile.add_arguments, env2mfile.run,
+        self.add_command('env2mfile', command_module('scripts.env2mfile'),
                          help_msg='Convert current environment to a cross or native file')
-        self.add_command('reprotest', reprotest.add_arguments, reprotest.run,
+        self.add_command('reprotest', command_module('scripts.reprotest'),
                          help_msg='Test if project builds reproducibly')
-        self.add_command('format', mformat.add_arguments, mformat.run, aliases=['fmt'],
+        self.add_command('format', command_module('mformat'), aliases=['fmt'],
                          help_msg='Format meson source file')
+        self.add_command('daemon', command_module('mdaemon'),
+                         help_msg='Keep a build directory loaded to answer queries faster')
         # Add new commands above this line to list them in help command
-        self.add_command('help', self.add_help_arguments, self.run_help_command,
+        self.add_command('help', lambda: (self.add_help_arguments, self.run_help_command),
                          help_msg='Print help of a subcommand')
 
         # Hidden commands
-        self.add_command('runpython', self.add_runpython_arguments, self.run_runpython_command,
+        self.add_command('runpython', lambda: (self.add_runpython_arguments, self.run_runpython_command),
                          help_msg=argparse.SUPPRESS)
-        self.add_command('unstable-coredata', munstable_coredata.add_arguments, munstable_coredata.run,
+        self.add_command('unstable-coredata', command_module('munstable_coredata'),
                          help_msg=argparse.SUPPRESS)
 
-    def add_command(self, name: str, add_arguments_func: T.Callable[[argparse.ArgumentParser], None],
-                    run_func: T.Callable[[argparse.Namespace], int], help_msg: str,
+    def add_command(self, name: str, loader: CommandLoader, help_msg: str,
                     aliases: T.List[str] | None = None) -> None:
         aliases = aliases or []
         # FIXME: Cannot have hidden subparser:
@@ -136,10 +147,23 @@ class CommandLineParser:
             self.hidden_commands.append(name)
         else:
             p = self.subparsers.add_parser(name, help=help_msg, aliases=aliases, formatter_class=self.formatter)
-        add_arguments_func(p)
-        p.set_defaults(run_func=run_func)
         for i in [name] + aliases:
             self.commands[i] = p
+        self.command_loaders[p] = loader
+
+    def load_command(self, name: str) -> argparse.ArgumentParser:
+        '''Import a command and add its arguments to its parser.'''
+        p = self.commands[name]
+        loader = self.command_loaders.pop(p, None)
+        if loader is not None:
+            add_arguments_func, run_func = loader()
+            add_arguments_func(p)
+            p.set_defaults(run_func=run_func)
+        return p
+
+    def load_rewrite_command(self) -> T.Tuple[AddArgumentsFunc, RunFunc]:
+        from . import rewriter
+        return lambda parser: rewriter.add_arguments(parser, self.formatter), rewriter.run
 
     def add_runpython_arguments(self, parser: argparse.ArgumentParser) -> None:
         parser.add_argument('-c', action='store_true', dest='eval_arg', default=False)
@@ -162,7 +186,7 @@ class CommandLineParser:
 
     def run_help_command(self, options: argparse.Namespace) -> int:
         if options.command:
-            self.commands[options.command].print_help()
+            self.load_command(options.command).print_help()
         else:
             self.parser.print_help()
         return 0
@@ -176,6 +200,9 @@ class CommandLineParser:
             implicit_setup_command_notice = True
             args = ['setup'] + args
 
+        if args[0] in self.commands:
+            self.load_command(args[0])
+
         # Hidden commands have their own parser instead of using the global one
         if args[0] in self.hidden_commands:
             command = args[0]
@@ -245,6 +272,10 @@ def set_meson_command(mainfile: str) -> None:
     mesonlib.set_meson_command(mainfile)
 
 def validate_original_args(args: list[str]) -> None:
+    # Only -D arguments can conflict, avoid importing the options otherwise
+    if not any(a.startswith('-D') for a in args):
+        return
+
     import mesonbuild.options
     import itertools
 
@@ -254,7 +285,7 @@ def validate_original_args(args: list[str]) -> None:
                 return True
         return False
 
-    for optionkey in itertools.chain(mesonbuild.options.BUILTIN_DIR_OPTIONS, mesonbuild.options.BUILTIN_CORE_OPTIONS):
+    for optionkey in itertools.chain(mesonbuild.options.get_builtin_dir_options(), mesonbuild.options.BUILTIN_CORE_OPTIONS):
         longarg = mesonbuild.options.argparse_name_to_arg(optionkey.name)
         shortarg = f'-D{optionkey.name}'
         if has_startswith(args, longarg) and has_startswith(args, shortarg):
@@ -262,6 +293,13 @@ def validate_original_args(args: list[str]) -> None:
                 f'Got argument {optionkey.name} as both {shortarg} and {longarg}. Pick one.')
 
 
+def run_regenerate(args: T.List[str]) -> int:
+    from . import msetup
+    try:
+        return msetup.run(['--reconfigure'] + args)
+    except Exception as e:
+        return errorhandler(e, 'setup')
+
 def run(original_args: T.List[str], mainfile: str) -> int:
     if os.environ.get('MESON_SHOW_DEPRECATIONS'):
         # workaround for https://bugs.python.org/issue34624
@@ -300,11 +338,11 @@ def run(original_args: T.List[str], mainfile: str) -> int:
     if len(args) >= 2 and args[0] == '--internal':
         if args[1] == 'regenerate':
             set_meson_command(mainfile)
-            from . import msetup
-            try:
-                return msetup.run(['--reconfigure'] + args[2:])
-            except Exception as e:
-                return errorhandler(e, 'setup')
+            from . import mdaemon, mesonlib
+            returncode = mdaemon.regenerate(args[2:], list(mesonlib.get_meson_command()))
+            if returncode is not None:
+                return returncode
+            return run_regenerate(args[2:])
         else:
             return run_script_command(args[1], args[2:])
 
@@ -192,7 +192,7 @@ def run(options: Arguments) -> int:
         if ret.returncode:
             raise SystemExit
 
-        b = build.load(options.builddir)
+        b = build.load_index(options.builddir)
         need_vsenv = T.cast('bool', b.environment.coredata.optstore.get_value_for(OptionKey('vsenv')))
         vsenv_active = mesonlib.setup_vsenv(need_vsenv)
         if vsenv_active:
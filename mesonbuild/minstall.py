@@ -881,7 +881,7 @@ def run(opts: 'ArgumentType') -> int:
     if not os.path.exists(os.path.join(opts.wd, datafilename)):
         sys.exit('Install data not found. Run this command in build directory root.')
     if not opts.no_rebuild:
-        b = build.load(opts.wd)
+        b = build.load_index(opts.wd)
         need_vsenv = T.cast('bool', b.environment.coredata.optstore.get_value_for(OptionKey('vsenv')))
         setup_vsenv(need_vsenv)
         backend = T.cast('str', b.environment.coredata.optstore.get_value_for(OptionKey('backend')))
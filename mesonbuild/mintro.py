@@ -19,19 +19,24 @@ from pathlib import Path, PurePath
 import sys
 import typing as T
 
-from . import build, environment, mesonlib, options, coredata as cdata
-from .ast import IntrospectionInterpreter, AstConditionLevel, AstIDGenerator, AstIndentationGenerator, AstJSONPrinter
-from .backend import backends
-from .interpreterbase import UnknownValue
+from . import mesonlib, options, coredata as cdata
 from .options import OptionKey
 
+# Introspecting a build directory only reads JSON files, which many tools do
+# very often. Everything that is only needed to write these files, or to
+# introspect a source directory, is imported where it is used.
 if T.TYPE_CHECKING:
     import argparse
 
+    from . import build
+    from .ast import IntrospectionInterpreter
+    from .backend import backends
     from .dependencies import Dependency
+    from .interpreterbase import UnknownValue
 
 class IntrospectionEncoder(json.JSONEncoder):
     def default(self, obj: T.Any) -> T.Any:
+        from .interpreterbase import UnknownValue
         if isinstance(obj, UnknownValue):
             return 'unknown'
         return json.JSONEncoder.default(self, obj)
@@ -46,6 +51,7 @@ def get_meson_introspection_required_version() -> T.List[str]:
     return ['>=1.0', '<2.0']
 
 def dump_ast(intr: IntrospectionInterpreter) -> T.Dict[str, T.Any]:
+    from .ast import AstJSONPrinter
     printer = AstJSONPrinter()
     intr.ast.accept(printer)
     return printer.result
@@ -152,6 +158,7 @@ def list_targets_from_source(intr: IntrospectionInterpreter) -> T.List[T.Dict[st
     return tlist
 
 def list_targets(coredata: cdata.CoreData, builddata: build.Build, backend: backends.Backend) -> T.List[T.Any]:
+    from . import build, environment
     tlist: T.List[T.Any] = []
     build_dir = builddata.environment.get_build_dir()
     src_dir = builddata.environment.get_source_dir()
@@ -218,7 +225,7 @@ def _list_buildoptions(coredata: cdata.CoreData, subprojects: T.Optional[T.List[
     optlist: T.List[T.Dict[str, T.Union[str, bool, int, T.List[str]]]] = []
     subprojects = subprojects or []
 
-    dir_option_names = set(options.BUILTIN_DIR_OPTIONS)
+    dir_option_names = set(options.get_builtin_dir_options())
     test_option_names = {OptionKey('errorlogs'),
                          OptionKey('stdsplit')}
 
@@ -331,6 +338,7 @@ def list_deps_from_source(intr: IntrospectionInterpreter) -> T.List[T.Dict[str,
     return result
 
 def list_deps(coredata: cdata.CoreData, builddata: build.Build, backend: backends.Backend) -> T.List[T.Dict[str, T.Union[str, T.List[str]]]]:
+    from . import build
     result: T.Dict[str, T.Dict[str, T.Union[str, T.List[str]]]] = {}
 
     def _src_to_str(src_file: T.Union[str, build.TargetSources, build.StructuredSources]) -> T.List[str]:
@@ -365,10 +373,10 @@ def list_deps(coredata: cdata.CoreData, builddata: build.Build, backend: backend
 
     return list(result.values())
 
-def get_test_list(testdata: T.List[backends.TestSerialisation]) -> T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str]]]]:
-    result: T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str]]]] = []
+def get_test_list(testdata: T.List[backends.TestSerialisation]) -> T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str], T.Dict[str, int]]]]:
+    result: T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str], T.Dict[str, int]]]] = []
     for t in testdata:
-        to: T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str]]] = {}
+        to: T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str], T.Dict[str, int]]] = {}
         if isinstance(t.fname, str):
             fname = [t.fname]
         else:
@@ -384,17 +392,18 @@ def get_test_list(testdata: T.List[backends.TestSerialisation]) -> T.List[T.Dict
         to['suite'] = t.suite
         to['is_parallel'] = t.is_parallel
         to['priority'] = t.priority
+        to['resources'] = t.resources
         to['protocol'] = str(t.protocol)
         to['depends'] = t.depends
         to['extra_paths'] = t.extra_paths
         result.append(to)
     return result
 
-def list_tests(coredata: cdata.CoreData, builddata: build.Build, backend: backends.Backend) -> T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str]]]]:
+def list_tests(coredata: cdata.CoreData, builddata: build.Build, backend: backends.Backend) -> T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str], T.Dict[str, int]]]]:
     testdata = backend.create_test_serialisation(builddata.get_tests())
     return get_test_list(testdata)
 
-def list_benchmarks(coredata: cdata.CoreData, builddata: build.Build, backend: backends.Backend) -> T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str]]]]:
+def list_benchmarks(coredata: cdata.CoreData, builddata: build.Build, backend: backends.Backend) -> T.List[T.Dict[str, T.Union[str, int, T.List[str], T.Dict[str, str], T.Dict[str, int]]]]:
     benchdata = backend.create_test_serialisation(builddata.get_benchmarks())
     return get_test_list(benchdata)
 
@@ -450,16 +459,18 @@ def print_results(options: argparse.Namespace, results: T.Sequence[T.Tuple[str,
     if not results and not options.force_dict:
         print('No command specified')
         return 1
-    elif len(results) == 1 and not options.force_dict:
-        # Make to keep the existing output format for a single option
-        print(json.dumps(results[0][1], indent=indent, cls=IntrospectionEncoder))
-    else:
-        out = {}
-        for i in results:
-            out[i[0]] = i[1]
-        print(json.dumps(out, indent=indent, cls=IntrospectionEncoder))
+    print(json.dumps(get_results_object(options, results), indent=indent, cls=IntrospectionEncoder))
     return 0
 
+def get_results_object(options: argparse.Namespace, results: T.Sequence[T.Tuple[str, T.Union[dict, T.List[T.Any]]]]) -> T.Union[dict, T.List[T.Any]]:
+    if len(results) == 1 and not options.force_dict:
+        # Make to keep the existing output format for a single option
+        return results[0][1]
+    out = {}
+    for i in results:
+        out[i[0]] = i[1]
+    return out
+
 def get_infodir(builddir: T.Optional[str] = None) -> str:
     infodir = 'meson-info'
     if builddir is not None:
@@ -525,8 +536,10 @@ def run(options: argparse.Namespace) -> int:
     results: T.List[T.Tuple[str, T.Union[dict, T.List[T.Any]]]] = []
 
     # TODO: This if clause is undocumented.
-    if os.path.basename(options.builddir) == environment.build_filename:
-        sourcedir = '.' if options.builddir == environment.build_filename else options.builddir[:-len(environment.build_filename)]
+    if os.path.basename(options.builddir) == 'meson.build':
+        from .ast import IntrospectionInterpreter, AstConditionLevel, AstIDGenerator, AstIndentationGenerator
+        from .backend import backends
+        sourcedir = '.' if options.builddir == 'meson.build' else options.builddir[:-len('meson.build')]
         # Make sure that log entries in other parts of meson don't interfere with the JSON output
         with redirect_stdout(sys.stderr):
             backend = backends.get_backend_from_name(options.backend)
@@ -613,7 +626,7 @@ def split_version_string(version: str) -> T.Dict[str, T.Union[str, int]]:
         'patch': int(vers_list[2] if len(vers_list) > 2 else 0)
     }
 
-def write_meson_info_file(builddata: build.Build, errors: list, build_files_updated: bool = False) -> None:
+def write_meson_info_file(builddata: T.Union[build.Build, build.BuildIndex], errors: list, build_files_updated: bool = False) -> None:
     info_dir = builddata.environment.info_dir
     info_file = get_meson_info_file(info_dir)
     intro_info = {}
@@ -16,6 +16,7 @@ import platform
 import shlex
 import subprocess
 import shutil
+import threading
 import typing as T
 from contextlib import contextmanager
 from dataclasses import dataclass, field
@@ -75,6 +76,7 @@ class _Logger:
     logged_once: T.Set[T.Tuple[str, ...]] = field(default_factory=set)
     log_warnings_counter = 0
     log_pager: T.Optional['subprocess.Popen'] = None
+    _deferred: threading.local = field(default_factory=threading.local)
 
     _LOG_FNAME: T.ClassVar[str] = 'meson-log.txt'
     _SLOG_FNAME: T.ClassVar[str] = 'meson-setup.txt'
@@ -96,6 +98,32 @@ class _Logger:
         finally:
             self.log_disable_stdout = restore
 
+    @contextmanager
+    def deferred(self) -> T.Iterator[T.List[T.Tuple[str, T.Tuple[T.Any, ...], T.Dict[str, T.Any]]]]:
+        """Record, rather than emit, everything logged by the current thread.
+
+        The records can be emitted later with :meth:`replay`. This allows work
+        done concurrently on worker threads to be logged as if it had been
+        done serially.
+        """
+        records: T.List[T.Tuple[str, T.Tuple[T.Any, ...], T.Dict[str, T.Any]]] = []
+        self._deferred.records = records
+        try:
+            yield records
+        finally:
+            del self._deferred.records
+
+    def _defer(self, method: str, args: T.Tuple[T.Any, ...], kwargs: T.Dict[str, T.Any]) -> bool:
+        records = getattr(self._deferred, 'records', None)
+        if records is None:
+            return False
+        records.append((method, args, kwargs))
+        return True
+
+    def replay(self, records: T.List[T.Tuple[str, T.Tuple[T.Any, ...], T.Dict[str, T.Any]]]) -> None:
+        for method, args, kwargs in records:
+            getattr(self, method)(*args, **kwargs)
+
     def set_quiet(self) -> None:
         self.log_errors_only = True
 
@@ -121,6 +149,13 @@ class _Logger:
         self.stop_pager()
         return None
 
+    def reset(self) -> None:
+        """Close the logs and forget everything logged, as in a new process."""
+        while self.shutdown() is not None:
+            pass
+        self.__dict__.clear()
+        self.__dict__.update(vars(_Logger()))
+
     def start_pager(self) -> None:
         if not self.colorize_console():
             return
@@ -221,6 +256,8 @@ class _Logger:
 
     def debug(self, *args: TV_Loggable, sep: T.Optional[str] = None,
               end: T.Optional[str] = None, display_timestamp: bool = True) -> None:
+        if self._defer('debug', args, {'sep': sep, 'end': end, 'display_timestamp': display_timestamp}):
+            return
         arr = process_markup(args, False, display_timestamp)
         if self.log_file is not None:
             print(*arr, file=self.log_file, sep=sep, end=end)
@@ -255,6 +292,9 @@ class _Logger:
             sep: T.Optional[str] = None,
             end: T.Optional[str] = None,
             display_timestamp: bool = True) -> None:
+        if self._defer('log', args, {'is_error': is_error, 'once': once, 'nested': nested,
+                                     'sep': sep, 'end': end, 'display_timestamp': display_timestamp}):
+            return
         if self._should_log(*args, once=once):
             self._log(*args, is_error=is_error, nested=nested, sep=sep, end=end, display_timestamp=display_timestamp)
 
@@ -285,6 +325,11 @@ class _Logger:
                    is_error: bool = True) -> None:
         from .mesonlib import MesonException, relpath
 
+        if self._defer('_log_error', (severity,) + rargs,
+                       {'once': once, 'fatal': fatal, 'location': location, 'nested': nested,
+                        'sep': sep, 'end': end, 'is_error': is_error}):
+            return
+
         # The typing requirements here are non-obvious. Lists are invariant,
         # therefore T.List[A] and T.List[T.Union[A, B]] are not able to be joined
         if severity is _Severity.NOTICE:
@@ -425,6 +470,7 @@ _logger = _Logger()
 cmd_ci_include = _logger.cmd_ci_include
 colorize_console = _logger.colorize_console
 debug = _logger.debug
+deferred = _logger.deferred
 deprecation = _logger.deprecation
 error = _logger.error
 exception = _logger.exception
@@ -441,6 +487,8 @@ no_logging = _logger.no_logging
 notice = _logger.notice
 process_markup = _logger.process_markup
 redirect = _logger.redirect
+replay = _logger.replay
+reset = _logger.reset
 set_quiet = _logger.set_quiet
 set_timestamp_start = _logger.set_timestamp_start
 set_verbose = _logger.set_verbose
@@ -16,7 +16,7 @@ from .. import dependencies
 from .. import mesonlib
 from ..options import OptionKey
 from .. import mlog
-from ..options import BUILTIN_DIR_OPTIONS
+from ..options import get_builtin_dir_options
 from ..dependencies.pkgconfig import PkgConfigDependency, PkgConfigInterface
 from ..interpreter.primitives import OptionString
 from ..interpreter.type_checking import D_MODULE_VERSIONS_KW, INSTALL_DIR_KW, VARIABLES_KW, NoneType
@@ -503,7 +503,7 @@ class PkgConfigModule(NewExtensionModule):
                                  pkgroot: T.Optional[str] = None) -> None:
         coredata = state.environment.get_coredata()
         referenced_vars = set()
-        optnames = [x.name for x in BUILTIN_DIR_OPTIONS.keys()]
+        optnames = [x.name for x in get_builtin_dir_options().keys()]
 
         if not dataonly:
             # includedir is always implied, although libdir may not be
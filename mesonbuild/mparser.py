@@ -77,7 +77,7 @@ class BlockParseException(ParseException):
 
 TV_TokenTypes = T.TypeVar('TV_TokenTypes', int, str, bool)
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Token(T.Generic[TV_TokenTypes]):
     tid: str
     filename: str
@@ -99,6 +99,31 @@ IDENT_RE_STR = r'[_a-zA-Z][_0-9a-zA-Z]*'
 IDENT_RE = re.compile(IDENT_RE_STR)
 IDENT_RE_MACHINEFILE = re.compile(IDENT_RE_STR + '|~')
 
+def _token_re(ident_re: str) -> T.Pattern[str]:
+    # All tokens are matched by a single regex, whose alternatives are tried
+    # in order. Those must be sorted longest to shortest.
+    token_specification = [
+        ('whitespace', r'[ \t]+'),
+        ('multiline_fstring', r"f'''[\s\S]*?'''"),
+        ('fstring', r"f'(?:[^'\\]|\\.)*'"),
+        ('id', ident_re),
+        ('number', r'0[bB][01]+|0[oO][0-7]+|0[xX][0-9a-fA-F]+|0|[1-9]\d*'),
+        ('eol_cont', r'\\[ \t]*(?:#.*)?\n'),
+        ('multiline_string', r"'''[\s\S]*?'''"),
+        ('comment', r'#.*'),
+        ('string', r"'(?:[^'\\]|\\.)*'"),
+        ('plusassign', r'\+='),
+        ('equal', r'=='),
+        ('nequal', r'!='),
+        ('le', r'<='),
+        ('ge', r'>='),
+        ('single', r'[\n()\[\]{}",.+\-*%/:=<>?]'),
+    ]
+    return re.compile('|'.join(f'(?P<{tid}>{reg})' for tid, reg in token_specification))
+
+TOKEN_RE = _token_re(IDENT_RE_STR)
+TOKEN_RE_MACHINEFILE = _token_re(IDENT_RE_STR + '|~')
+
 class Lexer:
     def __init__(self, code: str, *, machinefile: bool = False):
         if code.startswith(codecs.BOM_UTF8.decode('utf-8')):
@@ -113,23 +138,7 @@ class Lexer:
         self.in_unit_test = 'MESON_RUNNING_IN_PROJECT_TESTS' in os.environ
         if self.in_unit_test:
             self.keywords.update({'testcase', 'endtestcase'})
-        self.token_specification = [
-            # Need to be sorted longest to shortest.
-            ('whitespace', re.compile(r'[ \t]+')),
-            ('multiline_fstring', re.compile(r"f'''(.|\n)*?'''", re.M)),
-            ('fstring', re.compile(r"f'([^'\\]|(\\.))*'")),
-            ('id', IDENT_RE_MACHINEFILE if machinefile else IDENT_RE),
-            ('number', re.compile(r'0[bB][01]+|0[oO][0-7]+|0[xX][0-9a-fA-F]+|0|[1-9]\d*')),
-            ('eol_cont', re.compile(r'\\[ \t]*(#.*)?\n')),
-            ('multiline_string', re.compile(r"'''(.|\n)*?'''", re.M)),
-            ('comment', re.compile(r'#.*')),
-            ('string', re.compile(r"'([^'\\]|(\\.))*'")),
-            ('plusassign', re.compile(r'\+=')),
-            ('equal', re.compile(r'==')),
-            ('nequal', re.compile(r'!=')),
-            ('le', re.compile(r'<=')),
-            ('ge', re.compile(r'>=')),
-        ]
+        self.token_re = TOKEN_RE_MACHINEFILE if machinefile else TOKEN_RE
 
         self.single_char_tokens = {
             '\n': 'eol',
@@ -158,82 +167,76 @@ class Lexer:
         return self.code[line_start:self.code.find('\n', line_start)]
 
     def lex(self, filename: str) -> T.Generator[Token, None, None]:
+        code = self.code
+        code_len = len(code)
+        match = self.token_re.match
         line_start = 0
         lineno = 1
         loc = 0
         par_count = 0
         bracket_count = 0
         curl_count = 0
-        try:
-            while loc < len(self.code):
-                value: str
-                span_start = loc
-                col = loc - line_start
-                curline = lineno
-                curline_start = line_start
-                for (tid, reg) in self.token_specification:
-                    mo = reg.match(self.code, loc)
-                    if mo:
-                        value = mo.group()
-                        loc = mo.end()
-                        break
-                else:
-                    # lex single characters and raise an exception for invalid tokens
-                    value = self.code[loc]
-                    tid = self.single_char_tokens[value]
-                    loc += 1
-
-                    if tid == 'lparen':
-                        par_count += 1
-                    elif tid == 'rparen':
-                        par_count -= 1
-                    elif tid == 'lbracket':
-                        bracket_count += 1
-                    elif tid == 'rbracket':
-                        bracket_count -= 1
-                    elif tid == 'lcurl':
-                        curl_count += 1
-                    elif tid == 'rcurl':
-                        curl_count -= 1
-                    elif tid == 'dblquote':
-                        raise ParseException('Double quotes are not supported. Use single quotes.', self.getline(line_start), lineno, col)
-                    elif tid == 'eol':
-                        lineno += 1
-                        line_start = loc
-                        if par_count > 0 or bracket_count > 0 or curl_count > 0:
-                            tid = 'whitespace'
-
-                if tid == 'id':
-                    if value in self.keywords:
-                        tid = value
-                    else:
-                        if value in self.future_keywords:
-                            mlog.warning(f"Identifier '{value}' will become a reserved keyword in a future release. Please rename it.",
-                                         location=BaseNode(lineno, col, filename))
-                elif tid in {'string', 'fstring'}:
-                    if value.find("\n") != -1:
-                        msg = ("Newline character in a string detected, use ''' (three single quotes) "
-                               "for multiline strings instead.\n"
-                               "This will become a hard error in a future Meson release.")
-                        mlog.warning(mlog.code_line(msg, self.getline(line_start), col), location=BaseNode(lineno, col, filename))
-                    value = value[2 if tid == 'fstring' else 1:-1]
-                elif tid in {'multiline_string', 'multiline_fstring'}:
-                    value = value[4 if tid == 'multiline_fstring' else 3:-3]
-                    lines = value.split('\n')
-                    if len(lines) > 1:
-                        lineno += len(lines) - 1
-                        line_start = loc - len(lines[-1]) - 3
-                elif tid == 'eol_cont':
+        while loc < code_len:
+            span_start = loc
+            col = loc - line_start
+            curline = lineno
+            curline_start = line_start
+            mo = match(code, loc)
+            if mo is None:
+                raise ParseException(f'lexer: unrecognized token {code[loc]!r}', self.getline(line_start), lineno, col)
+            tid = mo.lastgroup
+            value = mo.group()
+            loc = mo.end()
+
+            if tid == 'single':
+                # lex single characters and raise an exception for invalid tokens
+                tid = self.single_char_tokens[value]
+                if tid == 'lparen':
+                    par_count += 1
+                elif tid == 'rparen':
+                    par_count -= 1
+                elif tid == 'lbracket':
+                    bracket_count += 1
+                elif tid == 'rbracket':
+                    bracket_count -= 1
+                elif tid == 'lcurl':
+                    curl_count += 1
+                elif tid == 'rcurl':
+                    curl_count -= 1
+                elif tid == 'dblquote':
+                    raise ParseException('Double quotes are not supported. Use single quotes.', self.getline(line_start), lineno, col)
+                elif tid == 'eol':
                     lineno += 1
                     line_start = loc
-                    tid = 'whitespace'
-                bytespan = (span_start, loc)
-                yield Token(tid, filename, curline_start, curline, col, bytespan, value)
-
-        except KeyError:
-            raise ParseException(f'lexer: unrecognized token {self.code[loc]!r}', self.getline(line_start), lineno, loc - line_start)
-
-@dataclass
+                    if par_count > 0 or bracket_count > 0 or curl_count > 0:
+                        tid = 'whitespace'
+            elif tid == 'id':
+                if value in self.keywords:
+                    tid = value
+                else:
+                    if value in self.future_keywords:
+                        mlog.warning(f"Identifier '{value}' will become a reserved keyword in a future release. Please rename it.",
+                                     location=BaseNode(lineno, col, filename))
+            elif tid in {'string', 'fstring'}:
+                if value.find("\n") != -1:
+                    msg = ("Newline character in a string detected, use ''' (three single quotes) "
+                           "for multiline strings instead.\n"
+                           "This will become a hard error in a future Meson release.")
+                    mlog.warning(mlog.code_line(msg, self.getline(line_start), col), location=BaseNode(lineno, col, filename))
+                value = value[2 if tid == 'fstring' else 1:-1]
+            elif tid in {'multiline_string', 'multiline_fstring'}:
+                value = value[4 if tid == 'multiline_fstring' else 3:-3]
+                lines = value.split('\n')
+                if len(lines) > 1:
+                    lineno += len(lines) - 1
+                    line_start = loc - len(lines[-1]) - 3
+            elif tid == 'eol_cont':
+                lineno += 1
+                line_start = loc
+                tid = 'whitespace'
+            yield Token(tid, filename, curline_start, curline, col, (span_start, loc), value)
+
+@dataclass(slots=True)
 class BaseNode:
     lineno: int
     colno: int
@@ -242,6 +245,11 @@ class BaseNode:
     end_colno: int = field(hash=False)
     whitespaces: T.Optional[WhitespaceNode] = field(hash=False)
 
+    # Attributes for the visitors
+    level: int = field(hash=False, compare=False, repr=False)
+    ast_id: str = field(hash=False, compare=False, repr=False)
+    condition_level: int = field(hash=False, compare=False, repr=False)
+
     def __init__(self, lineno: int, colno: int, filename: str,
                  end_lineno: T.Optional[int] = None, end_colno: T.Optional[int] = None) -> None:
         self.lineno = lineno
@@ -270,13 +278,15 @@ class BaseNode:
             self.whitespaces.append(token)
 
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class WhitespaceNode(BaseNode):
 
     value: str
+    block_indent: bool = field(hash=False, compare=False, repr=False)
+    is_continuation: bool = field(hash=False, compare=False, repr=False)
 
     def __init__(self, token: Token[str]):
-        super().__init__(token.lineno, token.colno, token.filename)
+        BaseNode.__init__(self, token.lineno, token.colno, token.filename)
         self.value = ''
         self.append(token)
         self.block_indent = False
@@ -285,24 +295,24 @@ class WhitespaceNode(BaseNode):
     def append(self, token: Token[str]) -> None:
         self.value += token.value
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ElementaryNode(T.Generic[TV_TokenTypes], BaseNode):
 
     value: TV_TokenTypes
     bytespan: T.Tuple[int, int] = field(hash=False)
 
     def __init__(self, token: Token[TV_TokenTypes]):
-        super().__init__(token.lineno, token.colno, token.filename)
+        BaseNode.__init__(self, token.lineno, token.colno, token.filename)
         self.value = token.value
         self.bytespan = token.bytespan
 
 class BooleanNode(ElementaryNode[bool]):
-    pass
+    __slots__ = ()
 
 class IdNode(ElementaryNode[str]):
-    pass
+    __slots__ = ()
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class NumberNode(ElementaryNode[int]):
 
     raw_value: str = field(hash=False)
@@ -313,7 +323,7 @@ class NumberNode(ElementaryNode[int]):
         self.value = int(token.value, base=0)
         self.bytespan = token.bytespan
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class StringNode(ElementaryNode[str]):
 
     raw_value: str = field(hash=False)
@@ -321,7 +331,7 @@ class StringNode(ElementaryNode[str]):
     is_fstring: bool
 
     def __init__(self, token: Token[str], escape: bool = True):
-        super().__init__(token)
+        ElementaryNode.__init__(self, token)
 
         self.is_multiline = 'multiline' in token.tid
         self.is_fstring = 'fstring' in token.tid
@@ -334,24 +344,26 @@ class StringNode(ElementaryNode[str]):
         return ESCAPE_SEQUENCE_SINGLE_RE.sub(decode_match, self.raw_value)
 
 class ContinueNode(ElementaryNode):
-    pass
+    __slots__ = ()
 
 class BreakNode(ElementaryNode):
-    pass
+    __slots__ = ()
 
 class SymbolNode(ElementaryNode[str]):
-    pass
+    __slots__ = ()
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ArgumentNode(BaseNode):
 
     arguments: T.List[BaseNode] = field(hash=False)
     commas: T.List[SymbolNode] = field(hash=False)
     colons: T.List[SymbolNode] = field(hash=False)
     kwargs: T.Dict[BaseNode, BaseNode] = field(hash=False)
+    order_error: bool = field(hash=False, compare=False, repr=False)
+    is_multiline: bool = field(hash=False, compare=False, repr=False)
 
     def __init__(self, token: Token[TV_TokenTypes]):
-        super().__init__(token.lineno, token.colno, token.filename)
+        BaseNode.__init__(self, token.lineno, token.colno, token.filename)
         self.arguments = []
         self.commas = []
         self.colons = []
@@ -401,7 +413,7 @@ class ArgumentNode(BaseNode):
     def __len__(self) -> int:
         return self.num_args() + self.num_kwargs()
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ArrayNode(BaseNode):
 
     lbracket: SymbolNode
@@ -409,12 +421,12 @@ class ArrayNode(BaseNode):
     rbracket: SymbolNode
 
     def __init__(self, lbracket: SymbolNode, args: ArgumentNode, rbracket: SymbolNode):
-        super().__init__(lbracket.lineno, lbracket.colno, args.filename, end_lineno=rbracket.lineno, end_colno=rbracket.colno+1)
+        BaseNode.__init__(self, lbracket.lineno, lbracket.colno, args.filename, end_lineno=rbracket.lineno, end_colno=rbracket.colno+1)
         self.lbracket = lbracket
         self.args = args
         self.rbracket = rbracket
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class DictNode(BaseNode):
 
     lcurl: SymbolNode
@@ -422,15 +434,15 @@ class DictNode(BaseNode):
     rcurl: SymbolNode
 
     def __init__(self, lcurl: SymbolNode, args: ArgumentNode, rcurl: SymbolNode):
-        super().__init__(lcurl.lineno, lcurl.colno, args.filename, end_lineno=rcurl.lineno, end_colno=rcurl.colno+1)
+        BaseNode.__init__(self, lcurl.lineno, lcurl.colno, args.filename, end_lineno=rcurl.lineno, end_colno=rcurl.colno+1)
         self.lcurl = lcurl
         self.args = args
         self.rcurl = rcurl
 
 class EmptyNode(BaseNode):
-    pass
+    __slots__ = ()
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class BinaryOperatorNode(BaseNode):
 
     left: BaseNode
@@ -438,60 +450,60 @@ class BinaryOperatorNode(BaseNode):
     right: BaseNode
 
     def __init__(self, left: BaseNode, operator: SymbolNode, right: BaseNode):
-        super().__init__(left.lineno, left.colno, left.filename)
+        BaseNode.__init__(self, left.lineno, left.colno, left.filename)
         self.left = left
         self.operator = operator
         self.right = right
 
 class OrNode(BinaryOperatorNode):
-    pass
+    __slots__ = ()
 
 class AndNode(BinaryOperatorNode):
-    pass
+    __slots__ = ()
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ComparisonNode(BinaryOperatorNode):
 
     ctype: COMPARISONS
 
     def __init__(self, ctype: COMPARISONS, left: BaseNode, operator: SymbolNode, right: BaseNode):
-        super().__init__(left, operator, right)
+        BinaryOperatorNode.__init__(self, left, operator, right)
         self.ctype = ctype
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ArithmeticNode(BinaryOperatorNode):
 
     operation: ARITH_OPERATORS
 
     def __init__(self, operation: ARITH_OPERATORS, left: BaseNode, operator: SymbolNode, right: BaseNode):
-        super().__init__(left, operator, right)
+        BinaryOperatorNode.__init__(self, left, operator, right)
         self.operation = operation
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class UnaryOperatorNode(BaseNode):
 
     operator: SymbolNode
     value: BaseNode
 
     def __init__(self, token: Token[TV_TokenTypes], operator: SymbolNode, value: BaseNode):
-        super().__init__(token.lineno, token.colno, token.filename)
+        BaseNode.__init__(self, token.lineno, token.colno, token.filename)
         self.operator = operator
         self.value = value
 
 class NotNode(UnaryOperatorNode):
-    pass
+    __slots__ = ()
 
 class UMinusNode(UnaryOperatorNode):
-    pass
+    __slots__ = ()
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class CodeBlockNode(BaseNode):
 
     pre_whitespaces: T.Optional[WhitespaceNode] = field(hash=False)
     lines: T.List[BaseNode] = field(hash=False)
 
     def __init__(self, token: Token[TV_TokenTypes]):
-        super().__init__(token.lineno, token.colno, token.filename)
+        BaseNode.__init__(self, token.lineno, token.colno, token.filename)
         self.pre_whitespaces = None
         self.lines = []
 
@@ -503,7 +515,7 @@ class CodeBlockNode(BaseNode):
         else:
             self.pre_whitespaces.append(token)
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class IndexNode(BaseNode):
 
     iobject: BaseNode
@@ -512,13 +524,13 @@ class IndexNode(BaseNode):
     rbracket: SymbolNode
 
     def __init__(self, iobject: BaseNode, lbracket: SymbolNode, index: BaseNode, rbracket: SymbolNode):
-        super().__init__(iobject.lineno, iobject.colno, iobject.filename)
+        BaseNode.__init__(self, iobject.lineno, iobject.colno, iobject.filename)
         self.iobject = iobject
         self.lbracket = lbracket
         self.index = index
         self.rbracket = rbracket
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class MethodNode(BaseNode):
 
     source_object: BaseNode
@@ -529,7 +541,7 @@ class MethodNode(BaseNode):
     rpar: SymbolNode
 
     def __init__(self, source_object: BaseNode, dot: SymbolNode, name: IdNode, lpar: SymbolNode, args: ArgumentNode, rpar: SymbolNode):
-        super().__init__(name.lineno, name.colno, name.filename, end_lineno=rpar.lineno, end_colno=rpar.colno+1)
+        BaseNode.__init__(self, name.lineno, name.colno, name.filename, end_lineno=rpar.lineno, end_colno=rpar.colno+1)
         self.source_object = source_object
         self.dot = dot
         self.name = name
@@ -537,7 +549,7 @@ class MethodNode(BaseNode):
         self.args = args
         self.rpar = rpar
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class FunctionNode(BaseNode):
 
     func_name: IdNode
@@ -546,13 +558,13 @@ class FunctionNode(BaseNode):
     rpar: SymbolNode
 
     def __init__(self, func_name: IdNode, lpar: SymbolNode, args: ArgumentNode, rpar: SymbolNode):
-        super().__init__(func_name.lineno, func_name.colno, func_name.filename, end_lineno=rpar.end_lineno, end_colno=rpar.end_colno+1)
+        BaseNode.__init__(self, func_name.lineno, func_name.colno, func_name.filename, end_lineno=rpar.end_lineno, end_colno=rpar.end_colno+1)
         self.func_name = func_name
         self.lpar = lpar
         self.args = args
         self.rpar = rpar
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class AssignmentNode(BaseNode):
 
     var_name: IdNode
@@ -560,15 +572,15 @@ class AssignmentNode(BaseNode):
     value: BaseNode
 
     def __init__(self, var_name: IdNode, operator: SymbolNode, value: BaseNode):
-        super().__init__(var_name.lineno, var_name.colno, var_name.filename)
+        BaseNode.__init__(self, var_name.lineno, var_name.colno, var_name.filename)
         self.var_name = var_name
         self.operator = operator
         self.value = value
 
 class PlusAssignmentNode(AssignmentNode):
-    pass
+    __slots__ = ()
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ForeachClauseNode(BaseNode):
 
     foreach_: SymbolNode = field(hash=False)
@@ -580,7 +592,7 @@ class ForeachClauseNode(BaseNode):
     endforeach: SymbolNode = field(hash=False)
 
     def __init__(self, foreach_: SymbolNode, varnames: T.List[IdNode], commas: T.List[SymbolNode], colon: SymbolNode, items: BaseNode, block: CodeBlockNode, endforeach: SymbolNode):
-        super().__init__(foreach_.lineno, foreach_.colno, foreach_.filename)
+        BaseNode.__init__(self, foreach_.lineno, foreach_.colno, foreach_.filename)
         self.foreach_ = foreach_
         self.varnames = varnames
         self.commas = commas
@@ -590,7 +602,7 @@ class ForeachClauseNode(BaseNode):
         self.endforeach = endforeach
 
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class IfNode(BaseNode):
 
     if_: SymbolNode
@@ -598,23 +610,23 @@ class IfNode(BaseNode):
     block: CodeBlockNode
 
     def __init__(self, linenode: BaseNode, if_node: SymbolNode, condition: BaseNode, block: CodeBlockNode):
-        super().__init__(linenode.lineno, linenode.colno, linenode.filename)
+        BaseNode.__init__(self, linenode.lineno, linenode.colno, linenode.filename)
         self.if_ = if_node
         self.condition = condition
         self.block = block
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ElseNode(BaseNode):
 
     else_: SymbolNode
     block: CodeBlockNode
 
     def __init__(self, else_: SymbolNode, block: CodeBlockNode):
-        super().__init__(block.lineno, block.colno, block.filename)
+        BaseNode.__init__(self, block.lineno, block.colno, block.filename)
         self.else_ = else_
         self.block = block
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class IfClauseNode(BaseNode):
 
     ifs: T.List[IfNode] = field(hash=False)
@@ -622,11 +634,11 @@ class IfClauseNode(BaseNode):
     endif: SymbolNode
 
     def __init__(self, linenode: BaseNode):
-        super().__init__(linenode.lineno, linenode.colno, linenode.filename)
+        BaseNode.__init__(self, linenode.lineno, linenode.colno, linenode.filename)
         self.ifs = []
         self.elseblock = EmptyNode(linenode.lineno, linenode.colno, linenode.filename)
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class TestCaseClauseNode(BaseNode):
 
     testcase: SymbolNode
@@ -635,13 +647,13 @@ class TestCaseClauseNode(BaseNode):
     endtestcase: SymbolNode
 
     def __init__(self, testcase: SymbolNode, condition: BaseNode, block: CodeBlockNode, endtestcase: SymbolNode):
-        super().__init__(condition.lineno, condition.colno, condition.filename)
+        BaseNode.__init__(self, condition.lineno, condition.colno, condition.filename)
         self.testcase = testcase
         self.condition = condition
         self.block = block
         self.endtestcase = endtestcase
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class TernaryNode(BaseNode):
 
     condition: BaseNode
@@ -651,7 +663,7 @@ class TernaryNode(BaseNode):
     falseblock: BaseNode
 
     def __init__(self, condition: BaseNode, questionmark: SymbolNode, trueblock: BaseNode, colon: SymbolNode, falseblock: BaseNode):
-        super().__init__(condition.lineno, condition.colno, condition.filename)
+        BaseNode.__init__(self, condition.lineno, condition.colno, condition.filename)
         self.condition = condition
         self.questionmark = questionmark
         self.trueblock = trueblock
@@ -659,7 +671,7 @@ class TernaryNode(BaseNode):
         self.falseblock = falseblock
 
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class ParenthesizedNode(BaseNode):
 
     lpar: SymbolNode = field(hash=False)
@@ -668,7 +680,7 @@ class ParenthesizedNode(BaseNode):
     is_multiline: bool
 
     def __init__(self, lpar: SymbolNode, inner: BaseNode, rpar: SymbolNode):
-        super().__init__(lpar.lineno, lpar.colno, inner.filename, end_lineno=rpar.lineno, end_colno=rpar.colno+1)
+        BaseNode.__init__(self, lpar.lineno, lpar.colno, inner.filename, end_lineno=rpar.lineno, end_colno=rpar.colno+1)
         self.lpar = lpar
         self.inner = inner
         self.rpar = rpar
@@ -719,12 +731,17 @@ MULDIV_MAP: T.Mapping[str, ARITH_OPERATORS] = {
 # 10 plain token
 
 class Parser:
-    def __init__(self, code: str, filename: str, *, machinefile: bool = False):
+    def __init__(self, code: str, filename: str, *, machinefile: bool = False, compact: bool = False):
         self.lexer = Lexer(code, machinefile=machinefile)
         self.stream = self.lexer.lex(filename)
         self.current: Token = Token('eof', '', 0, 0, 0, (0, 0), None)
         self.previous = self.current
         self.current_ws: T.List[Token] = []
+        # A compact tree has no whitespace, and shares its symbol nodes except
+        # where the position of another node is taken from them. It can be
+        # evaluated, but not formatted or rewritten.
+        self.compact = compact
+        self.symbols: T.Dict[str, SymbolNode] = {}
 
         self.getsym()
         self.in_ternary = False
@@ -736,13 +753,23 @@ class Parser:
         self.current_ws = []
         return node
 
+    def create_symbol(self, token: Token) -> SymbolNode:
+        if not self.compact:
+            return self.create_node(SymbolNode, token)
+        try:
+            return self.symbols[token.value]
+        except KeyError:
+            symbol = self.symbols[token.value] = SymbolNode(Token(token.tid, token.filename, 0, 0, 0, (0, 0), token.value))
+            return symbol
+
     def getsym(self) -> None:
         self.previous = self.current
         try:
             self.current = next(self.stream)
 
             while self.current.tid in {'eol', 'comment', 'whitespace'}:
-                self.current_ws.append(self.current)
+                if not self.compact:
+                    self.current_ws.append(self.current)
                 if self.current.tid == 'eol':
                     break
                 self.current = next(self.stream)
@@ -791,14 +818,14 @@ class Parser:
     def e1(self) -> BaseNode:
         left = self.e2()
         if self.accept('plusassign'):
-            operator = self.create_node(SymbolNode, self.previous)
+            operator = self.create_symbol(self.previous)
             value = self.e1()
             if not isinstance(left, IdNode):
                 raise ParseException('Plusassignment target must be an id.', self.getline(), left.lineno, left.colno)
             assert isinstance(left.value, str)
             return self.create_node(PlusAssignmentNode, left, operator, value)
         elif self.accept('assign'):
-            operator = self.create_node(SymbolNode, self.previous)
+            operator = self.create_symbol(self.previous)
             value = self.e1()
             if not isinstance(left, IdNode):
                 raise ParseException('Assignment target must be an id.',
@@ -810,11 +837,11 @@ class Parser:
                 raise ParseException('Nested ternary operators are not allowed.',
                                      self.getline(), left.lineno, left.colno)
 
-            qm_node = self.create_node(SymbolNode, self.previous)
+            qm_node = self.create_symbol(self.previous)
             self.in_ternary = True
             trueblock = self.e1()
             self.expect('colon')
-            colon_node = self.create_node(SymbolNode, self.previous)
+            colon_node = self.create_symbol(self.previous)
             falseblock = self.e1()
             self.in_ternary = False
             return self.create_node(TernaryNode, left, qm_node, trueblock, colon_node, falseblock)
@@ -823,7 +850,7 @@ class Parser:
     def e2(self) -> BaseNode:
         left = self.e3()
         while self.accept('or'):
-            operator = self.create_node(SymbolNode, self.previous)
+            operator = self.create_symbol(self.previous)
             if isinstance(left, EmptyNode):
                 raise ParseException('Invalid or clause.',
                                      self.getline(), left.lineno, left.colno)
@@ -833,7 +860,7 @@ class Parser:
     def e3(self) -> BaseNode:
         left = self.e4()
         while self.accept('and'):
-            operator = self.create_node(SymbolNode, self.previous)
+            operator = self.create_symbol(self.previous)
             if isinstance(left, EmptyNode):
                 raise ParseException('Invalid and clause.',
                                      self.getline(), left.lineno, left.colno)
@@ -844,7 +871,7 @@ class Parser:
         left = self.e5()
         op = self.accept_any(COMPARISON_MAP)
         if op:
-            operator = self.create_node(SymbolNode, self.previous)
+            operator = self.create_symbol(self.previous)
             return self.create_node(ComparisonNode, COMPARISON_MAP[op], left, operator, self.e5())
         if self.accept('not'):
             ws = self.current_ws.copy()
@@ -852,13 +879,10 @@ class Parser:
             if self.accept('in'):
                 in_token = self.previous
                 self.current_ws = self.current_ws[len(ws):]  # remove whitespaces between not and in
-                temp_node = EmptyNode(in_token.lineno, in_token.colno, in_token.filename)
-                for w in ws:
-                    temp_node.append_whitespaces(w)
 
                 not_token.bytespan = (not_token.bytespan[0], in_token.bytespan[1])
-                not_token.value += temp_node.whitespaces.value + in_token.value
-                operator = self.create_node(SymbolNode, not_token)
+                not_token.value += ''.join(w.value for w in ws) + in_token.value
+                operator = self.create_symbol(not_token)
                 return self.create_node(ComparisonNode, 'not in', left, operator, self.e5())
         return left
 
@@ -867,7 +891,7 @@ class Parser:
         while True:
             op = self.accept_any(ADDSUB_MAP)
             if op:
-                operator = self.create_node(SymbolNode, self.previous)
+                operator = self.create_symbol(self.previous)
                 left = self.create_node(ArithmeticNode, ADDSUB_MAP[op], left, operator, self.e6())
             else:
                 break
@@ -878,7 +902,7 @@ class Parser:
         while True:
             op = self.accept_any(MULDIV_MAP)
             if op:
-                operator = self.create_node(SymbolNode, self.previous)
+                operator = self.create_symbol(self.previous)
                 left = self.create_node(ArithmeticNode, MULDIV_MAP[op], left, operator, self.e7())
             else:
                 break
@@ -886,10 +910,10 @@ class Parser:
 
     def e7(self) -> BaseNode:
         if self.accept('not'):
-            operator = self.create_node(SymbolNode, self.previous)
+            operator = self.create_symbol(self.previous)
             return self.create_node(NotNode, self.current, operator, self.e8())
         if self.accept('dash'):
-            operator = self.create_node(SymbolNode, self.previous)
+            operator = self.create_symbol(self.previous)
             return self.create_node(UMinusNode, self.current, operator, self.e8())
         return self.e8()
 
@@ -897,7 +921,7 @@ class Parser:
         left = self.e9()
         block_start = self.current
         if self.accept('lparen'):
-            lpar = self.create_node(SymbolNode, block_start)
+            lpar = self.create_symbol(block_start)
             args = self.args()
             self.block_expect('rparen', block_start)
             rpar = self.create_node(SymbolNode, self.previous)
@@ -962,11 +986,11 @@ class Parser:
 
         while not isinstance(s, EmptyNode):
             if self.accept('colon'):
-                a.colons.append(self.create_node(SymbolNode, self.previous))
+                a.colons.append(self.create_symbol(self.previous))
                 a.set_kwarg_no_check(s, self.statement())
                 if not self.accept('comma'):
                     return a
-                a.commas.append(self.create_node(SymbolNode, self.previous))
+                a.commas.append(self.create_symbol(self.previous))
             else:
                 raise ParseException('Only key:value pairs are valid in dict construction.',
                                      self.getline(), s.lineno, s.colno)
@@ -979,17 +1003,17 @@ class Parser:
 
         while not isinstance(s, EmptyNode):
             if self.accept('comma'):
-                a.commas.append(self.create_node(SymbolNode, self.previous))
+                a.commas.append(self.create_symbol(self.previous))
                 a.append(s)
             elif self.accept('colon'):
-                a.colons.append(self.create_node(SymbolNode, self.previous))
+                a.colons.append(self.create_symbol(self.previous))
                 if not isinstance(s, IdNode):
                     raise ParseException('Dictionary key must be a plain identifier.',
                                          self.getline(), s.lineno, s.colno)
                 a.set_kwarg(s, self.statement())
                 if not self.accept('comma'):
                     return a
-                a.commas.append(self.create_node(SymbolNode, self.previous))
+                a.commas.append(self.create_symbol(self.previous))
             else:
                 a.append(s)
                 return a
@@ -997,7 +1021,7 @@ class Parser:
         return a
 
     def method_call(self, source_object: BaseNode) -> MethodNode:
-        dot = self.create_node(SymbolNode, self.previous)
+        dot = self.create_symbol(self.previous)
         methodname = self.e10()
         if not isinstance(methodname, IdNode):
             if isinstance(source_object, NumberNode) and isinstance(methodname, NumberNode):
@@ -1007,7 +1031,7 @@ class Parser:
                                  self.getline(), self.current.lineno, self.current.colno)
         assert isinstance(methodname.value, str)
         self.expect('lparen')
-        lpar = self.create_node(SymbolNode, self.previous)
+        lpar = self.create_symbol(self.previous)
         args = self.args()
         rpar = self.create_node(SymbolNode, self.current)
         self.expect('rparen')
@@ -1017,10 +1041,10 @@ class Parser:
         return method
 
     def index_call(self, source_object: BaseNode) -> IndexNode:
-        lbracket = self.create_node(SymbolNode, self.previous)
+        lbracket = self.create_symbol(self.previous)
         index_statement = self.statement()
         self.expect('rbracket')
-        rbracket = self.create_node(SymbolNode, self.previous)
+        rbracket = self.create_symbol(self.previous)
         return self.create_node(IndexNode, source_object, lbracket, index_statement, rbracket)
 
     def foreachblock(self) -> ForeachClauseNode:
@@ -1031,20 +1055,20 @@ class Parser:
         commas = []
 
         if self.accept('comma'):
-            commas.append(self.create_node(SymbolNode, self.previous))
+            commas.append(self.create_symbol(self.previous))
             self.expect('id')
             assert isinstance(self.previous.value, str)
             varnames.append(self.create_node(IdNode, self.previous))
 
         self.expect('colon')
-        colon = self.create_node(SymbolNode, self.previous)
+        colon = self.create_symbol(self.previous)
         items = self.statement()
         block = self.codeblock()
-        endforeach = self.create_node(SymbolNode, self.current)
+        endforeach = self.create_symbol(self.current)
         return self.create_node(ForeachClauseNode, foreach_, varnames, commas, colon, items, block, endforeach)
 
     def ifblock(self) -> IfClauseNode:
-        if_node = self.create_node(SymbolNode, self.previous)
+        if_node = self.create_symbol(self.previous)
         condition = self.statement()
         clause = self.create_node(IfClauseNode, condition)
         self.expect('eol')
@@ -1052,12 +1076,12 @@ class Parser:
         clause.ifs.append(self.create_node(IfNode, clause, if_node, condition, block))
         self.elseifblock(clause)
         clause.elseblock = self.elseblock()
-        clause.endif = self.create_node(SymbolNode, self.current)
+        clause.endif = self.create_symbol(self.current)
         return clause
 
     def elseifblock(self, clause: IfClauseNode) -> None:
         while self.accept('elif'):
-            elif_ = self.create_node(SymbolNode, self.previous)
+            elif_ = self.create_symbol(self.previous)
             s = self.statement()
             self.expect('eol')
             b = self.codeblock()
@@ -1065,14 +1089,14 @@ class Parser:
 
     def elseblock(self) -> T.Union[ElseNode, EmptyNode]:
         if self.accept('else'):
-            else_ = self.create_node(SymbolNode, self.previous)
+            else_ = self.create_symbol(self.previous)
             self.expect('eol')
             block = self.codeblock()
             return ElseNode(else_, block)
         return EmptyNode(self.current.lineno, self.current.colno, self.current.filename)
 
     def testcaseblock(self) -> TestCaseClauseNode:
-        testcase = self.create_node(SymbolNode, self.previous)
+        testcase = self.create_symbol(self.previous)
         condition = self.statement()
         self.expect('eol')
         block = self.codeblock()
@@ -4,12 +4,12 @@
 
 from __future__ import annotations
 
-import argparse, datetime, glob, json, os, platform, shutil, sys, tempfile, time
+import argparse, datetime, glob, json, os, pickle, platform, shutil, sys, tempfile, time
 import cProfile as profile
 from pathlib import Path
 import typing as T
 
-from . import build, cmdline, coredata, environment, interpreter, mesonlib, mintro, mlog
+from . import build, cmdline, coredata, environment, interpreter, mesonlib, mintro, mlog, profiling
 from .dependencies import Dependency
 from .mesonlib import MesonException, MachineChoice
 from .interpreterbase import ObjectHolder
@@ -24,10 +24,13 @@ if T.TYPE_CHECKING:
     class CMDOptions(SharedCMDOptions, Protocol):
 
         profile: bool
+        profile_configure: T.Optional[str]
         fatal_warnings: bool
         reconfigure: bool
         wipe: bool
         clearcache: bool
+        revalidate_toolchains: bool
+        only_if_changed: bool
         builddir: str
         sourcedir: str
         pager: bool
@@ -63,6 +66,9 @@ def add_arguments(parser: argparse.ArgumentParser) -> None:
                         version=coredata.version)
     parser.add_argument('--profile-self', action='store_true', dest='profile',
                         help=argparse.SUPPRESS)
+    parser.add_argument('--profile-configure', metavar='FILE', default=None,
+                        help='Write a trace of where configuring the project spends its time '
+                             'to FILE, in the Chrome trace event format. Since 1.13.0.')
     parser.add_argument('--fatal-meson-warnings', action='store_true', dest='fatal_warnings',
                         help='Make all Meson warnings fatal')
     parser.add_argument('--reconfigure', action='store_true',
@@ -75,6 +81,12 @@ def add_arguments(parser: argparse.ArgumentParser) -> None:
                              'newer version of meson.')
     parser.add_argument('--clearcache', action='store_true', default=False,
                         help='Clear cached state (e.g. found dependencies). Since 1.3.0.')
+    parser.add_argument('--revalidate-toolchains', action='store_true', default=False,
+                        help='Run compiler sanity checks even if the persistent toolchain '
+                             'cache records that they passed before. Since 1.13.0.')
+    # Used when regenerating from the backend, see MesonApp.build_files_changed()
+    parser.add_argument('--only-if-changed', action='store_true', default=False,
+                        help=argparse.SUPPRESS)
     parser.add_argument('builddir', nargs='?', default=None)
     parser.add_argument('sourcedir', nargs='?', default=None)
 
@@ -189,11 +201,61 @@ class MesonApp:
 
     # See class Backend's 'generate' for comments on capture args and returned dictionary.
     def generate(self, capture: bool = False, vslite_ctx: T.Optional[dict] = None) -> T.Optional[dict]:
+        if self.options.only_if_changed and not self.build_files_changed():
+            return None
+        if not self.options.profile_configure:
+            return self._setup_and_generate(capture, vslite_ctx)
+        trace_file = os.path.abspath(self.options.profile_configure)
+        profiling.start()
+        try:
+            with profiling.span('meson setup', 'setup'):
+                return self._setup_and_generate(capture, vslite_ctx)
+        finally:
+            # Failing to write the trace must not hide a configure error
+            try:
+                profiling.stop(trace_file)
+            except OSError as e:
+                mlog.warning(f'Could not write configure trace to {trace_file}: {e.strerror}', fatal=False)
+            else:
+                mlog.log('Configure trace written to', mlog.bold(trace_file))
+
+    def build_files_changed(self) -> bool:
+        '''Whether the files that the build definition depends on have changed.
+
+        The backend regenerates when one of these files is newer than the
+        generated build files, which also happens when it was only touched,
+        e.g. by switching git branches back and forth. In that case the
+        generated files are marked up to date instead of configuring again.
+        '''
+        from .backend.backends import RegenInfo
+        regeninfo_file = os.path.join(self.build_dir, environment.Environment.private_dir, 'regeninfo.dump')
+        try:
+            with open(regeninfo_file, 'rb') as f:
+                regeninfo = pickle.load(f)
+            if not isinstance(regeninfo, RegenInfo):
+                return True
+            changed = regeninfo.changed_depfiles()
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            return True
+        if changed:
+            # Any change configures the whole project again, the
+            # interpreter can't evaluate only the changed subdirs
+            mlog.log('Build files changed:', ', '.join(changed))
+            return True
+        mlog.log('Build files have not changed, regeneration is not needed.')
+        # The Visual Studio and Xcode backends compare against the dump itself
+        for f in [regeninfo_file, os.path.join(self.build_dir, 'build.ninja')]:
+            if os.path.exists(f):
+                os.utime(f)
+        return False
+
+    def _setup_and_generate(self, capture: bool, vslite_ctx: T.Optional[dict]) -> T.Optional[dict]:
         env = environment.Environment(self.source_dir, self.build_dir, self.options)
         if not env.first_invocation:
             assert self.options.reconfigure
             env.coredata.set_from_configure_command(self.options)
         mlog.initialize(env.get_log_dir(), self.options.fatal_warnings)
+        env.revalidate_toolchains = self.options.revalidate_toolchains
         if self.options.profile:
             mlog.set_timestamp_start(time.monotonic())
         if self.options.clearcache:
@@ -263,7 +325,8 @@ class MesonApp:
                 fname = os.path.join(self.build_dir, 'meson-logs', 'profile-interpreter.log')
                 profile.runctx('intr.run()', globals(), locals(), filename=fname)
             else:
-                intr.run()
+                with profiling.span('interpreter', 'interpreter'):
+                    intr.run()
         except Exception as e:
             mintro.write_meson_info_file(b, [e])
             raise
@@ -292,7 +355,8 @@ class MesonApp:
                 captured_compile_args = localvars['gen_result']
                 assert captured_compile_args is None or isinstance(captured_compile_args, dict)
             else:
-                captured_compile_args = intr.backend.generate(capture, vslite_ctx)
+                with profiling.span(f'{intr.backend.name} backend', 'backend'):
+                    captured_compile_args = intr.backend.generate(capture, vslite_ctx)
 
             build.save(b, dumpfile)
             if env.first_invocation:
@@ -13,7 +13,9 @@ import argparse
 import asyncio
 import datetime
 import enum
+import hashlib
 import json
+import math
 import os
 import pickle
 import platform
@@ -35,7 +37,7 @@ from .coredata import MesonVersionMismatchException, major_versions_differ
 from .coredata import version as coredata_version
 from .mesonlib import (MesonException, OrderedSet, RealPathAction,
                        get_wine_shortpath, join_args, split_args, setup_vsenv,
-                       determine_worker_count)
+                       determine_worker_count, path_is_in_root, quiet_git)
 from .options import OptionKey
 from .programs import ExternalProgram
 from .backend.backends import TestProtocol, TestSerialisation
@@ -124,6 +126,22 @@ def test_slice(arg: str) -> T.Tuple[int, int]:
 
     return subslice, nrslices
 
+def test_resource(arg: str) -> T.Tuple[str, int]:
+    name, sep, amount = arg.partition('=')
+    if not name or not sep:
+        raise argparse.ArgumentTypeError("value does not conform to format 'NAME=AMOUNT'")
+    if name == 'cpu':
+        raise argparse.ArgumentTypeError('the amount of cpu is set with --num-processes')
+
+    try:
+        value = int(amount)
+    except ValueError:
+        raise argparse.ArgumentTypeError('AMOUNT is not an integer')
+    if value <= 0:
+        raise argparse.ArgumentTypeError('AMOUNT is not a positive integer')
+
+    return name, value
+
 # Note: when adding arguments, please also add them to the completion
 # scripts in $MESONSRC/data/shell-completions/
 def add_arguments(parser: argparse.ArgumentParser) -> None:
@@ -178,11 +196,62 @@ def add_arguments(parser: argparse.ArgumentParser) -> None:
                         help='Maximum number of lines to show from a long test log. Since 1.5.0.')
     parser.add_argument('--slice', default=None, type=test_slice, metavar='SLICE/NUM_SLICES',
                         help='Split tests into NUM_SLICES slices and execute slice SLICE. Since 1.8.0.')
+    parser.add_argument('--slice-strategy', default='index', choices=['index', 'duration'],
+                        help='How tests are split into slices: every NUM_SLICES-th test, or into slices that '
+                        'take about as long according to the test durations given with --durations-from '
+                        '(default: %(default)s). Since 1.13.0.')
+    parser.add_argument('--durations-from', default=[], action='append', metavar='LOGFILE',
+                        help='JSON test log to take test durations from, instead of the log of the previous '
+                        'run. Can be given multiple times, and is required by --slice-strategy=duration. '
+                        'Since 1.13.0.')
+    parser.add_argument('--changed-since', default=None, metavar='STAMP|REV',
+                        help='Only run the tests whose programs, dependencies or any of their inputs changed '
+                        'since the file STAMP was modified or, if there is no such file, since the git '
+                        'revision REV of the source tree. Since 1.13.0.')
+    parser.add_argument('--cached', default=False, action='store_true',
+                        help='Do not run tests that passed before with the same programs, arguments, '
+                        'environment, dependencies and working directory, and report them as passed. '
+                        'Since 1.13.0.')
+    parser.add_argument('--merge-logs', default=False, action='store_true',
+                        help='Merge the JSON and JUnit test logs given as arguments, for example those of '
+                        'the slices of a test run, instead of running tests. Since 1.13.0.')
+    parser.add_argument('--schedule', default='history', choices=['history', 'declared'],
+                        help='Order in which tests of the same priority are started: longest first according to '
+                        'the previous test log, or in the order they are declared (default: %(default)s). Since 1.13.0.')
+    parser.add_argument('--resource', default=[], dest='resources', action='append', type=test_resource,
+                        metavar='NAME=AMOUNT',
+                        help='Amount of a resource that is shared by the tests declaring they need it. '
+                        'Resources that are not given have an amount of 1. Since 1.13.0.')
     parser.add_argument('args', nargs='*',
                         help='Optional list of test names to run. "testname" to run all tests with that name, '
                         '"subprojname:testname" to specifically run "testname" from "subprojname", '
                         '"subprojname:" to run all tests defined by "subprojname".')
 
+def load_test_durations(filenames: T.Iterable[str]) -> T.Dict[str, float]:
+    '''Read how long each test took from JSON test logs.
+
+    Tests that ran several times keep their longest duration. Missing or
+    unreadable logs give no durations.
+    '''
+    durations: T.Dict[str, float] = {}
+    for filename in filenames:
+        try:
+            with open(filename, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                        name = result['name']
+                        duration = float(result['duration'])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if result.get('cached'):
+                        # Took no time because it did not run
+                        continue
+                    durations[name] = max(duration, durations.get(name, 0.0))
+        except OSError:
+            pass
+    return durations
+
 def print_safe(s: str) -> None:
     end = '' if s[-1] == '\n' else '\n'
     try:
@@ -816,6 +885,8 @@ class JsonLogfileBuilder(TestFileLogger):
         }
         if result.stde:
             jresult['stderr'] = result.stde
+        if result.cached:
+            jresult['cached'] = True
         self.file.write(json.dumps(jresult) + '\n')
 
 
@@ -999,6 +1070,7 @@ class TestRun:
         self.verbose = verbose
         self.interactive = interactive
         self.warnings: T.List[str] = []
+        self.cached = False
 
     def start(self, cmd: T.List[str]) -> None:
         self.res = TestResult.RUNNING
@@ -1042,6 +1114,8 @@ class TestRun:
     def get_details(self) -> str:
         if self.res is TestResult.PENDING:
             return ''
+        if self.cached:
+            return 'cached'
         if self.returncode:
             return self.get_exit_status()
         return self.get_results()
@@ -1077,6 +1151,14 @@ class TestRun:
     def complete(self) -> None:
         self._complete()
 
+    def complete_cached(self, entry: T.Dict[str, T.Any]) -> None:
+        self.cached = True
+        self.res = TestResult(entry['result'])
+        self.returncode = entry['returncode']
+        self.stdo = entry['stdout']
+        self.stde = entry['stderr']
+        self._complete()
+
     def get_log(self, colorize: bool = False, stderr_only: bool = False) -> str:
         stdo = '' if stderr_only else self.stdo
         if self.stde or self.additional_error:
@@ -1352,6 +1434,203 @@ async def complete_all(futures: T.Iterable[asyncio.Future],
     check_futures(futures)
 
 
+class TestResources:
+    """Amounts of resources shared by the running tests.
+
+    The job slots are the resource "cpu", of which every test needs at least
+    one. Other resources have an amount of 1 unless one is given, so that
+    tests needing them run one at a time. Tests that need more than there is
+    get all of it.
+
+    Tests start in the order they are queued in, but a test can start before
+    tests queued earlier if it doesn't need anything they are waiting for.
+    """
+
+    def __init__(self, amounts: T.Dict[str, int]) -> None:
+        self.amounts = amounts
+        self.available = dict(amounts)
+        self.waiting: T.Deque[T.Tuple[T.Dict[str, int], asyncio.Future]] = deque()
+
+    def get_needs(self, resources: T.Dict[str, int]) -> T.Dict[str, int]:
+        needs = {'cpu': 1}
+        for name, amount in resources.items():
+            if amount > 0:
+                if name not in self.amounts:
+                    self.amounts[name] = self.available[name] = 1
+                needs[name] = min(amount, self.amounts[name])
+        return needs
+
+    async def acquire(self, resources: T.Dict[str, int]) -> T.Dict[str, int]:
+        """Wait until the resources a test needs are available and take them.
+
+        Returns what has to be given back with release().
+        """
+        needs = self.get_needs(resources)
+        entry = (needs, asyncio.get_running_loop().create_future())
+        self.waiting.append(entry)
+        self.start_waiting()
+        try:
+            await entry[1]
+        except asyncio.CancelledError:
+            if entry[1].cancelled():
+                self.waiting.remove(entry)
+                self.start_waiting()
+            else:
+                self.release(needs)
+            raise
+        return needs
+
+    def release(self, needs: T.Dict[str, int]) -> None:
+        for name, amount in needs.items():
+            self.available[name] += amount
+        self.start_waiting()
+
+    def start_waiting(self) -> None:
+        # Resources an earlier test waits for, which later ones can't take
+        blocked: T.Set[str] = set()
+        for entry in list(self.waiting):
+            if not self.available['cpu']:
+                break
+            needs, future = entry
+            if future.done():
+                continue
+            lacking = {name for name, amount in needs.items() if self.available[name] < amount}
+            if lacking or not blocked.isdisjoint(needs):
+                blocked |= lacking
+                continue
+            for name, amount in needs.items():
+                self.available[name] -= amount
+            self.waiting.remove(entry)
+            future.set_result(None)
+
+
+class TestCache:
+    """Results of tests that passed, and what they ran with.
+
+    A test is expected to pass again if its command, the environment that
+    the test and the test setup define, the outputs of the targets it
+    depends on, directly or not, and the contents of its working directory
+    are the same. Files are hashed by content, the environment inherited
+    from the caller is not taken into account. A working directory in the
+    build directory only has build outputs and what tests wrote, so its
+    contents are not taken into account either.
+
+    Only the latest result of each test is kept.
+    """
+
+    VERSION = 1
+
+    # Version control directories in the working directory, which change
+    # without affecting the test
+    IGNORED_DIRS = {'.git', '.hg', '.svn'}
+
+    def __init__(self, filename: str, wd: str) -> None:
+        self.filename = filename
+        self.wd = wd
+        self.entries: T.Dict[str, T.Dict[str, T.Any]] = {}
+        self.file_hashes: T.Dict[str, T.Tuple[T.Tuple[int, int], str]] = {}
+        try:
+            with open(filename, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data['results']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        targets_file = os.path.join(wd, 'meson-info', 'intro-targets.json')
+        with open(targets_file, encoding='utf-8') as fp:
+            self.targets = {t['id']: t for t in json.load(fp)}
+
+    def hash_file(self, path: str) -> T.Optional[str]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self.file_hashes.get(path)
+        if cached is None or cached[0] != stamp:
+            h = hashlib.sha256()
+            try:
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        h.update(chunk)
+            except OSError:
+                return None
+            cached = self.file_hashes[path] = (stamp, h.hexdigest())
+        return cached[1]
+
+    def hash_dir(self, path: str, exclude: T.Set[str]) -> T.List[T.Tuple[str, T.Optional[str]]]:
+        contents: T.List[T.Tuple[str, T.Optional[str]]] = []
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in self.IGNORED_DIRS
+                             and os.path.join(root, d) not in exclude)
+            for f in sorted(files):
+                fname = os.path.join(root, f)
+                if fname not in exclude:
+                    contents.append((os.path.relpath(fname, path), self.hash_file(fname)))
+        return contents
+
+    def get_dependency_outputs(self, test: TestSerialisation) -> T.List[str]:
+        seen: T.Set[str] = set()
+        todo = list(test.depends)
+        while todo:
+            tid = todo.pop()
+            if tid not in seen and tid in self.targets:
+                seen.add(tid)
+                todo.extend(self.targets[tid].get('depends', []))
+        return sorted(f for tid in seen for f in self.targets[tid]['filename'])
+
+    def get_key(self, run: TestRun) -> str:
+        test = run.test
+        cmd = run.cmd or []
+        workdir = test.workdir or self.wd
+        files = [f for f in cmd if os.path.isfile(f)]
+        files += [os.path.join(workdir, a) for a in test.cmd_args if os.path.isfile(os.path.join(workdir, a))]
+        files += self.get_dependency_outputs(test)
+        env = {k: v for k, v in run.env.items()
+               # MALLOC_PERTURB_ is random in every run
+               if os.environ.get(k) != v and k != 'MALLOC_PERTURB_'}
+        contents: T.List[T.Tuple[str, T.Optional[str]]] = []
+        if test.workdir and not path_is_in_root(Path(test.workdir), Path(self.wd), resolve=True):
+            # Neither the build directory, where all logs are, nor what
+            # meson test itself writes into the working directory
+            exclude = {self.wd, os.path.join(test.workdir, test.name + '.xml')}
+            contents = self.hash_dir(test.workdir, exclude)
+        data = [run.name, test.protocol.name, cmd, sorted(env.items()), test.workdir,
+                test.expected_fail, test.expected_exitcode,
+                [(f, self.hash_file(f)) for f in files], contents]
+        return hashlib.sha256(json.dumps(data).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_entry_name(run: TestRun) -> str:
+        return '{}:{}'.format(run.env.get('MESON_TEST_ITERATION', '1'), run.name)
+
+    def lookup(self, run: TestRun, key: str) -> T.Optional[T.Dict[str, T.Any]]:
+        entry = self.entries.get(self.get_entry_name(run))
+        if entry is None or entry['key'] != key:
+            return None
+        return entry
+
+    def record(self, run: TestRun, key: str) -> None:
+        name = self.get_entry_name(run)
+        if run.res.is_ok():
+            self.entries[name] = {
+                'key': key,
+                'result': run.res.value,
+                'returncode': run.returncode,
+                'stdout': run.stdo,
+                'stderr': run.stde,
+            }
+        else:
+            self.entries.pop(name, None)
+
+    def save(self) -> None:
+        tempfilename = self.filename + '~'
+        with open(tempfilename, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'results': self.entries}, f)
+        os.replace(tempfilename, self.filename)
+
+
 class TestSubprocess:
     def __init__(self, p: asyncio.subprocess.Process,
                  stdout: T.Optional[int], stderr: T.Optional[int],
@@ -1566,6 +1845,10 @@ class SingleTestRunner:
     def is_parallel(self) -> bool:
         return self.runobj.is_parallel
 
+    @property
+    def resources(self) -> T.Dict[str, int]:
+        return self.test.resources
+
     @property
     def visible_name(self) -> str:
         return self.runobj.name
@@ -1582,8 +1865,16 @@ class SingleTestRunner:
         else:
             cmd = self.cmd + self.test.cmd_args + self.options.test_args
             self.runobj.start(cmd)
+            cache = harness.test_cache if not self.options.interactive else None
+            key = cache.get_key(self.runobj) if cache else None
+            entry = cache.lookup(self.runobj, key) if cache and key else None
             harness.log_start_test(self.runobj)
-            await self._run_cmd(harness, cmd)
+            if entry:
+                self.runobj.complete_cached(entry)
+            else:
+                await self._run_cmd(harness, cmd)
+                if cache and key:
+                    cache.record(self.runobj, key)
         return self.runobj
 
     async def _run_subprocess(self, args: T.List[str], *, stdin: T.Optional[int],
@@ -1686,6 +1977,8 @@ class TestHarness:
         self.loggers.append(self.console_logger)
         self.need_console = False
         self.ninja: T.List[str] = None
+        self.test_durations: T.Optional[T.Dict[str, float]] = None
+        self.test_cache: T.Optional[TestCache] = None
 
         self.logfile_base: T.Optional[str] = None
         if self.options.logbase and not self.options.interactive:
@@ -1743,7 +2036,7 @@ class TestHarness:
                     if ret.returncode != 0:
                         raise TestException(f'Could not configure {self.options.wd!r}')
 
-            self.build_data = build.load(os.getcwd())
+            self.build_data = build.load_index(os.getcwd())
             if not self.options.setup:
                 self.options.setup = self.build_data.test_setup_default_name
             if self.options.benchmark:
@@ -1924,9 +2217,26 @@ class TestHarness:
             # wrapper script.
             sys.exit(125)
 
+        if self.options.changed_since:
+            # The build graph is needed even if nothing is rebuilt
+            ninja = self.ninja or tooldetect.detect_ninja()
+            if not ninja:
+                raise MesonException("Can't find ninja, which --changed-since needs to read the build graph.")
+            tests = ChangedTests(ninja, self.options.wd, self.build_data.environment.source_dir,
+                                 self.options.changed_since).find(tests)
+            if not tests:
+                print(f'No tests affected by changes since {self.options.changed_since}.')
+                return 0
+
+        tests = self.schedule_tests(tests)
         self.name_max_len = max(uniwidth(self.get_pretty_suite(test)) for test in tests)
         self.options.num_processes = min(self.options.num_processes,
                                          len(tests) * self.options.repeat)
+        if self.options.cached and not (self.options.benchmark or self.options.interactive):
+            # Benchmarks measure how long they take, and interactive tests
+            # are run to look at them
+            self.test_cache = TestCache(os.path.join(self.options.wd, 'meson-private', 'meson_test_cache.json'),
+                                        self.options.wd)
         startdir = os.getcwd()
         try:
             os.chdir(self.options.wd)
@@ -1944,6 +2254,8 @@ class TestHarness:
             self.run_tests(runners)
         finally:
             os.chdir(startdir)
+            if self.test_cache:
+                self.test_cache.save()
         return 1 if self.total_failure_count() > 0 else 0
 
     @staticmethod
@@ -2071,7 +2383,10 @@ class TestHarness:
             our_slice, nslices = self.options.slice
             if nslices > len(tests):
                 raise MesonException(f'number of slices ({nslices}) exceeds number of tests ({len(tests)})')
-            tests = tests[our_slice - 1::nslices]
+            if self.options.slice_strategy == 'duration':
+                tests = self.slice_by_duration(tests, our_slice, nslices)
+            else:
+                tests = tests[our_slice - 1::nslices]
 
         if not tests:
             print('No suitable tests defined.', file=errorfile)
@@ -2079,6 +2394,63 @@ class TestHarness:
 
         return tests
 
+    def get_test_durations(self) -> T.Dict[str, float]:
+        '''How long tests took, by default in the previous run, whose log is
+        about to be overwritten.'''
+        if self.test_durations is None:
+            if self.options.durations_from:
+                self.test_durations = load_test_durations(self.options.durations_from)
+            elif self.logfile_base:
+                self.test_durations = load_test_durations([self.logfile_base + '.json'])
+            else:
+                self.test_durations = {}
+        return self.test_durations
+
+    def slice_by_duration(self, tests: T.List[TestSerialisation], our_slice: int, nslices: int) -> T.List[TestSerialisation]:
+        '''Split tests into slices that take about as long.
+
+        Tests are taken longest first and put into the slice with the least
+        work so far. Ties go to the test declared first and to the first
+        slice, so that every machine running a slice computes the same slices
+        from the same durations. The durations are only taken from the logs
+        given with --durations-from, as the log of the previous run differs
+        between machines. Tests without a duration are expected to take as
+        long as the median test.
+        '''
+        durations = load_test_durations(self.options.durations_from)
+        expected: T.List[T.Optional[float]] = [durations.get(self.get_pretty_suite(t)) for t in tests]
+        known = sorted(d for d in expected if d is not None)
+        median = known[len(known) // 2] if known else 1.0
+        costs = [median if d is None else d for d in expected]
+
+        totals = [0.0] * nslices
+        ours: T.List[int] = []
+        for i in sorted(range(len(tests)), key=lambda i: -costs[i]):
+            s = min(range(nslices), key=lambda s: totals[s])
+            totals[s] += costs[i]
+            if s == our_slice - 1:
+                ours.append(i)
+        return [tests[i] for i in sorted(ours)]
+
+    def schedule_tests(self, tests: T.List[TestSerialisation]) -> T.List[TestSerialisation]:
+        '''Order the tests in which they are started.
+
+        Starting the longest tests first keeps a long test declared last from
+        running alone at the end, while all other tests are long done.
+        '''
+        if self.options.schedule == 'declared':
+            return tests
+        durations = self.get_test_durations()
+        if not durations:
+            return tests
+
+        # Priorities still come first. Tests that didn't run before may be
+        # long as well, so they are started before those that did.
+        def key(test: TestSerialisation) -> T.Tuple[int, float]:
+            return (-test.priority, -durations.get(self.get_pretty_suite(test), math.inf))
+
+        return sorted(tests, key=key)
+
     def flush_logfiles(self) -> None:
         for l in self.loggers:
             l.flush()
@@ -2140,7 +2512,7 @@ class TestHarness:
             l.start_test(self, test)
 
     async def _run_tests(self, runners: T.List[SingleTestRunner]) -> None:
-        semaphore = asyncio.Semaphore(self.options.num_processes)
+        resources = TestResources({'cpu': self.options.num_processes, **dict(self.options.resources)})
         futures: T.Deque[asyncio.Future] = deque()
         running_tests: T.Dict[asyncio.Future, str] = {}
         interrupted = False
@@ -2148,7 +2520,8 @@ class TestHarness:
         loop = asyncio.get_running_loop()
 
         async def run_test(test: SingleTestRunner) -> None:
-            async with semaphore:
+            needs = await resources.acquire(test.resources)
+            try:
                 if interrupted or (self.options.repeat > 1 and self.fail_count):
                     return
                 res = await test.run(self)
@@ -2157,6 +2530,8 @@ class TestHarness:
                 if maxfail and self.fail_count >= maxfail and res.res.is_bad():
                     self.maxfail_reached = True
                     cancel_all_tests()
+            finally:
+                resources.release(needs)
 
         def test_done(f: asyncio.Future) -> None:
             if not f.cancelled():
@@ -2243,27 +2618,27 @@ def list_tests(th: TestHarness) -> bool:
         print(th.get_pretty_suite(t))
     return not tests
 
-def rebuild_deps(ninja: T.List[str], wd: str, tests: T.List[TestSerialisation], benchmark: bool) -> bool:
-    def convert_path_to_target(path: str) -> str:
-        path = os.path.relpath(path, wd)
-        if os.sep != '/':
-            path = path.replace(os.sep, '/')
-        return path
+def convert_path_to_target(path: str, wd: str) -> str:
+    path = os.path.relpath(path, wd)
+    if os.sep != '/':
+        path = path.replace(os.sep, '/')
+    return path
 
+def load_target_outputs(wd: str) -> T.Dict[str, T.List[str]]:
+    '''Map the ID of every target to its outputs, as ninja names them.'''
+    targets_file = os.path.join(wd, 'meson-info/intro-targets.json')
+    with open(targets_file, encoding='utf-8') as fp:
+        targets_info = json.load(fp)
+    return {target['id']: [convert_path_to_target(f, wd) for f in target['filename']]
+            for target in targets_info}
+
+def rebuild_deps(ninja: T.List[str], wd: str, tests: T.List[TestSerialisation], benchmark: bool) -> bool:
     assert len(ninja) > 0
 
     targets: T.Set[str] = set()
     if tests:
-        targets_file = os.path.join(wd, 'meson-info/intro-targets.json')
-        with open(targets_file, encoding='utf-8') as fp:
-            targets_info = json.load(fp)
-
         depends: T.Set[str] = set()
-        intro_targets: T.Dict[str, T.List[str]] = {}
-        for target in targets_info:
-            intro_targets[target['id']] = [
-                convert_path_to_target(f)
-                for f in target['filename']]
+        intro_targets = load_target_outputs(wd)
         for t in tests:
             for d in t.depends:
                 if d in depends:
@@ -2288,7 +2663,209 @@ def rebuild_deps(ninja: T.List[str], wd: str, tests: T.List[TestSerialisation],
 
     return True
 
+class ChangedTests:
+    '''Finds the tests affected by a change.
+
+    A test is affected if its program, one of its arguments, one of the
+    outputs of its `depends` or anything these are built from changed. What
+    they are built from comes from the ninja build graph, of which only the
+    part reachable from the tests is loaded, and from the headers that the
+    compilers reported, which are in the ninja deps log. A file changed if
+    it is newer than a stamp file or, if there is no such file, if git
+    reports it as changed since a revision.
+    '''
+
+    # Nodes per ninja invocation, to stay below the command line limit
+    CHUNK_SIZE = 1000
+
+    def __init__(self, ninja: T.List[str], wd: str, source_dir: str, since: str) -> None:
+        self.ninja = ninja
+        self.wd = wd
+        self.inputs: T.Dict[str, T.List[str]] = {}
+        self.affected: T.Dict[str, bool] = {}
+        self.outputs = {line.rpartition(': ')[0] for line in self.run_tool('targets', ['all'])}
+        self.deps = self.load_deps()
+
+        self.stamp: T.Optional[float] = None
+        self.changed_files: T.Set[str] = set()
+        if os.path.exists(since):
+            self.stamp = os.stat(since).st_mtime
+        else:
+            self.changed_files = self.git_changed_files(source_dir, since)
+        self.mtimes: T.Dict[str, T.Optional[float]] = {}
+
+    def run_tool(self, tool: str, args: T.List[str]) -> T.List[str]:
+        p = subprocess.run(self.ninja + ['-t', tool] + args, cwd=self.wd, capture_output=True,
+                           encoding='utf-8', errors='replace')
+        if p.returncode != 0:
+            raise TestException(f'Could not read the build graph of {self.wd!r}: {p.stderr.strip()}')
+        return p.stdout.splitlines()
+
+    def load_deps(self) -> T.Dict[str, T.List[str]]:
+        p = subprocess.run(self.ninja + ['-t', 'deps'], cwd=self.wd, capture_output=True,
+                           encoding='utf-8', errors='replace')
+        deps: T.Dict[str, T.List[str]] = {}
+        if p.returncode != 0:
+            mlog.warning('The ninja deps log can\'t be read, tests are not selected on the headers they include')
+            return deps
+        current: T.List[str] = []
+        for line in p.stdout.splitlines():
+            if line.startswith(' '):
+                current.append(line.strip())
+            elif ': #deps' in line:
+                current = deps.setdefault(line.partition(': #deps')[0], [])
+        return deps
+
+    @staticmethod
+    def git_changed_files(source_dir: str, rev: str) -> T.Set[str]:
+        ok, top = quiet_git(['rev-parse', '--show-toplevel'], source_dir)
+        if not ok:
+            raise TestException(f'{rev!r} is not a file, and the source directory is not a git repository')
+        top = top.strip()
+        ok, diff = quiet_git(['diff', '--name-only', '-z', rev, '--'], top)
+        if not ok:
+            raise TestException(f'{rev!r} is neither a file nor a git revision')
+        ok, untracked = quiet_git(['ls-files', '--others', '--exclude-standard', '--full-name', '-z'], top)
+        if not ok:
+            untracked = ''
+        return {os.path.normpath(os.path.join(top, f)) for f in (diff + untracked).split('\0') if f}
+
+    def is_changed(self, path: str) -> bool:
+        path = os.path.normpath(os.path.join(self.wd, path))
+        if self.stamp is None:
+            return path in self.changed_files
+        if path not in self.mtimes:
+            try:
+                self.mtimes[path] = os.stat(path).st_mtime
+            except OSError:
+                # Phony targets and files that tests create themselves
+                self.mtimes[path] = None
+        mtime = self.mtimes[path]
+        return mtime is not None and mtime > self.stamp
+
+    def load_inputs(self, nodes: T.Iterable[str]) -> None:
+        '''Load what nodes are built from, and in turn what those are built from.'''
+        frontier = sorted({n for n in nodes if n in self.outputs and n not in self.inputs})
+        while frontier:
+            for i in range(0, len(frontier), self.CHUNK_SIZE):
+                self.query(frontier[i:i + self.CHUNK_SIZE])
+            frontier = sorted({i for n in frontier for i in self.inputs[n]
+                               if i in self.outputs and i not in self.inputs})
+
+    def query(self, nodes: T.List[str]) -> None:
+        current: T.List[str] = []
+        in_inputs = False
+        for line in self.run_tool('query', nodes):
+            if not line.startswith(' '):
+                current = self.inputs.setdefault(line[:-1], list(self.deps.get(line[:-1], [])))
+                in_inputs = False
+            elif not line.startswith('    '):
+                in_inputs = line.strip().startswith('input:')
+            elif in_inputs:
+                # Implicit and order-only inputs are prefixed with | and ||
+                current.append(line.strip().lstrip('|').strip())
+        for n in nodes:
+            self.inputs.setdefault(n, [])
+
+    def node_affected(self, node: str) -> bool:
+        stack = [node]
+        visiting: T.Set[str] = set()
+        while stack:
+            n = stack[-1]
+            if n in self.affected:
+                stack.pop()
+                continue
+            inputs = self.inputs.get(n, [])
+            if n not in visiting:
+                visiting.add(n)
+                pending = [i for i in inputs if i not in self.affected and i not in visiting]
+                if pending:
+                    stack.extend(pending)
+                    continue
+            stack.pop()
+            self.affected[n] = self.is_changed(n) or any(self.affected.get(i, False) for i in inputs)
+        return self.affected[node]
+
+    def find(self, tests: T.List[TestSerialisation]) -> T.List[TestSerialisation]:
+        def node_name(path: str) -> str:
+            try:
+                return convert_path_to_target(path, self.wd)
+            except ValueError:
+                # On another drive on Windows, never a node of the build graph
+                return path
+
+        target_outputs = load_target_outputs(self.wd)
+        test_nodes: T.List[T.List[str]] = []
+        for t in tests:
+            nodes = [node_name(f) for f in t.fname]
+            for a in t.cmd_args:
+                if os.path.isfile(os.path.join(t.workdir or self.wd, a)):
+                    nodes.append(node_name(os.path.join(t.workdir or self.wd, a)))
+            for d in t.depends:
+                nodes.extend(target_outputs.get(d, []))
+            test_nodes.append(nodes)
+        self.load_inputs(n for nodes in test_nodes for n in nodes)
+        return [t for t, nodes in zip(tests, test_nodes) if any(self.node_affected(n) for n in nodes)]
+
+
+def merge_logs(options: argparse.Namespace) -> int:
+    '''Combine test logs, for example of the slices of a test run that ran on
+    several machines, into one log of each kind.'''
+    json_logs = [f for f in options.args if f.endswith('.json')]
+    junit_logs = [f for f in options.args if f.endswith('.xml')]
+    for f in options.args:
+        if f not in json_logs and f not in junit_logs:
+            print(f'Log {f!r} is neither a JSON nor a JUnit test log.')
+            return 1
+    if not options.args:
+        print('No test logs to merge given.')
+        return 1
+
+    logdir = os.path.join(options.wd, 'meson-logs')
+    os.makedirs(logdir, exist_ok=True)
+    logfile_base = os.path.join(logdir, options.logbase)
+    # The merged logs are written next to their targets and then moved over
+    # them, as a target may also be one of the logs being merged
+    if json_logs:
+        with open(logfile_base + '.json~', 'wb') as out:
+            for fname in json_logs:
+                with open(fname, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            out.write(line if line.endswith(b'\n') else line + b'\n')
+        os.replace(logfile_base + '.json~', logfile_base + '.json')
+        print(f'Merged JSON log written to {logfile_base}.json')
+
+    if junit_logs:
+        root = et.Element('testsuites', tests='0', errors='0', failures='0')
+        suites: T.Dict[str, et.Element] = {}
+        for fname in junit_logs:
+            for suite in et.parse(fname).getroot().findall('testsuite'):
+                # Tests of the same project can end up in the same suite in
+                # every log
+                name = suite.get('name', '')
+                if name not in suites:
+                    suites[name] = suite
+                    root.append(suite)
+                    continue
+                merged = suites[name]
+                for attr in ['tests', 'errors', 'failures', 'skipped']:
+                    merged.set(attr, str(int(merged.get(attr, '0')) + int(suite.get(attr, '0'))))
+                merged.set('time', str(float(merged.get('time', '0')) + float(suite.get('time', '0'))))
+                merged.extend(suite)
+        for suite in suites.values():
+            for attr in ['tests', 'errors', 'failures']:
+                root.set(attr, str(int(root.get(attr)) + int(suite.get(attr, '0'))))
+        with open(logfile_base + '.junit.xml~', 'wb') as f:
+            et.ElementTree(root).write(f, encoding='utf-8', xml_declaration=True)
+        os.replace(logfile_base + '.junit.xml~', logfile_base + '.junit.xml')
+        print(f'Merged JUnit log written to {logfile_base}.junit.xml')
+    return 0
+
 def run(options: argparse.Namespace) -> int:
+    if options.merge_logs:
+        return merge_logs(options)
+
     if options.benchmark or options.interactive:
         options.num_processes = 1
 
@@ -2296,6 +2873,12 @@ def run(options: argparse.Namespace) -> int:
         print('Can not be both quiet and verbose at the same time.')
         return 1
 
+    if options.slice_strategy == 'duration' and not options.durations_from:
+        # The log of the previous run differs between machines, which would
+        # then compute different slices
+        print('--slice-strategy=duration requires the test logs given with --durations-from.')
+        return 1
+
     check_bin = None
     if options.gdb:
         options.interactive = True
@@ -2316,7 +2899,7 @@ def run(options: argparse.Namespace) -> int:
             print(f'Could not find requested program: {check_bin!r}')
             return 1
 
-    b = build.load(options.wd)
+    b = build.load_index(options.wd)
     need_vsenv = T.cast('bool', b.environment.coredata.optstore.get_value_for(OptionKey('vsenv')))
     setup_vsenv(need_vsenv)
 
@@ -9,7 +9,7 @@ import typing as T
 from . import options
 from . import mesonlib
 from .options import OptionKey
-from . import mparser
+from . import astcache, mparser
 from . import mlog
 from .interpreterbase import FeatureNew, FeatureDeprecated, typed_pos_args, typed_kwargs, ContainerTypeInfo, KwargInfo
 from .interpreter.type_checking import NoneType, in_set_validator
@@ -80,14 +80,14 @@ class OptionInterpreter:
         }
         self.optionstore = optionstore
 
-    def process(self, option_file: str) -> None:
+    def process(self, option_file: str, ast_cache_dir: T.Optional[str] = None) -> None:
         try:
             with open(option_file, encoding='utf-8') as f:
                 code = f.read()
         except UnicodeDecodeError as e:
             raise mesonlib.MesonException(f'Malformed option file {option_file!r} failed to parse as unicode: {e}')
         try:
-            ast = mparser.Parser(code, option_file).parse()
+            ast = astcache.parse(code, option_file, ast_cache_dir, compact=True)
         except mesonlib.MesonException as me:
             me.file = option_file
             raise me
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 from collections import OrderedDict
+from functools import lru_cache
 from itertools import chain
 import copy
 import dataclasses
@@ -656,8 +657,12 @@ def prefixed_default(opt: AnyOptionType, name: OptionKey, prefix: str = '') -> E
 # Update `docs/markdown/Builtin-options.md` after changing the options below
 # Also update mesonlib._BUILTIN_NAMES. See the comment there for why this is required.
 # Please also update completion scripts in $MESONSRC/data/shell-completions/
-BUILTIN_DIR_OPTIONS: T.Mapping[OptionKey, AnyOptionType] = {
-    OptionKey(o.name): o for o in [
+@lru_cache(maxsize=None)
+def get_builtin_dir_options() -> T.Mapping[OptionKey, AnyOptionType]:
+    # Finding the default libdir runs dpkg-architecture on Debian, which is
+    # too slow to do for every command that imports this module, like "meson
+    # introspect". The options are created on first use instead.
+    return {OptionKey(o.name): o for o in [
         UserStringOption('prefix', 'Installation prefix', default_prefix()),
         UserStringOption('bindir', 'Executable directory', 'bin'),
         UserStringOption('datadir', 'Data file directory', default_datadir()),
@@ -672,8 +677,7 @@ BUILTIN_DIR_OPTIONS: T.Mapping[OptionKey, AnyOptionType] = {
         UserStringOption('sbindir', 'System executable directory', default_sbindir()),
         UserStringOption('sharedstatedir', 'Architecture-independent data directory', 'com'),
         UserStringOption('sysconfdir', 'Sysconf data directory', default_sysconfdir()),
-    ]
-}
+    ]}
 
 BUILTIN_CORE_OPTIONS: T.Mapping[OptionKey, AnyOptionType] = {
     OptionKey(o.name): o for o in T.cast('T.List[AnyOptionType]', [
@@ -722,7 +726,9 @@ BUILTIN_CORE_OPTIONS: T.Mapping[OptionKey, AnyOptionType] = {
     ])
 }
 
-BUILTIN_OPTIONS = OrderedDict(chain(BUILTIN_DIR_OPTIONS.items(), BUILTIN_CORE_OPTIONS.items()))
+@lru_cache(maxsize=None)
+def get_builtin_options() -> T.Mapping[OptionKey, AnyOptionType]:
+    return OrderedDict(chain(get_builtin_dir_options().items(), BUILTIN_CORE_OPTIONS.items()))
 
 BUILTIN_OPTIONS_PER_MACHINE: T.Mapping[OptionKey, AnyOptionType] = {
     OptionKey(o.name): o for o in [
@@ -951,7 +957,7 @@ class OptionStore:
 
     def init_builtins(self) -> None:
         # Create builtin options with default values
-        for key, opt in BUILTIN_OPTIONS.items():
+        for key, opt in get_builtin_options().items():
             self.add_builtin_option(key, opt)
         for for_machine in iter(MachineChoice):
             for key, opt in BUILTIN_OPTIONS_PER_MACHINE.items():
@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+"""Tracing of where ``meson setup`` spends its time.
+
+When enabled with ``meson setup --profile-configure=FILE``, the interpreter,
+compiler checks, dependency lookups, subprojects and ``run_command()`` record
+spans, which are written to FILE in the Chrome trace event format. The file
+can be loaded in chrome://tracing, Perfetto or speedscope to get a flame graph
+whose entries point back to ``meson.build`` lines.
+
+Tracing is off by default, and code on hot paths should check
+``is_enabled()`` before building span names.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+import typing as T
+
+
+class Tracer:
+
+    def __init__(self) -> None:
+        self.events: T.List[T.Dict[str, T.Any]] = []
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    def add_span(self, name: str, cat: str, start_ns: int, end_ns: int, args: T.Dict[str, T.Any]) -> None:
+        # list.append() is atomic, spans may be recorded from worker threads
+        self.events.append({
+            'name': name,
+            'cat': cat,
+            'ph': 'X',
+            'ts': (start_ns - self.origin) / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': self.pid,
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def write(self, filename: str) -> None:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+
+class _State:
+
+    def __init__(self) -> None:
+        self.tracer: T.Optional[Tracer] = None
+
+
+_state = _State()
+
+
+def is_enabled() -> bool:
+    return _state.tracer is not None
+
+
+def start() -> None:
+    _state.tracer = Tracer()
+
+
+def stop(filename: str) -> None:
+    """Stop tracing and write the trace to filename."""
+    t = _state.tracer
+    if t is None:
+        return
+    _state.tracer = None
+    t.write(filename)
+
+
+@contextlib.contextmanager
+def span(name: str, cat: str, **args: T.Any) -> T.Iterator[None]:
+    """Record the time spent in the body of the with statement."""
+    t = _state.tracer
+    if t is None:
+        yield
+        return
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        t.add_span(name, cat, start_ns, time.perf_counter_ns(), args)
@@ -31,7 +31,8 @@ def regen(regeninfo: RegenInfo, meson_command: T.List[str], backend: str) -> Non
                            'regenerate',
                            regeninfo.build_dir,
                            regeninfo.source_dir,
-                           '--backend=' + backend]
+                           '--backend=' + backend,
+                           '--only-if-changed']
     subprocess.check_call(cmd)
 
 def run(args: T.List[str]) -> int:
@@ -0,0 +1,230 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+"""A persistent, user-wide cache for the results of toolchain probes.
+
+The per-build-directory caches in coredata are lost every time a new build
+directory is set up. This cache is shared by all build directories of the
+current user, and is only used when explicitly enabled by setting the
+``MESON_TOOLCHAIN_CACHE`` environment variable.
+
+Entries are stored one per file, named by the hash of their key, and are
+written atomically so that several concurrent ``meson setup`` invocations can
+share the same cache directory safely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import typing as T
+
+from . import mlog
+from .mesonlib import Popen_safe, join_args
+
+# Bump this if the layout or the meaning of any stored entry changes.
+CACHE_FORMAT_VERSION = 1
+
+# Environment variables which change the behavior of compilers and linkers
+# without showing up on their command line.
+TOOLCHAIN_ENV_VARS = [
+    'CPATH', 'C_INCLUDE_PATH', 'CPLUS_INCLUDE_PATH', 'OBJC_INCLUDE_PATH',
+    'LIBRARY_PATH', 'COMPILER_PATH', 'GCC_EXEC_PREFIX',
+    'SDKROOT', 'MACOSX_DEPLOYMENT_TARGET', 'IPHONEOS_DEPLOYMENT_TARGET',
+    'INCLUDE', 'LIB', 'LIBPATH', 'CL', '_CL_', 'LINK', '_LINK_',
+]
+
+_digest_cache: T.Dict[T.Tuple[str, int, int, int], str] = {}
+
+
+def file_digest(path: str) -> T.Optional[str]:
+    """Return the sha256 of a file's contents, or None if it can't be read.
+
+    The digest is memoized on the file's identity (path, inode, size, mtime),
+    so hashing a large compiler binary is only done once per process.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    ident = (path, st.st_ino, st.st_size, st.st_mtime_ns)
+    if ident not in _digest_cache:
+        h = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    h.update(chunk)
+        except OSError:
+            return None
+        _digest_cache[ident] = h.hexdigest()
+    return _digest_cache[ident]
+
+
+def program_digest(exelist: T.List[str]) -> T.Optional[str]:
+    """Return the digest of the program that an exelist will execute."""
+    if not exelist:
+        return None
+    exe = exelist[0]
+    if not os.path.isabs(exe):
+        found = shutil.which(exe)
+        if found is None:
+            return None
+        exe = found
+    return file_digest(os.path.realpath(exe))
+
+
+# Environment variables which additionally change which programs the
+# toolchain runs, or the text of its output.
+PROBE_ENV_VARS = ['PATH', 'LANG', 'LC_ALL', 'LC_MESSAGES']
+
+
+def file_identity(path: str) -> T.Optional[T.List[T.Union[str, int]]]:
+    """Return the resolved path and the stat identity of a file.
+
+    This is much cheaper than hashing the file, at the cost of missing
+    changes which preserve the size and modification time.
+    """
+    path = os.path.realpath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [path, st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def program_identity(exe: str) -> T.Optional[T.List[T.Union[str, int]]]:
+    """Return the resolved path and the stat identity of a program."""
+    if not os.path.isabs(exe):
+        found = shutil.which(exe)
+        if found is None:
+            return None
+        exe = found
+    return file_identity(exe)
+
+
+def argument_identity(arg: str) -> T.Optional[T.List[T.Union[str, int]]]:
+    """Return the identity of the file or program that an argument names.
+
+    Wrapped compilers, such as ``ccache cc`` or ``python3 wrapper.py``, run
+    programs and scripts given as arguments, which change the output just
+    like the first program of the command does.
+    """
+    if os.path.isfile(arg):
+        return file_identity(arg)
+    if arg.startswith('-'):
+        return None
+    return program_identity(arg)
+
+
+def toolchain_environment() -> T.Dict[str, str]:
+    return {k: os.environ[k] for k in TOOLCHAIN_ENV_VARS if k in os.environ}
+
+
+class ToolchainCache:
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.join(root, f'v{CACHE_FORMAT_VERSION}')
+
+    @classmethod
+    def from_environ(cls) -> T.Optional[ToolchainCache]:
+        """Create the cache if the user enabled it, otherwise return None.
+
+        ``MESON_TOOLCHAIN_CACHE`` enables the cache when set to anything other
+        than an empty string or ``0``. The cache lives in
+        ``MESON_TOOLCHAIN_CACHE_DIR`` if that is set, and in
+        ``$XDG_CACHE_HOME/meson`` otherwise.
+        """
+        if os.environ.get('MESON_TOOLCHAIN_CACHE', '') in {'', '0'}:
+            return None
+        root = os.environ.get('MESON_TOOLCHAIN_CACHE_DIR')
+        if not root:
+            cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+            root = os.path.join(cache_home, 'meson')
+        return cls(root)
+
+    def _path(self, namespace: str, key: T.Any) -> str:
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+        return os.path.join(self.root, namespace, digest[:2], digest[2:] + '.json')
+
+    def lookup(self, namespace: str, key: T.Any) -> T.Optional[T.Any]:
+        """Return the value stored for key, or None on a miss.
+
+        Unreadable or corrupt entries are treated as misses.
+        """
+        try:
+            with open(self._path(namespace, key), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('key') != json.loads(json.dumps(key)):
+            # A hash collision, or an entry written with a different key encoding
+            return None
+        return entry.get('value')
+
+    def store(self, namespace: str, key: T.Any, value: T.Any) -> None:
+        path = self._path(namespace, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'key': key, 'value': value}, f)
+                os.replace(tmpname, path)
+            except BaseException:
+                os.unlink(tmpname)
+                raise
+        except OSError as e:
+            # The cache is only an accelerator, failing to write it is not fatal
+            mlog.debug(f'Could not write toolchain cache entry {path}: {e}')
+
+
+def run_probe(args: T.List[str], msg: str = 'Called', *, write: T.Optional[str] = None,
+              log_output: bool = True) -> T.Tuple[int, str, str]:
+    """Run a command used to identify a toolchain, and log it.
+
+    When the toolchain cache is enabled the result is stored in it, keyed on
+    the identity of the program being run, of every program or file named by
+    its arguments, and the relevant environment, and later calls return the
+    stored result without running the program again.
+    The command must only depend on the program and its arguments, which is
+    true for things like ``--version`` or dumping the predefined macros.
+
+    Raises OSError if the program could not be run, which is never cached.
+    """
+    cache = ToolchainCache.from_environ()
+    key: T.Optional[T.List[T.Any]] = None
+    if cache is not None:
+        identity = program_identity(args[0])
+        if identity is not None:
+            env = {k: os.environ[k] for k in TOOLCHAIN_ENV_VARS + PROBE_ENV_VARS if k in os.environ}
+            key = [identity, [argument_identity(a) for a in args[1:]], args, write, env]
+            value = cache.lookup('probes', key)
+            if isinstance(value, dict):
+                rc, out, err = value['returncode'], value['stdout'], value['stderr']
+                _log_probe(args, f'{msg} (cached)', rc, out, err, log_output)
+                return rc, out, err
+
+    try:
+        p, out, err = Popen_safe(args, write=write)
+    except Exception as excp:
+        mlog.debug('-----------')
+        mlog.debug(f'{msg}: `{join_args(args)}` -> {excp}')
+        raise
+    _log_probe(args, msg, p.returncode, out, err, log_output)
+    if cache is not None and key is not None:
+        cache.store('probes', key, {'returncode': p.returncode, 'stdout': out, 'stderr': err})
+    return p.returncode, out, err
+
+
+def _log_probe(args: T.List[str], msg: str, rc: int, out: str, err: str, log_output: bool) -> None:
+    mlog.debug('-----------')
+    mlog.debug(f'{msg}: `{join_args(args)}` -> {rc}')
+    if not log_output:
+        return
+    if out and out.strip():
+        mlog.debug(f'stdout:\n{out.strip()}\n-----------')
+    if err and err.strip():
+        mlog.debug(f'stderr:\n{err.strip()}\n-----------')
@@ -2642,12 +2642,22 @@ def generate_list(func: T.Callable[_P, T.Generator[_T, None, None]]) -> T.Callab
     return wrapper
 
 
-def pickle_load(filename: str, object_name: str, object_type: T.Type[_PL], suggest_reconfigure: bool = True) -> _PL:
+def pickle_load(filename: str, object_name: str, object_type: T.Type[_PL], suggest_reconfigure: bool = True,
+                *, skip: int = 0) -> _PL:
+    """Load an object pickled into filename, after skipping the given number
+    of objects pickled before it.
+
+    The objects are read with one unpickler, so an object may refer to
+    objects in the ones pickled before it by the same pickler.
+    """
     load_fail_msg = f'{object_name} file {filename!r} is corrupted.'
     extra_msg = ' Consider reconfiguring the directory with "meson setup --reconfigure".' if suggest_reconfigure else ''
     try:
         with open(filename, 'rb') as f:
-            obj = pickle.load(f)
+            unpickler = pickle.Unpickler(f)
+            for _ in range(skip):
+                unpickler.load()
+            obj = unpickler.load()
     except (pickle.UnpicklingError, EOFError):
         raise MesonException(load_fail_msg + extra_msg)
     except (TypeError, ModuleNotFoundError, AttributeError):
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+
+# Leaves a marker in the directory of the resource while running, and fails
+# if there is a marker of another test holding the same resource, which
+# means that they run at the same time.
+#
+# If the resource is named by RESOURCE_BARRIER the test first waits for
+# another test to arrive, so that tests which are expected to run at the
+# same time are seen to do so regardless of timing.
+resource_dir = sys.argv[1]
+os.makedirs(resource_dir, exist_ok=True)
+marker = str(os.getpid())
+with open(os.path.join(resource_dir, marker), 'w', encoding='utf-8'):
+    pass
+
+def others():
+    return [f for f in os.listdir(resource_dir) if f != marker]
+
+if os.environ.get('RESOURCE_BARRIER') == os.path.basename(resource_dir):
+    deadline = time.monotonic() + 60
+    while not others() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+if others():
+    # The marker stays, for the other test to find as well
+    sys.exit('runs at the same time as another holder of ' + os.path.basename(resource_dir))
+os.unlink(os.path.join(resource_dir, marker))
@@ -0,0 +1,7 @@
+#include "a.h"
+
+int common(void);
+
+int main(void) {
+    return common() + A_RESULT;
+}
@@ -0,0 +1 @@
+#define A_RESULT 0
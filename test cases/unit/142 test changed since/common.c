@@ -0,0 +1,3 @@
+int common(void) {
+    return 0;
+}
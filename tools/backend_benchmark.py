@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measures how long generating the backend files of a deep target graph takes.
+
+A synthetic project is generated with layers of static libraries, each
+linking with two libraries of the layer below, and an executable linking
+with every library. The libraries therefore form long chains, in which
+every target depends on all the layers below it. The project is evaluated
+once and then generating the ninja backend for it is timed:
+
+    ./tools/backend_benchmark.py
+    ./tools/backend_benchmark.py --depth 400 --width 20 --profile
+'''
+
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+import time
+import typing as T
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mesonbuild import build, coredata, environment, mesonlib, mlog, msetup
+from mesonbuild.interpreter import Interpreter
+
+MESON = os.path.join(os.path.dirname(__file__), '..', 'meson.py')
+
+def generate(srcdir: str, depth: int, width: int) -> None:
+    lines = ["project('benchmark', 'c')", 'prev = []']
+    for j in range(depth):
+        lines.append('libs = []')
+        for i in range(width):
+            lines.append(f"lib = static_library('s{j}_{i}', 'lib.c', c_args: '-DN={j}_{i}', "
+                         f"link_with: prev.length() > 0 ? [prev[{i}], prev[{(i + 1) % width}]] : [])")
+            lines.append(f"executable('e{j}_{i}', 'main.c', link_with: lib)")
+            lines.append('libs += lib')
+        lines.append('prev = libs')
+    with open(os.path.join(srcdir, 'meson.build'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    for name in ['lib.c', 'main.c']:
+        with open(os.path.join(srcdir, name), 'w', encoding='utf-8') as f:
+            f.write('int main(void) { return 0; }\n')
+
+def timed_generate(srcdir: str, profile: T.Optional[cProfile.Profile]) -> T.Tuple[float, float]:
+    # A new build directory every time, so that nothing is reused
+    with tempfile.TemporaryDirectory() as builddir:
+        parser = argparse.ArgumentParser()
+        msetup.add_arguments(parser)
+        options = parser.parse_args(['--backend', 'ninja', builddir, srcdir])
+        env = environment.Environment(srcdir, builddir, options)
+        intr = Interpreter(build.Build(env), user_defined_options=options)
+        start = time.perf_counter()
+        intr.run()
+        eval_time = time.perf_counter() - start
+        # The backend expects what setup does before generating it
+        intr.build.def_files = intr.get_build_def_files()
+        coredata.save(env.coredata, builddir)
+        assert intr.backend is not None
+        if profile:
+            profile.enable()
+        start = time.perf_counter()
+        intr.backend.generate()
+        gen_time = time.perf_counter() - start
+        if profile:
+            profile.disable()
+        return eval_time, gen_time
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--depth', type=int, default=100,
+                        help='number of layers of static libraries (default: %(default)s)')
+    parser.add_argument('--width', type=int, default=10,
+                        help='number of static libraries in each layer (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of runs, of which the fastest is reported (default: %(default)s)')
+    parser.add_argument('--profile', action='store_true',
+                        help='print the functions in which generating the backend spends the most time')
+    options = parser.parse_args()
+
+    # The backend writes the meson command into the regeneration rules
+    mesonlib.set_meson_command(os.path.abspath(MESON))
+    profile = cProfile.Profile() if options.profile else None
+    with tempfile.TemporaryDirectory() as srcdir:
+        generate(srcdir, options.depth, options.width)
+        with mlog.no_logging():
+            times = [timed_generate(srcdir, profile) for _ in range(options.repeat)]
+    print(f'{options.depth * options.width * 2} targets, {options.depth} layers')
+    print(f'evaluate: {min(t[0] for t in times) * 1000:8.1f} ms')
+    print(f'backend:  {min(t[1] for t in times) * 1000:8.1f} ms')
+    if profile:
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(25)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
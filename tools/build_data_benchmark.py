@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measures how long loading the build data of a large project takes.
+
+A synthetic project with the given number of executables, each with a
+test, is configured. Then loading all of build.dat, as "meson introspect"
+does, is timed against loading only its index, as "meson test" and
+"meson compile" do:
+
+    ./tools/build_data_benchmark.py
+    ./tools/build_data_benchmark.py --targets 10000 --repeat 10
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import typing as T
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mesonbuild import build, coredata
+
+MESON = os.path.join(os.path.dirname(__file__), '..', 'meson.py')
+
+PROJECT = '''\
+project('benchmark', 'c')
+foreach i : range({targets})
+  exe = executable('exe@0@'.format(i), 'main.c', c_args: ['-DN=@0@'.format(i)], install: true)
+  test('test@0@'.format(i), exe, suite: ['suite@0@'.format(i % 10)])
+endforeach
+'''
+
+def configure(srcdir: str, builddir: str, targets: int) -> None:
+    with open(os.path.join(srcdir, 'meson.build'), 'w', encoding='utf-8') as f:
+        f.write(PROJECT.format(targets=targets))
+    with open(os.path.join(srcdir, 'main.c'), 'w', encoding='utf-8') as f:
+        f.write('int main(void) { return 0; }\n')
+    subprocess.run([sys.executable, MESON, 'setup', builddir, srcdir],
+                   check=True, stdout=subprocess.DEVNULL)
+
+def best_of(repeat: int, func: T.Callable[[], object]) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', type=int, default=3000,
+                        help='number of executables in the project (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs, of which the fastest is reported (default: %(default)s)')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as srcdir, tempfile.TemporaryDirectory() as builddir:
+        configure(srcdir, builddir, options.targets)
+        size = os.path.getsize(os.path.join(builddir, 'meson-private', 'build.dat'))
+        coredata_time = best_of(options.repeat, lambda: coredata.load(builddir))
+        build_time = best_of(options.repeat, lambda: build.load(builddir))
+        index_time = best_of(options.repeat, lambda: build.load_index(builddir))
+    print(f'{options.targets} targets, build.dat is {size / 1e6:.1f} MB')
+    print(f'coredata:         {coredata_time * 1000:8.1f} ms')
+    print(f'build data:       {build_time * 1000:8.1f} ms (including coredata)')
+    print(f'build data index: {index_time * 1000:8.1f} ms (including coredata)')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measures how long evaluating a large build file takes.
+
+A synthetic meson.build with the given number of statements is generated,
+mixing assignments, arithmetic, conditions, foreach loops over file lists,
+method calls and dictionaries. Parsing it and evaluating it with the
+interpreter of "meson setup" are timed separately:
+
+    ./tools/interpreter_benchmark.py
+    ./tools/interpreter_benchmark.py --statements 20000 --repeat 5 --introspect
+'''
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import typing as T
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mesonbuild import build, environment, mlog, mparser, msetup
+from mesonbuild.ast import IntrospectionInterpreter
+from mesonbuild.interpreter import Interpreter
+
+# Each block evaluates BLOCK_STATEMENTS statements, counting the statements
+# inside loops once per iteration.
+BLOCK = '''\
+n{i} = {i} * 2 + 1
+s{i} = 'file@0@.c'.format(n{i})
+files{i} = []
+foreach f : ['a.c', 'b.c', 'c.c', 'd.c']
+  files{i} += f.replace('.c', '_@0@.c'.format({i}))
+endforeach
+if n{i} % 3 == 0 and s{i}.endswith('.c')
+  d{i} = {{'name': s{i}, 'files': files{i}, 'count': files{i}.length()}}
+else
+  d{i} = {{'name': s{i}.to_upper(), 'count': -n{i}}}
+endif
+count{i} = d{i}['count'] + files{i}.length()
+'''
+BLOCK_STATEMENTS = 14
+
+def generate(srcdir: str, statements: int) -> str:
+    code = "project('benchmark', meson_version: '>=1.0')\n"
+    code += ''.join(BLOCK.format(i=i) for i in range(max(1, statements // BLOCK_STATEMENTS)))
+    with open(os.path.join(srcdir, 'meson.build'), 'w', encoding='utf-8') as f:
+        f.write(code)
+    return code
+
+def timed(func: T.Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def evaluate(srcdir: str) -> float:
+    # A new build directory every time, so that nothing is reused
+    with tempfile.TemporaryDirectory() as builddir:
+        parser = argparse.ArgumentParser()
+        msetup.add_arguments(parser)
+        options = parser.parse_args(['--backend', 'none', builddir, srcdir])
+        env = environment.Environment(srcdir, builddir, options)
+        intr = Interpreter(build.Build(env), user_defined_options=options)
+        return timed(intr.run)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statements', type=int, default=100000,
+                        help='approximate number of statements to evaluate (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of runs, of which the fastest is reported (default: %(default)s)')
+    parser.add_argument('--introspect', action='store_true',
+                        help='also measure the interpreter of "meson introspect", including parsing')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as srcdir:
+        code = generate(srcdir, options.statements)
+        with mlog.no_logging():
+            parse_time = min(timed(mparser.Parser(code, 'meson.build').parse) for _ in range(options.repeat))
+            eval_time = min(evaluate(srcdir) for _ in range(options.repeat))
+            if options.introspect:
+                introspect_time = min(timed(IntrospectionInterpreter(srcdir, '', 'none').analyze)
+                                      for _ in range(options.repeat))
+    print(f'{options.statements} statements')
+    print(f'parse:      {parse_time * 1000:8.1f} ms')
+    print(f'evaluate:   {eval_time * 1000:8.1f} ms ({options.statements / eval_time / 1000:.1f} k statements/s)')
+    if options.introspect:
+        print(f'introspect: {introspect_time * 1000:8.1f} ms')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2026 The Meson development team
+
+'''Measures how long lexing and parsing build files takes.
+
+By default all meson.build and meson.options files of the "test cases"
+directory are used, which gives a good mix of real-world syntax:
+
+    ./tools/lexer_benchmark.py
+    ./tools/lexer_benchmark.py --repeat 10 /path/to/project
+'''
+
+import argparse
+import os
+import sys
+import time
+import typing as T
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from mesonbuild import mlog, mparser
+
+BUILD_FILES = {'meson.build', 'meson.options', 'meson_options.txt'}
+
+def find_build_files(dirs: T.List[str]) -> T.List[str]:
+    files = []
+    for d in dirs:
+        for root, _, filenames in os.walk(d):
+            files += [os.path.join(root, f) for f in filenames if f in BUILD_FILES]
+    return sorted(files)
+
+def best_of(repeat: int, func: T.Callable[[], int]) -> T.Tuple[float, int]:
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func()
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+def main() -> int:
+    root = os.path.join(os.path.dirname(__file__), '..')
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs, of which the fastest is reported (default: %(default)s)')
+    parser.add_argument('dirs', nargs='*', default=[os.path.join(root, 'test cases')],
+                        help='directories to search for build files (default: test cases)')
+    options = parser.parse_args()
+
+    sources: T.List[T.Tuple[str, str]] = []
+    for fname in find_build_files(options.dirs):
+        with open(fname, encoding='utf-8', errors='replace') as f:
+            sources.append((fname, f.read()))
+
+    def lex() -> int:
+        tokens = 0
+        for fname, code in sources:
+            try:
+                for _ in mparser.Lexer(code).lex(fname):
+                    tokens += 1
+            except mparser.ParseException:
+                pass
+        return tokens
+
+    def parse() -> int:
+        parsed = 0
+        for fname, code in sources:
+            try:
+                mparser.Parser(code, fname).parse()
+                parsed += 1
+            except mparser.ParseException:
+                pass
+        return parsed
+
+    # Warnings about deprecated syntax in the test cases are not interesting
+    with mlog.no_logging():
+        lex_time, tokens = best_of(options.repeat, lex)
+        parse_time, parsed = best_of(options.repeat, parse)
+    print(f'{len(sources)} files, {tokens} tokens')
+    print(f'lex:   {lex_time * 1000:8.1f} ms ({tokens / lex_time / 1e6:.2f} M tokens/s)')
+    print(f'parse: {parse_time * 1000:8.1f} ms ({parsed} files parsed)')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,7 +15,9 @@ import platform
 import pickle
 import zipfile, tarfile
 import sys
+import time
 import sysconfig
+import xml.etree.ElementTree as ET
 from unittest import mock, SkipTest, skipIf, skipUnless, expectedFailure
 from contextlib import contextmanager
 from glob import glob
@@ -3827,6 +3829,7 @@ class AllPlatformTests(BasePlatformTests):
             ('depends', list),
             ('workdir', (str, None)),
             ('priority', int),
+            ('resources', dict),
             ('extra_paths', list),
         ]
 
@@ -5810,6 +5813,164 @@ class AllPlatformTests(BasePlatformTests):
                 self._run(self.mtest_command + ['--slice=' + arg])
             self.assertIn(expectation, cm.exception.output)
 
+    def test_schedule(self):
+        testdir = os.path.join(self.unit_test_dir, '128 test slice')
+        self.init(testdir)
+        self.build()
+
+        def run_order(*args: str) -> T.List[int]:
+            # test-10 has no duration, the others took as many seconds as
+            # their number in the previous run
+            with open(os.path.join(self.logdir, 'testlog.json'), 'w', encoding='utf-8') as f:
+                for i in range(1, 10):
+                    f.write(json.dumps({'name': f'test_slice:test-{i}', 'duration': float(i)}) + '\n')
+            output = self._run(self.mtest_command + ['-j1', *args])
+            return [int(x) for x in re.findall(r'^[ 0-9]+/[0-9]+ test_slice:test-([0-9]*)', output, flags=re.MULTILINE)]
+
+        self.assertEqual(run_order(), [10, 9, 8, 7, 6, 5, 4, 3, 2, 1])
+        self.assertEqual(run_order('--schedule=history'), [10, 9, 8, 7, 6, 5, 4, 3, 2, 1])
+        self.assertEqual(run_order('--schedule=declared'), [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    def test_slice_duration(self):
+        testdir = os.path.join(self.unit_test_dir, '128 test slice')
+        self.init(testdir)
+        self.build()
+
+        # test-10 took as long as all others together, test-5 has no duration
+        durations = os.path.join(self.builddir, 'durations.json')
+        with open(durations, 'w', encoding='utf-8') as f:
+            for i in [1, 2, 3, 4, 6, 7, 8, 9]:
+                f.write(json.dumps({'name': f'test_slice:test-{i}', 'duration': 1.0}) + '\n')
+            f.write(json.dumps({'name': 'test_slice:test-10', 'duration': 9.0}) + '\n')
+
+        logs = []
+        for arg, expectation in {'1/2': [10],
+                                 '2/2': [1, 2, 3, 4, 5, 6, 7, 8, 9],
+                                 }.items():
+            logbase = 'slice' + arg[0]
+            output = self._run(self.mtest_command + ['--slice=' + arg, '--slice-strategy=duration',
+                                                     '--durations-from', durations, '--logbase', logbase])
+            tests = sorted([
+                int(x) for x in re.findall(r'^[ 0-9]+/[0-9]+ test_slice:test-([0-9]*)', output, flags=re.MULTILINE)
+            ])
+            self.assertEqual(tests, expectation)
+            logs += [os.path.join(self.logdir, logbase + '.json'), os.path.join(self.logdir, logbase + '.junit.xml')]
+
+        self._run(self.mtest_command + ['--merge-logs', '--logbase', 'merged', *logs])
+        with open(os.path.join(self.logdir, 'merged.json'), encoding='utf-8') as f:
+            names = sorted(json.loads(line)['name'] for line in f)
+        self.assertEqual(names, sorted(f'test_slice:test-{i}' for i in range(1, 11)))
+        root = ET.parse(os.path.join(self.logdir, 'merged.junit.xml')).getroot()
+        self.assertEqual(root.get('tests'), '10')
+        self.assertEqual(len(root.findall('testsuite')), 1)
+        self.assertEqual(root.find('testsuite').get('tests'), '10')
+
+        # The target of the merge may be one of the logs merged into it
+        self._run(self.mtest_command + ['--merge-logs', '--logbase', 'slice1', *logs])
+        with open(os.path.join(self.logdir, 'slice1.json'), encoding='utf-8') as f:
+            self.assertEqual(sorted(json.loads(line)['name'] for line in f), names)
+
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            self._run(self.mtest_command + ['--merge-logs', os.path.join(self.logdir, 'testlog.txt')])
+        self.assertIn('is neither a JSON nor a JUnit test log', cm.exception.output)
+
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            self._run(self.mtest_command + ['--slice=1/2', '--slice-strategy=duration'])
+        self.assertIn('requires the test logs given with --durations-from', cm.exception.output)
+
+    def test_changed_since(self):
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'--changed-since needs the ninja build graph, not {self.backend.name}')
+        testdir = os.path.join(self.unit_test_dir, '142 test changed since')
+        srcdir = os.path.join(self.builddir, 'src')
+        shutil.copytree(testdir, srcdir)
+        git_init(srcdir)
+        self.new_builddir()
+        self.init(srcdir)
+        self.build()
+
+        def run_tests(since: str, *args: str) -> T.List[str]:
+            output = self._run(self.mtest_command + ['--changed-since', since, *args])
+            return sorted(re.findall(r'^[ 0-9]+/[0-9]+ changed:(\S+)', output, flags=re.MULTILINE))
+
+        # Changed sources are dated into the future and the stamp right
+        # before them, so that only they are newer than the stamp
+        stamp = os.path.join(self.builddir, 'stamp')
+        Path(stamp).touch()
+        self.assertEqual(run_tests(stamp), [])
+        later = time.time() + 10
+        for fname, expected in [('a.h', ['a']),         # only in the deps log
+                                ('common.c', ['a']),    # a library of the program
+                                ('script.py', ['script']),
+                                ]:
+            later += 10
+            os.utime(stamp, (later - 1, later - 1))
+            os.utime(os.path.join(srcdir, fname), (later, later))
+            self.assertEqual(run_tests(stamp), expected)
+
+        self.assertEqual(run_tests('HEAD'), [])
+        with open(os.path.join(srcdir, 'b.c'), 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertEqual(run_tests('HEAD'), ['b'])
+        # The build graph is read even if nothing is rebuilt
+        self.assertEqual(run_tests('HEAD', '--no-rebuild'), ['b'])
+
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            self._run(self.mtest_command + ['--changed-since', 'no-such-revision'])
+        self.assertIn('\'no-such-revision\' is neither a file nor a git revision', cm.exception.output)
+
+    def test_cached(self):
+        testdir = os.path.join(self.unit_test_dir, '128 test slice')
+        srcdir = os.path.join(self.builddir, 'src')
+        shutil.copytree(testdir, srcdir)
+        self.new_builddir()
+        self.init(srcdir)
+
+        def cached_tests(*args: str) -> int:
+            output = self._run(self.mtest_command + ['--cached', *args])
+            return len(re.findall(r'^[ 0-9]+/[0-9]+ test_slice:test-[0-9]+ +OK .* cached$', output, flags=re.MULTILINE))
+
+        self.assertEqual(cached_tests(), 0)
+        self.assertEqual(cached_tests(), 10)
+        self.assertEqual(cached_tests('test-1'), 1)
+        # Different arguments
+        self.assertEqual(cached_tests('--test-args=-v'), 0)
+        self.assertEqual(cached_tests('--test-args=-v'), 10)
+        # A different test program
+        with open(os.path.join(srcdir, 'test.py'), 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertEqual(cached_tests('--test-args=-v'), 0)
+        # Tests always run without --cached
+        output = self._run(self.mtest_command)
+        self.assertNotIn('cached', output)
+
+    def test_resources(self):
+        testdir = os.path.join(self.unit_test_dir, '141 test resources')
+        self.init(testdir)
+        self.build()
+
+        resources = {t['name']: t['resources'] for t in self.introspect('--tests')}
+        self.assertEqual(resources['locked-1'], {'lock': 1})
+        self.assertEqual(resources['heavy'], {'cpu': 2, 'lock': 0})
+
+        # Tests sharing the lock don't run at the same time
+        self._run(self.mtest_command + ['-j4'])
+        # Unless there are two of it, which the tests wait for to fail
+        with self.assertRaises(subprocess.CalledProcessError):
+            self._run(self.mtest_command + ['-j4', '--resource', 'lock=2'],
+                      override_envvars={'RESOURCE_BARRIER': 'lock'})
+        with open(os.path.join(self.logdir, 'testlog.txt'), encoding='utf-8') as f:
+            self.assertIn('runs at the same time as another holder of lock', f.read())
+
+        for arg, expectation in {'lock': 'error: argument --resource: value does not conform to format \'NAME=AMOUNT\'',
+                                 'lock=a': 'error: argument --resource: AMOUNT is not an integer',
+                                 'lock=0': 'error: argument --resource: AMOUNT is not a positive integer',
+                                 'cpu=2': 'error: argument --resource: the amount of cpu is set with --num-processes',
+                                 }.items():
+            with self.assertRaises(subprocess.CalledProcessError) as cm:
+                self._run(self.mtest_command + ['--resource=' + arg])
+            self.assertIn(expectation, cm.exception.output)
+
     def test_rsp_support(self):
         env = get_fake_env()
         cc = detect_c_compiler(env, MachineChoice.HOST)
@@ -5916,3 +6077,317 @@ class AllPlatformTests(BasePlatformTests):
         # Output captured and printed
         self.assertTrue('stdout|capture:true,console:true' in out)
         self.assertTrue('stderr|capture:true,console:true' in out)
+
+    def test_persistent_toolchain_cache(self):
+        '''
+        Test that compiler checks are shared between build directories when
+        the persistent toolchain cache is enabled.
+        '''
+        testdir = os.path.join(self.common_test_dir, '104 has arg')
+        with tempfile.TemporaryDirectory() as cachedir:
+            env = {'MESON_TOOLCHAIN_CACHE': '1', 'MESON_TOOLCHAIN_CACHE_DIR': cachedir}
+            self.init(testdir, override_envvars=env)
+            num_checks = self.get_meson_log_raw().count('Command line: `')
+            self.assertGreater(num_checks, 0)
+            self.assertTrue(os.listdir(cachedir))
+
+            # A fresh build directory gets all results from the cache
+            self.new_builddir()
+            self.init(testdir, override_envvars=env)
+            self.assertEqual(self.get_meson_log_raw().count('Command line: `'), 0)
+
+            # Without the opt-in, the cache is not consulted
+            self.new_builddir()
+            self.init(testdir, override_envvars={'MESON_TOOLCHAIN_CACHE_DIR': cachedir})
+            self.assertEqual(self.get_meson_log_raw().count('Command line: `'), num_checks)
+
+    def test_persistent_compiler_detection_cache(self):
+        '''
+        Test that compiler and linker detection is shared between build
+        directories when the persistent toolchain cache is enabled.
+        '''
+        testdir = os.path.join(self.common_test_dir, '1 trivial')
+
+        def detected() -> T.List[str]:
+            return [l for l in self.get_meson_log() if 'compiler for the' in l or 'linker for the' in l]
+
+        with tempfile.TemporaryDirectory() as cachedir:
+            env = {'MESON_TOOLCHAIN_CACHE': '1', 'MESON_TOOLCHAIN_CACHE_DIR': cachedir}
+            self.init(testdir, override_envvars=env)
+            first = detected()
+            self.assertIn('Detecting compiler via: `', self.get_meson_log_raw())
+
+            self.new_builddir()
+            self.init(testdir, override_envvars=env)
+            log = self.get_meson_log_raw()
+            self.assertNotIn('Detecting compiler via: `', log)
+            self.assertNotIn('Detecting linker via: `', log)
+            self.assertIn('Detecting compiler via (cached): `', log)
+            self.assertEqual(detected(), first)
+
+    def test_persistent_sanity_check_cache(self):
+        '''
+        Test that compiler sanity checks that passed are skipped in later
+        setups, unless --revalidate-toolchains is given.
+        '''
+        testdir = os.path.join(self.common_test_dir, '1 trivial')
+        with tempfile.TemporaryDirectory() as cachedir:
+            env = {'MESON_TOOLCHAIN_CACHE': '1', 'MESON_TOOLCHAIN_CACHE_DIR': cachedir}
+            self.init(testdir, override_envvars=env)
+            self.assertIn('Sanity check compiler command line:', self.get_meson_log_raw())
+
+            self.new_builddir()
+            self.init(testdir, override_envvars=env)
+            log = self.get_meson_log_raw()
+            self.assertNotIn('Sanity check compiler command line:', log)
+            self.assertIn('Skipping sanity check of', log)
+
+            self.new_builddir()
+            self.init(testdir, extra_args=['--revalidate-toolchains'], override_envvars=env)
+            self.assertIn('Sanity check compiler command line:', self.get_meson_log_raw())
+
+    def test_symbol_index(self):
+        '''
+        Test that answering has_function() and has_header_symbol() from the
+        symbol index gives the same results as running the checks.
+        '''
+        def checks() -> T.List[str]:
+            return [l.strip() for l in self.get_meson_log()
+                    if l.startswith(('Checking for function', 'Header '))]
+
+        for testdir in ['36 has function', '103 has header symbol']:
+            testdir = os.path.join(self.common_test_dir, testdir)
+            self.init(testdir)
+            expected = checks()
+            self.assertTrue(expected)
+            self.new_builddir()
+            self.init(testdir, override_envvars={'MESON_SYMBOL_INDEX': '1'})
+            self.assertEqual(checks(), expected)
+            # Checks answered from the index did not run, so there are no
+            # results of them to cache
+            cdata = mesonbuild.coredata.load(self.builddir)
+            self.assertTrue(cdata.symbol_index_hits)
+            self.assertFalse(cdata.symbol_index_hits & cdata.compiler_check_cache.keys())
+            self.new_builddir()
+
+    def test_dependency_prefetch(self):
+        '''
+        Test that dependencies looked up ahead of time give the same results
+        and log as looking them up when they are needed.
+        '''
+        testdir = os.path.join(self.unit_test_dir, '140 dependency prefetch')
+        serial = self.init(testdir, override_envvars={'MESON_NUM_PROCESSES': '1'})
+        self.assertNotIn('ahead of time', self.get_meson_log_raw())
+        serial_builddir = self.builddir
+        self.new_builddir()
+        concurrent = self.init(testdir, override_envvars={'MESON_NUM_PROCESSES': '4'})
+        self.assertIn('Looking up dependencies ahead of time: zlib, libcrypto, '
+                      'does-not-exist-prefetch, threads, tinfo\n', self.get_meson_log_raw())
+        self.assertEqual(concurrent.replace(self.builddir, serial_builddir), serial)
+
+    def test_ast_cache(self):
+        '''
+        Test that parsed build files are cached, that changed files are
+        parsed again, and that files whose parsing warns are not cached.
+        '''
+        testdir = self.copy_srcdir(os.path.join(self.common_test_dir, '1 trivial'))
+        cachedir = os.path.join(self.privatedir, 'ast-cache')
+        self.init(testdir)
+        self.assertEqual(len(os.listdir(cachedir)), 1)
+
+        with open(os.path.join(testdir, 'meson.build'), 'a', encoding='utf-8') as f:
+            f.write("message('cached' + 'tree')\n")
+        out = self.init(testdir, extra_args=['--reconfigure'])
+        self.assertIn('cachedtree', out)
+        self.assertEqual(len(os.listdir(cachedir)), 1)
+
+        with open(os.path.join(testdir, 'meson.build'), 'a', encoding='utf-8') as f:
+            f.write("message('unterminated\nstring')\n")
+        for _ in range(2):
+            out = self.init(testdir, extra_args=['--reconfigure'])
+            self.assertIn('Newline character in a string detected', out)
+
+    def test_regenerate_only_if_changed(self):
+        '''
+        Test that regenerating from the backend does nothing if the build
+        files were only touched, and configures again if they changed.
+        '''
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'{self.backend.name!r} backend can\'t regenerate from the command line.')
+        testdir = self.copy_srcdir(os.path.join(self.common_test_dir, '1 trivial'))
+        self.init(testdir)
+        regenerate = self.meson_command + ['--internal', 'regenerate', testdir, self.builddir, '--only-if-changed']
+        build_ninja = os.path.join(self.builddir, 'build.ninja')
+        meson_build = os.path.join(testdir, 'meson.build')
+
+        mtime = os.stat(build_ninja).st_mtime_ns
+        os.utime(meson_build, ns=(mtime, mtime))
+        out = self._run(regenerate)
+        self.assertIn('Build files have not changed', out)
+        self.assertGreater(os.stat(build_ninja).st_mtime_ns, mtime)
+
+        with open(meson_build, 'a', encoding='utf-8') as f:
+            f.write("message('changed' + 'file')\n")
+        out = self._run(regenerate)
+        self.assertNotIn('Build files have not changed', out)
+        self.assertIn('Build files changed: ' + os.path.relpath(meson_build, self.builddir), out)
+        self.assertIn('changedfile', out)
+
+    def test_build_data_index(self):
+        '''
+        Test that the index in front of build.dat matches the build data.
+        '''
+        testdir = os.path.join(self.unit_test_dir, '48 testsetup default')
+        self.init(testdir)
+        index = mesonbuild.build.load_index(self.builddir)
+        b = mesonbuild.build.load(self.builddir)
+        self.assertEqual(index.version, b.version)
+        self.assertEqual(index.project_name, b.project_name)
+        self.assertEqual(index.project_version, b.project_version)
+        self.assertEqual(index.test_setups.keys(), {'testsetup default:mydefault', 'testsetup default:other'})
+        self.assertEqual(index.test_setup_default_name, b.test_setup_default_name)
+        self.assertEqual(index.modules, b.modules)
+        self.assertEqual(index.environment.get_source_dir(), testdir)
+        self.assertIsNotNone(index.environment.coredata)
+        # The environment is only stored once, in the index
+        with open(os.path.join(self.privatedir, 'build.dat'), 'rb') as f:
+            unpickler = pickle.Unpickler(f)
+            index = unpickler.load()
+            self.assertIs(unpickler.load().environment, index.environment)
+
+    def test_ninja_rules_written_before_use(self):
+        '''
+        Test that the rules of build.ninja, which are written as they are
+        first used, are each written once and before the statements using them.
+        '''
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'{self.backend.name!r} backend can\'t write build.ninja')
+        testdir = os.path.join(self.common_test_dir, '5 linkstatic')
+        self.init(testdir)
+        rules = []
+        used = set()
+        with open(os.path.join(self.builddir, 'build.ninja'), encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('rule '):
+                    rules.append(line.split()[1])
+                elif line.startswith('build '):
+                    rule = line.split(': ', 1)[1].split()[0]
+                    if rule != 'phony':
+                        self.assertIn(rule, rules)
+                        used.add(rule)
+        self.assertEqual(len(rules), len(set(rules)))
+        self.assertEqual(set(rules), used)
+        self.assertIn('STATIC_LINKER', rules)
+
+    def test_daemon(self):
+        '''
+        Test that the daemon answers introspection queries like meson
+        introspect does, and regenerates the build directory in-process.
+        '''
+        from mesonbuild import mdaemon
+        if not mdaemon.is_supported():
+            raise SkipTest('Unix sockets are not supported on this platform.')
+        if self.backend is not Backend.ninja:
+            raise SkipTest(f'{self.backend.name!r} backend can\'t regenerate from the command line.')
+        testdir = self.copy_srcdir(os.path.join(self.common_test_dir, '1 trivial'))
+        self.init(testdir)
+        proc = subprocess.Popen(self.meson_command + ['daemon', self.builddir],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            for _ in range(100):
+                if mdaemon.query(self.builddir, {'command': 'ping'}) is not None:
+                    break
+                time.sleep(0.1)
+            else:
+                self.fail('The daemon did not start.')
+
+            response = mdaemon.query(self.builddir, {'command': 'introspect', 'args': ['--targets']})
+            self.assertEqual(response, {'result': self.introspect('--targets')})
+            response = mdaemon.query(self.builddir, {'command': 'introspect', 'args': ['--projectinfo', '--tests']})
+            self.assertEqual(response['result'].keys(), {'projectinfo', 'tests'})
+            response = mdaemon.query(self.builddir, {'command': 'introspect', 'args': []})
+            self.assertEqual(response, {'error': 'No command specified'})
+
+            with open(os.path.join(testdir, 'meson.build'), 'a', encoding='utf-8') as f:
+                f.write("executable('daemonexe', 'trivial.c')\n")
+            out = self._run(self.meson_command + ['--internal', 'regenerate', testdir, '.'], workdir=self.builddir)
+            self.assertIn(f'Regenerating in meson daemon (pid {proc.pid})', out)
+            self.assertIn('Build targets in project: 2', out)
+            response = mdaemon.query(self.builddir, {'command': 'introspect', 'args': ['--targets']})
+            self.assertIn('daemonexe', [t['name'] for t in response['result']])
+
+            self._run(self.meson_command + ['daemon', '--stop', self.builddir])
+            proc.wait(timeout=30)
+            self.assertEqual(proc.returncode, 0)
+            self.assertIsNone(mdaemon.query(self.builddir, {'command': 'ping'}))
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+    def test_profile_configure(self):
+        '''
+        Test that --profile-configure writes a Chrome trace with spans
+        attributed to meson.build lines.
+        '''
+        testdir = os.path.join(self.common_test_dir, '1 trivial')
+        tracefile = os.path.join(self.builddir, 'trace.json')
+        self.init(testdir, extra_args=[f'--profile-configure={tracefile}'])
+        with open(tracefile, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+        for e in events:
+            self.assertEqual(e['ph'], 'X')
+            self.assertGreaterEqual(e['dur'], 0)
+        names = {e['name'] for e in events}
+        self.assertIn('meson setup', names)
+        self.assertIn('detect c compiler', names)
+        executable = [e for e in events if e['name'] == 'executable()']
+        self.assertEqual(len(executable), 1)
+        self.assertRegex(executable[0]['args']['location'], r'^meson\.build:\d+$')
+        self.assertIn(executable[0]['args']['location'], names)
+
+        # A trace that can't be written must not hide why configuring failed
+        self.new_builddir()
+        with tempfile.TemporaryDirectory() as project_dir:
+            with open(os.path.join(project_dir, 'meson.build'), 'w', encoding='utf-8') as ofile:
+                ofile.write("project('profile failure')\nerror('the real error')\n")
+            tracefile = os.path.join(self.builddir, 'missing', 'trace.json')
+            with self.assertRaises(subprocess.CalledProcessError) as cm:
+                self.init(project_dir, extra_args=[f'--profile-configure={tracefile}'])
+        self.assertIn('ERROR: Problem encountered: the real error', cm.exception.output)
+        self.assertIn('Could not write configure trace', cm.exception.output)
+
+    def test_concurrent_argument_checks(self):
+        '''
+        Test that checking arguments on worker threads logs the same results,
+        in the same order, as checking them serially.
+        '''
+        testdir = os.path.join(self.common_test_dir, '104 has arg')
+
+        def checks() -> T.List[str]:
+            return [l for l in self.get_meson_log() if l.startswith(('Compiler for', 'First supported'))]
+
+        self.init(testdir, override_envvars={'MESON_NUM_PROCESSES': '1'})
+        serial = checks()
+        self.new_builddir()
+        self.init(testdir, override_envvars={'MESON_NUM_PROCESSES': '8'})
+        self.assertEqual(checks(), serial)
+
+    def test_batched_argument_checks_warn_once(self):
+        '''
+        Test that a linker argument passed to a batched compiler argument check
+        is warned about once, even if it ends up being checked on its own.
+        '''
+        cc = detect_c_compiler(get_fake_env(), MachineChoice.HOST)
+        if cc.get_id() not in {'gcc', 'clang'}:
+            raise SkipTest('Only GCC and Clang check arguments in batches')
+        with tempfile.TemporaryDirectory() as project_dir:
+            with open(os.path.join(project_dir, 'meson.build'), 'w', encoding='utf-8') as ofile:
+                ofile.write(textwrap.dedent('''\
+                    project('batch warning', 'c')
+                    cc = meson.get_compiler('c')
+                    cc.get_supported_arguments(['-Wl,--as-needed', '-fiambroken', '-fiambroken-too'], batch: true)
+                    cc.get_supported_arguments(['-Wl,--as-needed'], batch: true)
+                    '''))
+            out = self.init(project_dir)
+        self.assertEqual(out.count('-Wl,--as-needed looks like a linker argument'), 2)
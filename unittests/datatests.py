@@ -145,7 +145,7 @@ class DataTests(unittest.TestCase):
             return key
 
         self.assertEqual(found_entries, {
-            *(str(remove_module_name(k)) for k in mesonbuild.options.BUILTIN_OPTIONS),
+            *(str(remove_module_name(k)) for k in mesonbuild.options.get_builtin_options()),
             *(str(remove_module_name(k)) for k in mesonbuild.options.BUILTIN_OPTIONS_PER_MACHINE),
         })
 
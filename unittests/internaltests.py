@@ -13,6 +13,7 @@ import os
 import pickle
 import stat
 import subprocess
+import sys
 import tempfile
 import textwrap
 import typing as T
@@ -28,6 +29,7 @@ import mesonbuild.modules.cuda
 import mesonbuild.modules.gnome
 import mesonbuild.scripts.depfixer
 import mesonbuild.scripts.env2mfile
+import mesonbuild.toolchaincache
 from mesonbuild import coredata
 from mesonbuild.compilers.c import ClangCCompiler, GnuCCompiler
 from mesonbuild.compilers.compilers import ManyInOneLinkerOptionStyle
@@ -45,7 +47,7 @@ from mesonbuild.mesonlib import (
 )
 from mesonbuild.options import OptionKey
 from mesonbuild.interpreter.type_checking import in_set_validator, NoneType
-from mesonbuild.dependencies.pkgconfig import PkgConfigDependency, PkgConfigInterface, PkgConfigCLI
+from mesonbuild.dependencies.pkgconfig import PkgConfigDependency, PkgConfigInterface, PkgConfigCLI, PkgConfigNative
 from mesonbuild.programs import ExternalProgram
 import mesonbuild.modules.pkgconfig
 from mesonbuild import utils
@@ -983,6 +985,93 @@ Thread model: posix'''), '21.9.0')
                         for lib in ('pthread', 'm', 'c', 'dl', 'rt'):
                             self.assertNotIn(f'lib{lib}.a', link_arg, msg=link_args)
 
+    @skipIfNoPkgconfig
+    def test_pkgconfig_native(self):
+        '''
+        Test that reading .pc files in-process gives the same results as
+        pkg-config, and only runs it for the cases it leaves to pkg-config.
+        '''
+        if is_windows():
+            raise unittest.SkipTest('pkg-config relocates packages on Windows')
+        files = {
+            'a': '''
+                prefix=/opt/a
+                libdir=${prefix}/lib
+                Name: a
+                Description: a
+                Version: 1.2
+                Requires: b, c >= 1.0
+                Requires.private: d
+                Libs: -L${libdir} -la -lm \\
+                  -Wl,--as-needed
+                Libs.private: -lapriv
+                Cflags: -I${prefix}/include -DA -I/usr/include # comment
+                ''',
+            'b': '''
+                Name: b
+                Description: b
+                Version: 1.0
+                Requires: c
+                Libs: -lb -lm -L/usr/lib
+                Cflags: -DB -pthread
+                Cflags.private: -DB_STATIC
+                ''',
+            'c': '''
+                Name: c
+                Description: c
+                Version: 1.0
+                Libs: -lc0
+                Cflags: -DA -I${pcfiledir}/include
+                ''',
+            'd': '''
+                Name: d
+                Description: d
+                Version: 3
+                Libs: -ld
+                Cflags: -DD
+                ''',
+            'broken': '''
+                Name: broken
+                Description: broken
+                Version: 1.0
+                Requires: c > 1.0
+                ''',
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, contents in files.items():
+                Path(tmpdir, f'{name}.pc').write_text(textwrap.dedent(contents), encoding='utf-8')
+            def merged(args):
+                # pkgconf sometimes keeps redundant duplicates
+                return [a for f in PkgConfigNative._merge_fragments(PkgConfigNative._group_args(args)) for a in f]
+
+            env = get_fake_env()
+            cli = PkgConfigCLI(env, MachineChoice.HOST, silent=True, extra_paths=[tmpdir])
+            native = PkgConfigNative(env, MachineChoice.HOST, silent=True, extra_paths=[tmpdir])
+            define = (('prefix', '/usr'),)
+            for name in ('a', 'b', 'c', 'd', 'broken', 'missing'):
+                with self.subTest(name=name):
+                    self.assertEqual(native.version(name), cli.version(name))
+                    if cli.version(name) is None:
+                        continue
+                    for static in (False, True):
+                        self.assertEqual(native.cflags(name, static), merged(cli.cflags(name, static)))
+                        self.assertEqual(native.libs(name, static), merged(cli.libs(name, static)))
+                    self.assertEqual(native.cflags(name, allow_system=True), merged(cli.cflags(name, allow_system=True)))
+                    self.assertEqual(native.libs(name, define_variable=define), merged(cli.libs(name, define_variable=define)))
+                    for variable in ('prefix', 'pcfiledir', 'nonexisting'):
+                        self.assertEqual(native.variable(name, variable, None), cli.variable(name, variable, None))
+            self.assertIn('a', native.list_all())
+
+            with mock.patch.object(PkgConfigCLI, '_call_pkgbin', side_effect=AssertionError) as call:
+                native = PkgConfigNative(env, MachineChoice.HOST, silent=True, extra_paths=[tmpdir])
+                native._pkgbin_variable = mock.Mock(return_value=[])
+                with mock.patch.dict(os.environ, {'PKG_CONFIG_LIBDIR': ''}):
+                    self.assertIsNone(native.version('missing'))
+                    self.assertEqual(native.version('a'), '1.2')
+                    native.libs('a', static=True)
+                    call.assert_not_called()
+                    self.assertRaises(AssertionError, native.version, 'broken')
+
     def test_program_version(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             script_path = Path(tmpdir) / 'script.py'
@@ -2022,6 +2111,59 @@ Thread model: posix'''), '21.9.0')
             i = mesonbuild.interpreter.Interpreter(build)
             pickle.dumps(i)
 
+    def test_compact_parser(self) -> None:
+        '''
+        Test that compact syntax trees have no whitespace and share their
+        symbol nodes, but otherwise are the same as full trees.
+        '''
+        from mesonbuild.ast import AstPrinter
+        from mesonbuild.ast.visitor import FullAstVisitor
+        code = textwrap.dedent('''\
+            # comment
+            a = [1, 2] + ['x'.format(3)]  # another
+            foreach x : a
+              if x not in [ 2,
+                            3 ] and (x == 1)
+                b = {'k': x}
+              endif
+            endforeach
+            ''')
+
+        class Collector(FullAstVisitor):
+            def __init__(self) -> None:
+                super().__init__()
+                self.nodes: T.List[T.Tuple[str, int, int, int, int]] = []
+                self.whitespaces = 0
+                self.symbols: T.List[mesonbuild.mparser.SymbolNode] = []
+
+            def enter_node(self, node: mesonbuild.mparser.BaseNode) -> None:
+                if isinstance(node, mesonbuild.mparser.WhitespaceNode):
+                    self.whitespaces += 1
+                elif isinstance(node, mesonbuild.mparser.SymbolNode):
+                    self.symbols.append(node)
+                else:
+                    self.nodes.append((type(node).__name__, node.lineno, node.colno, node.end_lineno, node.end_colno))
+
+        full = mesonbuild.mparser.Parser(code, 'meson.build').parse()
+        compact = mesonbuild.mparser.Parser(code, 'meson.build', compact=True).parse()
+        full_nodes, compact_nodes = Collector(), Collector()
+        full.accept(full_nodes)
+        compact.accept(compact_nodes)
+        self.assertNotEqual(full_nodes.whitespaces, 0)
+        self.assertEqual(compact_nodes.whitespaces, 0)
+        self.assertEqual(full_nodes.nodes, compact_nodes.nodes)
+        self.assertEqual(len(full_nodes.symbols), len(compact_nodes.symbols))
+        self.assertLess(len({id(s) for s in compact_nodes.symbols}), len(compact_nodes.symbols))
+
+        full_printer, compact_printer = AstPrinter(), AstPrinter()
+        full.accept(full_printer)
+        compact.accept(compact_printer)
+        self.assertEqual(full_printer.result, compact_printer.result)
+
+        # Nodes have no __dict__ and round-trip through the AST cache
+        self.assertFalse(hasattr(compact.lines[0], '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(compact)), compact)
+
     def test_major_versions_differ(self) -> None:
         # Return True when going to next major release, when going to dev cycle,
         # when going to rc cycle or when going out of rc cycle.
@@ -2529,3 +2671,28 @@ Thread model: posix'''), '21.9.0')
                 mesonbuild.scripts.depfixer.fix_rpath(
                     fname, set(), '', '', {}, system='linux', verbose=False)
                 mock_fix_darwin.assert_not_called()
+
+    def test_toolchain_cache_probe_wrapper(self) -> None:
+        # A script run by an interpreter is part of the key, not only the
+        # interpreter
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = os.path.join(tmpdir, 'wrapper.py')
+            env = {'MESON_TOOLCHAIN_CACHE': '1', 'MESON_TOOLCHAIN_CACHE_DIR': os.path.join(tmpdir, 'cache')}
+            with mock.patch.dict(os.environ, env):
+                for version in ['1.0', '2.0', '2.0']:
+                    with open(script, 'w', encoding='utf-8') as f:
+                        f.write(f'print("wrapped {version}")\n')
+                    _, out, _ = mesonbuild.toolchaincache.run_probe([sys.executable, script, '--version'])
+                    self.assertEqual(out.strip(), f'wrapped {version}')
+
+    def test_daemon_clear_configure_caches(self) -> None:
+        # The daemon regenerates in-process, where memoized results and the
+        # objects they keep alive must not outlive a configuration
+        from mesonbuild import mdaemon
+        from mesonbuild.compilers.mixins.clike import CLikeCompiler
+        mesonbuild.options.get_builtin_options()
+        self.assertEqual(mesonbuild.options.get_builtin_options.cache_info().currsize, 1)
+        with mock.patch.dict(CLikeCompiler.linked_symbols_cache, {(('cc',), ()): ((), frozenset())}):
+            mdaemon.clear_configure_caches()
+            self.assertEqual(CLikeCompiler.linked_symbols_cache, {})
+        self.assertEqual(mesonbuild.options.get_builtin_options.cache_info().currsize, 0)
@@ -301,6 +301,33 @@ class PlatformAgnosticTests(BasePlatformTests):
         self.assertEqual(data['modules'], expected['modules'])
         self.assertEqual(data['count'], expected['count'])
 
+    def test_introspect_loaded_modules(self):
+        '''
+        Introspecting a build directory only reads the files written by
+        `meson setup`, so it must not import the interpreter, the backends or
+        anything else that is only needed to configure a project. Editors and
+        IDEs run it very often.
+        '''
+        testdir = os.path.join(self.unit_test_dir, '116 empty project')
+        self.init(testdir)
+        script = textwrap.dedent('''\
+            import json, sys
+            from mesonbuild import mesonmain
+            try:
+                mesonmain.main()
+            finally:
+                print(json.dumps(sorted(sys.modules)), file=sys.stderr)
+            ''')
+        p = subprocess.run(python_command + ['-c', script, 'introspect', '--targets', '--buildoptions', self.builddir],
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                           cwd=self.src_root)
+        imported = json.loads(p.stderr.splitlines()[-1])
+        self.assertIn('mesonbuild.mintro', imported)
+        for mod in ['mesonbuild.ast', 'mesonbuild.backend', 'mesonbuild.build', 'mesonbuild.compilers',
+                    'mesonbuild.dependencies', 'mesonbuild.environment', 'mesonbuild.interpreter',
+                    'mesonbuild.msetup', 'mesonbuild.mtest']:
+            self.assertNotIn(mod, imported)
+
     def test_meson_package_cache_dir(self):
         # Copy testdir into temporary directory to not pollute meson source tree.
         testdir = os.path.join(self.unit_test_dir, '118 meson package cache dir')